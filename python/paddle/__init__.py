@@ -341,6 +341,8 @@ from .autograd import set_grad_enabled  # noqa: F401
 from .autograd import is_grad_enabled  # noqa: F401
 from .framework import save  # noqa: F401
 from .framework import load  # noqa: F401
+from .framework import async_save  # noqa: F401
+from .framework import clear_async_save_task_queue  # noqa: F401
 from .framework import DataParallel  # noqa: F401
 
 from .framework import set_default_dtype  # noqa: F401
@@ -421,6 +423,8 @@ __all__ = [  # noqa
     'unstack',
     'get_default_dtype',
     'save',
+    'async_save',
+    'clear_async_save_task_queue',
     'multinomial',
     'get_cuda_rng_state',
     'rank',
@@ -64,6 +64,11 @@ class Master(object):
 
 
 class HTTPMaster(Master):
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        # barrier name -> generation of the next round to pass
+        self.barrier_generations = {}
+
     def lazy_init(self):
         if self.initialized:
             return
@@ -156,7 +161,9 @@ class HTTPMaster(Master):
                 time.sleep(0.1)
                 continue
 
-            rjson = self.client.get_prefix(prefix)
+            # long poll until all peers put their values, so the server
+            # responds once per pod instead of per polling interval
+            rjson = self.client.wait_prefix(prefix, size, timeout=10)
             self.ctx.logger.debug("sync peers {}".format(rjson))
             if rjson and len(rjson) == size:
                 if rank < 0:
@@ -174,6 +181,27 @@ class HTTPMaster(Master):
                 time.sleep(0.5)
         return [], 0
 
+    def barrier(self, name, key, size):
+        '''
+        barrier blocks until size distinct keys arrive at barrier name,
+        the same name can be used for the following rounds
+        '''
+        if size < 2:
+            return True
+
+        self.lazy_init()
+
+        generation = self.barrier_generations.get(name, 0)
+        while not self.ctx.status.is_done():
+            if self.client.barrier(
+                name, key, size, timeout=10, generation=generation
+            ):
+                self.barrier_generations[name] = generation + 1
+                return True
+            # back off in case the server is not reachable
+            time.sleep(0.5)
+        return False
+
 
 class ETCDMaster(Master):
     def __init__(self, ctx):
@@ -0,0 +1,128 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+'''
+Benchmark of the rendezvous of launch, which simulates pods by threads
+on local host syncing peers through KVServer.
+
+    python -m paddle.distributed.launch.utils.kv_benchmark --pods 2048
+
+mode "poll" is the rendezvous before long polling, in which each pod gets
+the prefix every interval until all peers arrive, mode "watch" long polls
+the prefix with a count, mode "barrier" syncs peers and then passes a
+barrier.
+'''
+
+import argparse
+import socket
+import threading
+import time
+
+from paddle.distributed.launch.utils.kv_client import KVClient
+from paddle.distributed.launch.utils.kv_server import KVServer
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('', 0))
+        return s.getsockname()[1]
+
+
+def _pod(client, mode, prefix, rank, size, interval, stats):
+    key = "{}/pod{:06d}/-1".format(prefix, rank)
+    requests = 0
+    while True:
+        if not client.put(key, "127.0.0.1:{}".format(rank)):
+            requests += 1
+            time.sleep(0.1)
+            continue
+        requests += 1
+        if mode == 'poll':
+            peers = client.get_prefix(prefix)
+        else:
+            peers = client.wait_prefix(prefix, size, timeout=30)
+        requests += 1
+        if peers and len(peers) == size:
+            break
+        if mode == 'poll':
+            time.sleep(interval)
+    if mode == 'barrier':
+        while not client.barrier(prefix, rank, size, timeout=30):
+            requests += 1
+            time.sleep(0.1)
+        requests += 1
+    stats[rank] = (time.time(), requests)
+
+
+def run(pods, mode, interval=0.5):
+    port = _free_port()
+    server = KVServer(port)
+    server.start()
+    client = KVClient("127.0.0.1:{}".format(port))
+    client.wait_server_ready(timeout=10)
+
+    stats = [None] * pods
+    threads = [
+        threading.Thread(
+            target=_pod,
+            args=(client, mode, '/bench', i, pods, interval, stats),
+            daemon=True,
+        )
+        for i in range(pods)
+    ]
+    start = time.time()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    server.stop()
+
+    elapsed = max(s[0] for s in stats) - start
+    requests = sum(s[1] for s in stats)
+    return elapsed, requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pods", type=int, nargs='+', default=[64, 512, 2048])
+    parser.add_argument(
+        "--mode",
+        nargs='+',
+        default=['poll', 'watch', 'barrier'],
+        choices=['poll', 'watch', 'barrier'],
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        help="polling interval of mode poll in seconds",
+    )
+    args = parser.parse_args()
+
+    print(
+        "{:>8} {:>8} {:>12} {:>12}".format(
+            "pods", "mode", "time(s)", "requests"
+        )
+    )
+    for pods in args.pods:
+        for mode in args.mode:
+            elapsed, requests = run(pods, mode, args.interval)
+            print(
+                "{:>8} {:>8} {:>12.3f} {:>12}".format(
+                    pods, mode, elapsed, requests
+                )
+            )
+
+
+if __name__ == '__main__':
+    main()
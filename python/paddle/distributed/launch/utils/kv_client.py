@@ -59,6 +59,67 @@ class KVClient(object):
         except:
             return ""
 
+    def wait_prefix(self, key, count, timeout=10):
+        """
+        Long poll until there are count keys under the prefix, returns the
+        key-values under the prefix, which may be less than count on timeout.
+        """
+        key = key if key.startswith('/') else "/{}".format(key)
+        u = "{}{}".format(self.endpoint, key)
+        try:
+            r = requests.get(
+                u,
+                params={'count': count, 'timeout': timeout},
+                timeout=timeout + 3,
+            )
+            if r.status_code == 200:
+                return r.json()
+        except:
+            return ""
+
+    def watch_prefix(self, key, revision=-1, timeout=10):
+        """
+        Long poll until the prefix is changed after revision, returns the
+        key-values under the prefix and the revision of the prefix.
+        """
+        key = key if key.startswith('/') else "/{}".format(key)
+        u = "{}{}".format(self.endpoint, key)
+        try:
+            r = requests.get(
+                u,
+                params={'revision': revision, 'timeout': timeout},
+                timeout=timeout + 3,
+            )
+            rev = int(r.headers.get('X-Revision', revision))
+            if r.status_code == 200:
+                return r.json(), rev
+            return {}, rev
+        except:
+            return "", revision
+
+    def barrier(self, name, id, size, timeout=10, generation=0):
+        """
+        Block until size distinct ids arrive at the generation-th round of
+        the barrier name, returns False on timeout or failure, the call can
+        be retried with the same id and generation. The next round of the
+        barrier is passed with generation + 1.
+        """
+        u = "{}/_barrier/{}".format(self.endpoint, name.lstrip('/'))
+        try:
+            r = requests.post(
+                u,
+                params={
+                    'id': id,
+                    'size': size,
+                    'timeout': timeout,
+                    'generation': generation,
+                },
+                timeout=timeout + 3,
+            )
+            return r.status_code == 200
+        except:
+            return False
+
     def delete(self, key):
         key = key if key.startswith('/') else "/{}".format(key)
         u = "{}{}".format(self.endpoint, key)
@@ -12,53 +12,84 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from http.server import HTTPServer
+from http.server import ThreadingHTTPServer
 import http.server as SimpleHTTPServer
+from urllib.parse import parse_qs, urlsplit
 
 from multiprocessing import Process
 
+import bisect
 import threading
 import json
 
+BARRIER_PREFIX = '/_barrier/'
+
+
+class _Watcher(object):
+    def __init__(self, ready):
+        self.ready = ready
+        self.event = threading.Event()
+
 
 class KVHandler(SimpleHTTPServer.SimpleHTTPRequestHandler):
+    def _parse(self):
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        return url.path, query
+
     def do_GET(self):
-        with self.server.kv_lock:
-            ret = {}
-            for k, v in self.server.kv.items():
-                if k.startswith(self.path):
-                    ret[k] = v.decode(encoding="utf-8")
-            if ret:
-                self.output(200, json.dumps(ret).encode("utf-8"))
-            else:
-                self.output(404)
+        path, query = self._parse()
+        timeout = float(query.get('timeout', 0))
+        if 'count' in query:
+            # long poll until there are count keys under the prefix
+            self.server.wait_count(path, int(query['count']), timeout)
+        elif 'revision' in query:
+            # long poll until the prefix is changed after the revision
+            self.server.wait_change(path, int(query['revision']), timeout)
+
+        revision, value = self.server.get_prefix(path)
+        if value is not None:
+            self.output(200, value, revision)
+        else:
+            self.output(404, revision=revision)
 
     def do_PUT(self):
         self.do_POST()
 
     def do_POST(self):
+        path, query = self._parse()
         content_length = int(self.headers['Content-Length'] or 0)
         try:
             value = self.rfile.read(content_length)
-            with self.server.kv_lock:
-                self.server.kv[self.path] = value
-                self.output(200)
+            if path.startswith(BARRIER_PREFIX):
+                done = self.server.barrier(
+                    path,
+                    query.get('id', value.decode(encoding="utf-8")),
+                    int(query['size']),
+                    float(query.get('timeout', 0)),
+                    int(query.get('generation', 0)),
+                )
+                self.output(200 if done else 408)
                 return
+            self.server.put(path, value)
+            self.output(200)
+            return
         except:
             self.output(500)
 
     def do_DELETE(self):
-        with self.server.kv_lock:
-            if self.path in self.server.kv:
-                del self.server.kv[self.path]
-                self.output(200)
-            else:
-                self.output(404)
-
-    def output(self, code, value=''):
+        path, _ = self._parse()
+        if self.server.delete(path):
+            self.output(200)
+        else:
+            self.output(404)
+
+    def output(self, code, value='', revision=None):
         self.send_response(code)
         self.send_header("Content-Length", len(value))
         self.send_header("Content-Type", "application/json; charset=utf8")
+        if revision is not None:
+            self.send_header("X-Revision", revision)
         self.end_headers()
         if value:
             self.wfile.write(value)
@@ -67,15 +98,156 @@ class KVHandler(SimpleHTTPServer.SimpleHTTPRequestHandler):
         return
 
 
-class KVServer(HTTPServer, object):
+class KVServer(ThreadingHTTPServer, object):
+    """
+    A key-value store serving the rendezvous of launch over HTTP.
+
+    Keys are kept in a sorted index, so a prefix query only visits the
+    matched keys, and the encoded response of a prefix is cached until
+    the prefix is changed, so all pods fetching the same prefix share one
+    encoding. GET requests may long poll with the query ``count=N`` to
+    wait until N keys are under the prefix, or ``revision=R`` to wait
+    until the prefix is changed after revision R, with ``timeout`` in
+    seconds. POST to ``/_barrier/<name>?size=N&id=<id>&generation=G``
+    blocks until N distinct ids arrive at the G-th round of the barrier.
+    The barrier is reset for the next round once completed, so a name can
+    be reused by increasing the generation, and retrying a round that has
+    completed returns at once.
+    """
+
+    daemon_threads = True
+    # all pods connect at the same time in rendezvous
+    request_queue_size = 4096
+
     def __init__(self, port):
         super(KVServer, self).__init__(('', port), KVHandler)
         self.kv_lock = threading.Lock()
         self.kv = {'/healthy': b'ok'}
+        self.keys = ['/healthy']
+        self.revision = 0
+        # prefix -> [revision of last change, encoded value or None]
+        self.prefixes = {}
+        # prefix -> set of _Watcher
+        self.watchers = {}
+        # barrier name -> [generation of current round, set of arrived ids]
+        self.barriers = {}
         self.port = port
         self.stopped = False
         self.started = False
 
+    def _range(self, prefix):
+        lo = bisect.bisect_left(self.keys, prefix)
+        if not prefix:
+            return lo, len(self.keys)
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return lo, bisect.bisect_left(self.keys, upper, lo)
+
+    def _count(self, prefix):
+        lo, hi = self._range(prefix)
+        return hi - lo
+
+    def _prefix(self, prefix):
+        if prefix not in self.prefixes:
+            # changes before the prefix is tracked are regarded as the
+            # latest one, which may only wake up a watcher spuriously
+            self.prefixes[prefix] = [self.revision, None]
+        return self.prefixes[prefix]
+
+    def _notify(self, key):
+        # must be called with kv_lock held, only the watchers of prefixes
+        # of the key are checked
+        for prefix, watchers in self.watchers.items():
+            if not key.startswith(prefix):
+                continue
+            for watcher in watchers:
+                if watcher.ready():
+                    watcher.event.set()
+
+    def _changed(self, key):
+        # must be called with kv_lock held
+        self.revision += 1
+        for prefix, state in self.prefixes.items():
+            if key.startswith(prefix):
+                state[0] = self.revision
+                state[1] = None
+        self._notify(key)
+
+    def put(self, key, value):
+        with self.kv_lock:
+            if key not in self.kv:
+                bisect.insort(self.keys, key)
+            elif self.kv[key] == value:
+                return
+            self.kv[key] = value
+            self._changed(key)
+
+    def delete(self, key):
+        with self.kv_lock:
+            if key not in self.kv:
+                return False
+            del self.kv[key]
+            del self.keys[bisect.bisect_left(self.keys, key)]
+            self._changed(key)
+            return True
+
+    def get_prefix(self, prefix):
+        """
+        Returns the revision of prefix and the JSON encoded key-values under
+        it, or None if there is no key.
+        """
+        with self.kv_lock:
+            state = self._prefix(prefix)
+            if state[1] is None:
+                lo, hi = self._range(prefix)
+                if lo == hi:
+                    return state[0], None
+                state[1] = json.dumps(
+                    {
+                        k: self.kv[k].decode(encoding="utf-8")
+                        for k in self.keys[lo:hi]
+                    }
+                ).encode("utf-8")
+            return state[0], state[1]
+
+    def _wait(self, prefix, ready, timeout):
+        watcher = _Watcher(ready)
+        with self.kv_lock:
+            if watcher.ready():
+                return True
+            if timeout <= 0:
+                return False
+            self.watchers.setdefault(prefix, set()).add(watcher)
+        try:
+            return watcher.event.wait(timeout)
+        finally:
+            with self.kv_lock:
+                watchers = self.watchers[prefix]
+                watchers.discard(watcher)
+                if not watchers:
+                    del self.watchers[prefix]
+
+    def wait_count(self, prefix, count, timeout=0):
+        return self._wait(prefix, lambda: self._count(prefix) >= count, timeout)
+
+    def wait_change(self, prefix, revision, timeout=0):
+        return self._wait(
+            prefix, lambda: self._prefix(prefix)[0] > revision, timeout
+        )
+
+    def barrier(self, name, id, size, timeout=0, generation=0):
+        with self.kv_lock:
+            state = self.barriers.setdefault(name, [generation, set()])
+            if state[0] < generation:
+                # the earlier rounds are lost, e.g. the server is restarted
+                state[0], state[1] = generation, set()
+            if state[0] == generation and id not in state[1]:
+                state[1].add(id)
+                if len(state[1]) >= size:
+                    # reset for the next round, the arrived ids are dropped
+                    state[0], state[1] = generation + 1, set()
+                self._notify(name)
+        return self._wait(name, lambda: state[0] > generation, timeout)
+
     def start(self):
         self.listen_thread = threading.Thread(target=self.serve_forever)
         self.listen_thread.start()
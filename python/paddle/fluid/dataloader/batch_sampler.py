@@ -12,13 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import numpy as np
 import math
 
 from .sampler import Sampler, SequenceSampler, RandomSampler
 from .dataset import Dataset, IterableDataset
 
-__all__ = ["BatchSampler", "DistributedBatchSampler"]
+__all__ = ["BatchSampler", "DistributedBatchSampler", "BucketBatchSampler"]
 
 
 class BatchSampler(Sampler):
@@ -363,3 +364,305 @@ class DistributedBatchSampler(BatchSampler):
                     sampler.set_epoch(epoch)
         """
         self.epoch = epoch
+
+
+class BucketBatchSampler(BatchSampler):
+    """
+    Batch sampler which groups samples of similar lengths into buckets and
+    forms batches by a token budget, so as to reduce the padding of
+    variable-length data (e.g. text and speech) in a mini-batch.
+
+    The lengths of samples are computed once by :attr:`length_fn` or given
+    by :attr:`lengths`. Samples are grouped into buckets by length, and a
+    batch is formed from a bucket such that the padded token number, i.e.
+    sample number multiplied by the max length in the batch, does not exceed
+    :attr:`max_tokens`. When :attr:`shuffle` is True, samples are shuffled
+    within each bucket and batches are shuffled across buckets. In distributed
+    training, all processes form the same batches from the random seed
+    :attr:`seed` and the epoch set by :code:`set_epoch`, and each process
+    takes an exclusive subset of the batches.
+
+    Args:
+        dataset(Dataset): this could be a :code:`paddle.io.Dataset` implement
+            or other python object which implemented :code:`__len__` and
+            :code:`__getitem__`.
+        max_tokens(int, optional): the max padded token number of a batch. A
+            sample longer than :attr:`max_tokens` forms a batch by itself.
+            At least one of :attr:`max_tokens` and :attr:`batch_size` should
+            be set. Default None.
+        batch_size(int, optional): the max sample number of a batch. Default
+            None.
+        lengths(list|numpy.ndarray, optional): the length of each sample.
+            Default None.
+        length_fn(callable, optional): the function to compute the length of
+            a sample, called as :code:`length_fn(dataset[idx])` for each
+            sample once if :attr:`lengths` is not set. Default None.
+        bucket_boundaries(list, optional): the ascending upper bounds(not
+            included) of lengths of buckets, samples longer than the last
+            boundary are in the last bucket. If not set, samples are split
+            into :attr:`num_buckets` buckets with similar sample numbers.
+            Default None.
+        num_buckets(int, optional): the number of buckets if
+            :attr:`bucket_boundaries` is not set. Default 10.
+        shuffle(bool, optional): whether to shuffle samples within buckets and
+            batches across buckets. Default False.
+        drop_last(bool, optional): whether to drop the last batches which
+            cannot be distributed to all processes evenly, otherwise these
+            processes are padded with the leading batches. Default False.
+        num_replicas(int, optional): process number in distributed training.
+            If not set, it is retrieved from
+            :code:`paddle.distributed.ParallelEnv`. Default None.
+        rank(int, optional): the rank of the current process. If not set, it is
+            retrieved from :code:`paddle.distributed.ParallelEnv`.
+            Default None.
+        seed(int, optional): the random seed for shuffling, which is the same
+            in all processes. Default 0.
+        cache_path(str, optional): the path of a :code:`.npy` file to cache
+            the lengths computed by :attr:`length_fn`, lengths are loaded from
+            it if the file exists. Default None.
+
+    Returns:
+        BucketBatchSampler: an iterable object for indices iterating
+
+    Examples:
+        .. code-block:: python
+
+            import numpy as np
+            from paddle.io import Dataset, BucketBatchSampler, DataLoader
+
+            class TextDataset(Dataset):
+                def __init__(self, num_samples):
+                    self.lengths = np.random.randint(5, 100, [num_samples])
+
+                def __getitem__(self, idx):
+                    return np.ones([self.lengths[idx]], dtype='int64')
+
+                def __len__(self):
+                    return len(self.lengths)
+
+            dataset = TextDataset(1000)
+            sampler = BucketBatchSampler(dataset,
+                                         max_tokens=1024,
+                                         length_fn=len,
+                                         shuffle=True)
+
+            for epoch in range(2):
+                sampler.set_epoch(epoch)
+                for batch_indices in sampler:
+                    # padded length of the batch is not more than 1024
+                    pass
+    """
+
+    def __init__(
+        self,
+        dataset,
+        max_tokens=None,
+        batch_size=None,
+        lengths=None,
+        length_fn=None,
+        bucket_boundaries=None,
+        num_buckets=10,
+        shuffle=False,
+        drop_last=False,
+        num_replicas=None,
+        rank=None,
+        seed=0,
+        cache_path=None,
+    ):
+        self.dataset = dataset
+        assert (
+            max_tokens is not None or batch_size is not None
+        ), "at least one of max_tokens and batch_size should be set"
+        assert max_tokens is None or (
+            isinstance(max_tokens, int) and max_tokens > 0
+        ), "max_tokens should be a positive integer"
+        assert batch_size is None or (
+            isinstance(batch_size, int) and batch_size > 0
+        ), "batch_size should be a positive integer"
+        self.max_tokens = max_tokens
+        self.batch_size = batch_size
+        assert isinstance(shuffle, bool), "shuffle should be a boolean value"
+        self.shuffle = shuffle
+        assert isinstance(
+            drop_last, bool
+        ), "drop_last should be a boolean value"
+        self.drop_last = drop_last
+
+        from paddle.fluid.dygraph.parallel import ParallelEnv
+
+        if num_replicas is not None:
+            assert (
+                isinstance(num_replicas, int) and num_replicas > 0
+            ), "num_replicas should be a positive integer"
+            self.nranks = num_replicas
+        else:
+            self.nranks = ParallelEnv().nranks
+        if rank is not None:
+            assert (
+                isinstance(rank, int) and rank >= 0
+            ), "rank should be a non-negative integer"
+            self.local_rank = rank
+        else:
+            self.local_rank = ParallelEnv().local_rank
+        assert (
+            self.local_rank < self.nranks
+        ), "rank should be less than num_replicas"
+
+        self.seed = seed
+        self.epoch = 0
+
+        self.lengths = self._get_lengths(lengths, length_fn, cache_path)
+        self._bucket_ids = self._assign_buckets(bucket_boundaries, num_buckets)
+        # batches are deterministic for an epoch, cache for __len__
+        self._cached_epoch = None
+        self._cached_batches = None
+        self._iterating_epoch = None
+
+    def _get_lengths(self, lengths, length_fn, cache_path):
+        if cache_path is not None and not cache_path.endswith('.npy'):
+            # np.save appends the suffix, check the file it actually writes
+            cache_path += '.npy'
+        if lengths is None:
+            if cache_path is not None and os.path.exists(cache_path):
+                lengths = np.load(cache_path)
+            else:
+                assert (
+                    length_fn is not None
+                ), "either lengths or length_fn should be set"
+                lengths = np.array(
+                    [
+                        length_fn(self.dataset[i])
+                        for i in range(len(self.dataset))
+                    ],
+                    dtype='int64',
+                )
+                if cache_path is not None:
+                    # write to a temporary file and rename, for other
+                    # processes may be loading the same cache
+                    tmp_path = '{}.{}.tmp.npy'.format(
+                        cache_path[: -len('.npy')], os.getpid()
+                    )
+                    try:
+                        np.save(tmp_path, lengths)
+                        os.replace(tmp_path, cache_path)
+                    except:
+                        if os.path.exists(tmp_path):
+                            os.remove(tmp_path)
+                        raise
+        lengths = np.asarray(lengths, dtype='int64').reshape([-1])
+        assert len(lengths) == len(
+            self.dataset
+        ), "length number {} should be equal to dataset size {}".format(
+            len(lengths), len(self.dataset)
+        )
+        return lengths
+
+    def _assign_buckets(self, bucket_boundaries, num_buckets):
+        if bucket_boundaries is None:
+            assert (
+                isinstance(num_buckets, int) and num_buckets > 0
+            ), "num_buckets should be a positive integer"
+            # split by quantiles of lengths, duplicated boundaries of
+            # frequent lengths are merged
+            sorted_lengths = np.sort(self.lengths)
+            positions = (
+                np.arange(1, num_buckets) * len(sorted_lengths) // num_buckets
+            )
+            bucket_boundaries = (
+                np.unique(sorted_lengths[positions])
+                if len(sorted_lengths) > 0
+                else []
+            )
+        bucket_boundaries = np.asarray(bucket_boundaries)
+        assert np.all(
+            np.diff(bucket_boundaries) > 0
+        ), "bucket_boundaries should be ascending"
+        return np.searchsorted(bucket_boundaries, self.lengths, side='right')
+
+    def _pack(self, indices):
+        # greedily pack indices in order into batches under the budgets
+        batches = []
+        batch = []
+        max_length = 0
+        for idx, length in zip(
+            indices.tolist(), self.lengths[indices].tolist()
+        ):
+            new_max_length = max(max_length, length)
+            if batch and (
+                (
+                    self.max_tokens is not None
+                    and (len(batch) + 1) * new_max_length > self.max_tokens
+                )
+                or (
+                    self.batch_size is not None
+                    and len(batch) >= self.batch_size
+                )
+            ):
+                batches.append(batch)
+                batch = []
+                new_max_length = length
+            batch.append(idx)
+            max_length = new_max_length
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _batches(self, epoch):
+        if self._cached_epoch == epoch:
+            return self._cached_batches
+        rng = np.random.RandomState(self.seed + epoch)
+        batches = []
+        for bucket_id in np.unique(self._bucket_ids):
+            indices = np.nonzero(self._bucket_ids == bucket_id)[0]
+            if self.shuffle:
+                indices = indices[rng.permutation(len(indices))]
+            else:
+                indices = indices[
+                    np.argsort(self.lengths[indices], kind='stable')
+                ]
+            batches.extend(self._pack(indices))
+        if self.shuffle:
+            batches = [batches[i] for i in rng.permutation(len(batches))]
+
+        # all processes get the same number of batches
+        if self.drop_last:
+            num_batches = len(batches) // self.nranks * self.nranks
+            batches = batches[:num_batches]
+        elif len(batches) % self.nranks != 0 and len(batches) > 0:
+            num_padding = self.nranks - len(batches) % self.nranks
+            batches += (batches * num_padding)[:num_padding]
+        batches = batches[self.local_rank :: self.nranks]
+
+        self._cached_epoch = epoch
+        self._cached_batches = batches
+        return batches
+
+    def __iter__(self):
+        epoch = self.epoch
+        batches = self._batches(epoch)
+        if self.shuffle:
+            self.epoch += 1
+        self._iterating_epoch = epoch
+        try:
+            for batch in batches:
+                yield list(batch)
+        finally:
+            self._iterating_epoch = None
+
+    def __len__(self):
+        # batch number may differ in epochs when shuffle, return the one of
+        # the epoch in iterating
+        epoch = self._iterating_epoch
+        return len(self._batches(self.epoch if epoch is None else epoch))
+
+    def set_epoch(self, epoch):
+        """
+        Sets the epoch number. When :attr:`shuffle=True`, this number and
+        :attr:`seed` are used as seeds of random numbers, which should be
+        the same in all processes. By default, the epoch number is increased
+        after each epoch automatically.
+
+        Arguments:
+            epoch (int): Epoch number.
+        """
+        self.epoch = epoch
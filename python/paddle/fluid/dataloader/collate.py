@@ -82,6 +82,130 @@ def default_collate_fn(batch):
     )
 
 
+class CompiledCollateFn(object):
+    """
+    Schema-compiled batch collating function for :code:`paddle.io.DataLoader`.
+
+    It produces the same batch data as :code:`default_collate_fn`, but the
+    structure of the sample data (nesting of dictionaries and lists, and the
+    shape and dtype of numpy array fields) is only inspected once, from the
+    first batch, and compiled into a specialized collator. Following batches
+    skip the per-field type dispatching, and numpy array fields are written
+    directly into preallocated batch buffers.
+
+    If a batch does not match the compiled schema (e.g. the shape of a field
+    changes), the batch is collated by :code:`default_collate_fn` instead.
+
+    .. note::
+        With :attr:`reuse_buffers` enabled, the returned numpy arrays are
+        overwritten by the next batch with the same batch size, so they should
+        not be held across calls. :code:`paddle.io.DataLoader` copies the batch
+        before collating the next one in the main process and in workers with
+        :attr:`use_shared_memory` enabled. Workers with :attr:`use_shared_memory`
+        disabled send batches by pickling them asynchronously, so reusing is
+        disabled in them.
+
+    Args:
+        reuse_buffers(bool, optional): whether to reuse the batch buffers of
+            numpy array fields across batches. Default False.
+
+    Examples:
+
+        .. code-block:: python
+
+            import numpy as np
+            import paddle
+            from paddle.io import Dataset, DataLoader, CompiledCollateFn
+
+            class RandomDataset(Dataset):
+                def __getitem__(self, idx):
+                    image = np.random.random([3, 32, 32]).astype('float32')
+                    return {'image': image, 'label': idx % 10}
+
+                def __len__(self):
+                    return 64
+
+            loader = DataLoader(RandomDataset(),
+                                batch_size=16,
+                                collate_fn=CompiledCollateFn())
+            for data in loader:
+                print(data['image'].shape) # [16, 3, 32, 32]
+    """
+
+    def __init__(self, reuse_buffers=False):
+        self._reuse_buffers = reuse_buffers
+        self._collate = None
+
+    def __call__(self, batch):
+        if self._collate is None:
+            self._collate = self._compile(batch[0])
+        try:
+            return self._collate(batch)
+        except (AttributeError, TypeError, ValueError, KeyError, IndexError):
+            # sample schema changed, fall back to the generic collating
+            return default_collate_fn(batch)
+
+    def _compile(self, sample):
+        if isinstance(sample, np.ndarray):
+            return self._compile_array(sample.shape, sample.dtype)
+        elif isinstance(sample, (paddle.Tensor, core.eager.Tensor)):
+            return lambda batch: layers.stack(batch, axis=0)
+        elif isinstance(sample, numbers.Number):
+            return np.array
+        elif isinstance(sample, (str, bytes)):
+            return lambda batch: batch
+        elif isinstance(sample, Mapping):
+            fields = [(key, self._compile(sample[key])) for key in sample]
+
+            def _collate_mapping(batch):
+                return {
+                    key: collate([d[key] for d in batch])
+                    for key, collate in fields
+                }
+
+            return _collate_mapping
+        elif isinstance(sample, Sequence):
+            fields = [self._compile(field) for field in sample]
+            sample_fields_num = len(fields)
+
+            def _collate_sequence(batch):
+                if not all(len(s) == sample_fields_num for s in batch):
+                    raise RuntimeError(
+                        "fileds number not same among samples in a batch"
+                    )
+                return [
+                    collate(field)
+                    for collate, field in zip(fields, zip(*batch))
+                ]
+
+            return _collate_sequence
+
+        raise TypeError(
+            "batch data con only contains: tensor, numpy.ndarray, "
+            "dict, list, number, but got {}".format(type(sample))
+        )
+
+    def _compile_array(self, shape, dtype):
+        # batch buffers keyed by batch size, the last batch may be smaller
+        buffers = {}
+
+        def _collate_array(batch):
+            batch_size = len(batch)
+            reuse_buffers = self._reuse_buffers
+            out = buffers.get(batch_size) if reuse_buffers else None
+            if out is None:
+                out = np.empty((batch_size,) + shape, dtype=dtype)
+                if reuse_buffers:
+                    buffers[batch_size] = out
+            for i, s in enumerate(batch):
+                if s.shape != shape or s.dtype != dtype:
+                    raise ValueError("sample schema mismatch")
+                out[i] = s
+            return out
+
+        return _collate_array
+
+
 def default_convert_fn(batch):
     """
     Default batch converting function for :code:`paddle.io.DataLoader`.
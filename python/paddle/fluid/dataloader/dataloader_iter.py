@@ -56,6 +56,7 @@ from .worker import (
     _ResumeIteration,
 )
 from .flat import _flatten_batch, _restore_batch
+from .slab import _SlabBatch, _SlabPool
 from paddle.profiler.timer import benchmark
 
 __all__ = ['get_worker_info']
@@ -112,6 +113,7 @@ class _DataLoaderIterBase(object):
         self._use_buffer_reader = loader.use_buffer_reader
         self._prefetch_factor = loader.prefetch_factor
         self._use_shared_memory = loader.use_shared_memory
+        self._shm_slab_size = loader.shm_slab_size
         self._timeout = (
             loader.timeout if loader.timeout > 0 else MP_STATUS_CHECK_INTERVAL
         )
@@ -378,6 +380,31 @@ class _DataLoaderIterSingleProcess(_DataLoaderIterBase):
         self._try_shutdown_all()
 
 
+class _WorkerLatency(object):
+    """
+    Latency counters of a DataLoader worker, the latency of a batch is
+    the time from putting its indices to receiving the batch data.
+    """
+
+    # smoothing factor of the exponential moving average of latency
+    EWMA_FACTOR = 0.2
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.ewma = 0.0
+
+    def update(self, latency):
+        self.count += 1
+        self.total += latency
+        self.max = max(self.max, latency)
+        if self.count == 1:
+            self.ewma = latency
+        else:
+            self.ewma += self.EWMA_FACTOR * (latency - self.ewma)
+
+
 class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
     def __init__(self, loader):
         super(_DataLoaderIterMultiProcess, self).__init__(loader)
@@ -385,6 +412,35 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
         self._persistent_workers = loader._persistent_workers
         self._resume_worker_cnt = 0
 
+        # NOTE: in persistent workers mode, indices of the next epoch are
+        # put to workers once the sampler of current epoch is exhausted,
+        # so the first batches of next epoch are prefetched while current
+        # epoch drains. _epoch_end_idx records the _send_idx where current
+        # epoch ends and _consumed_idx counts the batches output.
+        self._prefetch_next_epoch = (
+            loader.prefetch_next_epoch
+            and self._persistent_workers
+            and self._dataset_kind == _DatasetKind.MAP
+            and len(self._places) == 1
+        )
+        self._epoch_end_idx = None
+        self._consumed_idx = 0
+        self._next_epoch_seeds = (None, None)
+
+        # NOTE: indices are put to workers in round robin by default, or
+        # to the worker with fewest outstanding batches in 'least_loaded'
+        # mode. If _reorder_window is set, a batch can be output before
+        # earlier batches as long as its index is less than _rcvd_idx +
+        # _reorder_window, the indices of batches output out of order are
+        # recorded in _reordered_idxs and skipped when _rcvd_idx catches up
+        self._worker_dispatch = loader.worker_dispatch
+        self._reorder_window = None
+        if self._dataset_kind == _DatasetKind.MAP:
+            self._reorder_window = loader.reorder_window
+        self._returned_idx = None
+        self._reordered_idxs = set()
+        self._send_times = {}
+
         assert (
             self._num_workers > 0
         ), "Multi-process DataLoader " "invalid num_workers({})".format(
@@ -432,6 +488,22 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
         self._worker_status = []
         self._indices_queues = []
         self._workers_idx_cycle = itertools.cycle(range(self._num_workers))
+        self._worker_outstanding = [0] * self._num_workers
+        self._worker_latency = [
+            _WorkerLatency() for _ in range(self._num_workers)
+        ]
+
+        # each worker owns a pool of shared memory slabs which is enough
+        # to hold its outstanding batches
+        self._slab_pools = [None] * self._num_workers
+        if self._use_shared_memory and self._shm_slab_size:
+            num_slabs = (
+                self._outstanding_capacity + self._num_workers - 1
+            ) // self._num_workers + 1
+            self._slab_pools = [
+                _SlabPool(i, num_slabs, self._shm_slab_size)
+                for i in range(self._num_workers)
+            ]
 
         # create data_queue for workers
         self._data_queue = multiprocessing.Queue()
@@ -460,6 +532,7 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     self._num_workers,
                     self._use_shared_memory,
                     self._base_seed,
+                    self._slab_pools[i],
                 ),
             )
             worker.daemon = True
@@ -511,7 +584,53 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
         self._thread.daemon = True
         self._thread.start()
 
+    def _next_epoch_prefetched(self):
+        # whether the indices of the new epoch have been put to workers
+        # when current epoch ends
+        if (
+            self._epoch_end_idx is None
+            or self._consumed_idx < self._epoch_end_idx
+        ):
+            return False
+        # NOTE: batch sampler may be re-seeded by set_epoch before the
+        # new epoch, the prefetched batches can only be used when the
+        # epoch is the same as the one used for prefetching
+        if not hasattr(self._batch_sampler, 'set_epoch'):
+            return True
+        used_epoch, next_epoch = self._next_epoch_seeds
+        epoch = getattr(self._batch_sampler, 'epoch', None)
+        if epoch == next_epoch:
+            return True
+        if epoch == used_epoch:
+            self._batch_sampler.set_epoch(next_epoch)
+            return True
+        return False
+
+    def _start_next_epoch(self):
+        # start sampling the next epoch when the sampler of current epoch
+        # is exhausted, return the first indices of next epoch
+        if not self._prefetch_next_epoch or self._epoch_end_idx is not None:
+            return None
+        self._epoch_end_idx = self._send_idx
+        used_epoch = getattr(self._batch_sampler, 'epoch', None)
+        self._sampler_iter = iter(self._index_sampler)
+        indices = next(self._sampler_iter, None)
+        # DistributedBatchSampler increases epoch in iterating
+        next_epoch = getattr(self._batch_sampler, 'epoch', None)
+        self._next_epoch_seeds = (used_epoch, next_epoch)
+        return indices
+
     def _reset(self):
+        if self._next_epoch_prefetched():
+            # continue putting indices of the new epoch, workers and
+            # caches need not to be resumed
+            self._epoch_end_idx = None
+            for _ in range(
+                self._outstanding_capacity - self._batches_outstanding
+            ):
+                self._try_put_indices()
+            return
+
         # resume iteration in following steps
         # 1. Resume workers, clear worker caches
         # put _ResumeIteration to all worker as resume iteration flag
@@ -541,11 +660,20 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     data = self._reader.read_next()
 
         # 3. reset all states
+        for info in self._task_infos.values():
+            if len(info) == 3 and isinstance(info[1], _SlabBatch):
+                self._slab_pools[info[1].worker_id].release(info[1])
         self._send_idx = 0
         self._rcvd_idx = 0
         self._batches_outstanding = 0
         self._task_infos = {}
         self._structure_infos = []
+        self._epoch_end_idx = None
+        self._consumed_idx = 0
+        self._returned_idx = None
+        self._reordered_idxs = set()
+        self._send_times = {}
+        self._worker_outstanding = [0] * self._num_workers
 
         # set all worker status available
         self._worker_status = [True] * self._num_workers
@@ -608,7 +736,19 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     try:
                         # pack as LoDTensorArray
                         array = core.LoDTensorArray()
-                        if self._use_shared_memory:
+                        if isinstance(batch, _SlabBatch):
+                            # copy batch out of the slab, so the slab
+                            # can be released for worker reusing, see
+                            # _SlabPool for the cost of the copy
+                            pool = self._slab_pools[batch.worker_id]
+                            try:
+                                for slot in pool.get(batch):
+                                    tmp = core.LoDTensor()
+                                    tmp.set(slot, core.CPUPlace())
+                                    array.append(tmp)
+                            finally:
+                                pool.release(batch)
+                        elif self._use_shared_memory:
                             for tensor in batch:
                                 array.append(tensor)
                         else:
@@ -631,7 +771,74 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                         self._exit_thread_unexpectedly()
                         six.reraise(*sys.exc_info())
                     finally:
-                        self._rcvd_idx += 1
+                        self._advance_rcvd_idx()
+
+    def _advance_rcvd_idx(self):
+        if self._returned_idx != self._rcvd_idx:
+            # batch is output out of order
+            self._reordered_idxs.add(self._returned_idx)
+            return
+        self._rcvd_idx += 1
+        while self._rcvd_idx in self._reordered_idxs:
+            self._reordered_idxs.remove(self._rcvd_idx)
+            self._rcvd_idx += 1
+
+    def _output_end_idx(self):
+        # batches with index in [_rcvd_idx, _output_end_idx) can be output
+        if self._reorder_window is None:
+            return self._rcvd_idx + 1
+        end_idx = self._rcvd_idx + self._reorder_window
+        # batches of next epoch should not be output before current epoch
+        if (
+            self._epoch_end_idx is not None
+            and self._rcvd_idx < self._epoch_end_idx
+        ):
+            end_idx = min(end_idx, self._epoch_end_idx)
+        return end_idx
+
+    def _ready_idx(self):
+        # index of the cached batch which can be output
+        end_idx = min(self._output_end_idx(), self._send_idx)
+        for idx in range(self._rcvd_idx, end_idx):
+            info = self._task_infos.get(idx)
+            if info is not None and len(info) == 3:
+                return idx
+        return None
+
+    def _on_batch_received(self, idx):
+        info = self._task_infos.get(idx)
+        send_time = self._send_times.pop(idx, None)
+        if info is None or send_time is None:
+            return
+        worker_idx = info[0]
+        self._worker_latency[worker_idx].update(time.time() - send_time)
+        with self._thread_lock:
+            self._worker_outstanding[worker_idx] -= 1
+
+    @property
+    def worker_stats(self):
+        """
+        The statistics of each worker as a list of dict, contains the
+        number of received batches, the number of outstanding batches,
+        and the average, max and recent(moving average) latency in seconds
+        from putting indices to receiving the batch.
+        """
+        stats = []
+        for outstanding, latency in zip(
+            self._worker_outstanding, self._worker_latency
+        ):
+            stats.append(
+                {
+                    'batches': latency.count,
+                    'outstanding': outstanding,
+                    'avg_latency': latency.total / latency.count
+                    if latency.count
+                    else 0.0,
+                    'max_latency': latency.max,
+                    'recent_latency': latency.ewma,
+                }
+            )
+        return stats
 
     def _get_data(self):
         while not self._thread_done_event.is_set():
@@ -668,12 +875,11 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                         if self._batches_outstanding < len(self._places):
                             return None
 
-            if (
-                self._rcvd_idx in self._task_infos
-                and len(self._task_infos[self._rcvd_idx]) == 3
-            ):
-                info = self._task_infos.pop(self._rcvd_idx)
+            ready_idx = self._ready_idx()
+            if ready_idx is not None:
+                info = self._task_infos.pop(ready_idx)
                 self._structure_infos.append(info[2])
+                self._returned_idx = ready_idx
                 return info[1]
 
             try:
@@ -734,6 +940,7 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     continue
 
                 idx, batch, structure = data
+                self._on_batch_received(idx)
 
                 if (
                     isinstance(idx, _ResumeIteration)
@@ -746,9 +953,10 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     self._exit_thread_unexpectedly()
                     batch.reraise()
 
-                if idx == self._rcvd_idx:
+                if self._rcvd_idx <= idx < self._output_end_idx():
                     del self._task_infos[idx]
                     self._structure_infos.append(structure)
+                    self._returned_idx = idx
                     return batch
                 else:
                     self._task_infos[idx] += (batch, structure)
@@ -771,20 +979,47 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
             try:
                 indices = next(self._sampler_iter)
             except StopIteration:
-                return
-
-            for i in range(self._num_workers):
-                worker_idx = next(self._workers_idx_cycle)
-                if self._worker_status[worker_idx]:
-                    break
+                indices = self._start_next_epoch()
+                if indices is None:
+                    return
+
+            if self._worker_dispatch == 'least_loaded':
+                worker_idx = self._least_loaded_worker()
+                if worker_idx is None:
+                    return
             else:
-                return
+                for i in range(self._num_workers):
+                    worker_idx = next(self._workers_idx_cycle)
+                    if self._worker_status[worker_idx]:
+                        break
+                else:
+                    return
 
             self._indices_queues[worker_idx].put((self._send_idx, indices))
             self._task_infos[self._send_idx] = (worker_idx,)
+            self._send_times[self._send_idx] = time.time()
+            self._worker_outstanding[worker_idx] += 1
             self._batches_outstanding += 1
             self._send_idx += 1
 
+    def _least_loaded_worker(self):
+        # choose the available worker with fewest outstanding batches, and
+        # the one with lower recent latency if tied, start from next worker
+        # in cycle to spread the batches evenly when all workers are idle
+        start = next(self._workers_idx_cycle)
+        best_idx, best_load = None, None
+        for i in range(self._num_workers):
+            worker_idx = (start + i) % self._num_workers
+            if not self._worker_status[worker_idx]:
+                continue
+            load = (
+                self._worker_outstanding[worker_idx],
+                self._worker_latency[worker_idx].ewma,
+            )
+            if best_load is None or load < best_load:
+                best_idx, best_load = worker_idx, load
+        return best_idx
+
     def __del__(self):
         self._try_shutdown_all()
 
@@ -808,6 +1043,12 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
             # no enough data to generate next output, close blocking_queue and
             # set _thread_done_event here, py_reader will raise StopIteration,
             # end workers and indices_queues in StopIteration handling
+            if (
+                self._epoch_end_idx is not None
+                and self._consumed_idx >= self._epoch_end_idx
+            ):
+                # batches outstanding belong to the next epoch
+                raise StopIteration
             if self._batches_outstanding < len(self._places):
                 if self._persistent_workers:
                     raise StopIteration
@@ -861,5 +1102,6 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
 
     def _on_output_batch(self):
         for _ in range(len(self._places)):
+            self._consumed_idx += 1
             self._batches_outstanding -= 1
             self._try_put_indices()
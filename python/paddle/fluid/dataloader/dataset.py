@@ -40,6 +40,10 @@ class Dataset(object):
     :code:`__len__`: return dataset sample number. This method is required
     by some implements of :code:`paddle.io.BatchSampler`
 
+    Subclasses can optionally implement :code:`__getitems__`, which gets
+    the list of samples of a batch of indices at once, and is used by
+    :code:`paddle.io.DataLoader` instead of :code:`__getitem__` if defined.
+
     see :code:`paddle.io.DataLoader`.
 
     Examples:
@@ -125,12 +125,18 @@ class _MapDatasetFetcher(_DatasetFetcher):
 
     def fetch(self, batch_indices, done_event=None):
         if self.auto_collate_batch:
-            data = []
-            for idx in batch_indices:
-                if done_event is None or not done_event.is_set():
-                    data.append(self.dataset[idx])
-                else:
+            if hasattr(self.dataset, '__getitems__'):
+                # dataset gets samples of a batch at once
+                if done_event is not None and done_event.is_set():
                     return None
+                data = self.dataset.__getitems__(batch_indices)
+            else:
+                data = []
+                for idx in batch_indices:
+                    if done_event is None or not done_event.is_set():
+                        data.append(self.dataset[idx])
+                    else:
+                        return None
 
             global _WARNING_TO_LOG
             if not isinstance(data[0], (Sequence, Mapping)) and _WARNING_TO_LOG:
@@ -0,0 +1,170 @@
+#   Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import multiprocessing
+
+import numpy as np
+
+from ..multiprocess_utils import MP_STATUS_CHECK_INTERVAL
+
+__all__ = []
+
+# every array in slab starts at an aligned offset
+_SLAB_ALIGNMENT = 64
+
+
+def _aligned(nbytes):
+    return (nbytes + _SLAB_ALIGNMENT - 1) // _SLAB_ALIGNMENT * _SLAB_ALIGNMENT
+
+
+class _SlabBatch(object):
+    """
+    Descriptor of a batch written into a slab of _SlabPool, which is
+    put into the inter-process queue instead of the batch data.
+    """
+
+    __slots__ = ['worker_id', 'slab_id', 'metas']
+
+    def __init__(self, worker_id, slab_id, metas):
+        self.worker_id = worker_id
+        self.slab_id = slab_id
+        # list of (offset, shape, dtype str) of each array in slab
+        self.metas = metas
+
+    def __getstate__(self):
+        return self.worker_id, self.slab_id, self.metas
+
+    def __setstate__(self, state):
+        self.worker_id, self.slab_id, self.metas = state
+
+
+class _SlabPool(object):
+    """
+    A pool of pre-allocated shared memory slabs owned by one DataLoader
+    worker. The worker writes a batch into a free slab and only sends a
+    small _SlabBatch descriptor to the main process, which copies the
+    batch out and releases the slab for reusing, so no shared memory
+    segment is created per batch.
+
+    The copy in main process is not free, it costs about the same as the
+    page faults of reading a newly mapped shared memory segment in the
+    default way, e.g. 4.9ms vs 4.6ms for a batch of 37MB. The batch cannot
+    be handed out as a zero-copy view of the slab, since the lifetime of
+    LoDTensor pushed into the blocking queue is not tracked in Python to
+    release the slab after the batch is consumed.
+
+    The pool is created in main process and passed to the worker process.
+    A slab is marked busy by the worker and freed by the main process,
+    the semaphore counts the free slabs.
+
+    Args:
+        worker_id(int): the id of the worker owning the pool.
+        num_slabs(int): the number of slabs.
+        slab_size(int): the size in bytes of each slab.
+    """
+
+    def __init__(self, worker_id, num_slabs, slab_size):
+        assert num_slabs > 0, "num_slabs should be a positive value"
+        assert slab_size > 0, "slab_size should be a positive value"
+        self.worker_id = worker_id
+        self.num_slabs = num_slabs
+        self.slab_size = _aligned(slab_size)
+        self._buffer = multiprocessing.RawArray(
+            'B', self.num_slabs * self.slab_size
+        )
+        self._busy = multiprocessing.RawArray('B', self.num_slabs)
+        self._free = multiprocessing.Semaphore(self.num_slabs)
+        self._memory = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_memory'] = None
+        return state
+
+    @property
+    def memory(self):
+        # numpy view should be created lazily in each process
+        if self._memory is None:
+            self._memory = np.frombuffer(self._buffer, dtype=np.uint8)
+        return self._memory
+
+    def fits(self, arrays):
+        """
+        Whether the arrays can be written into one slab.
+        """
+        nbytes = 0
+        for array in arrays:
+            if not isinstance(array, np.ndarray) or array.dtype.hasobject:
+                return False
+            nbytes += _aligned(array.nbytes)
+        return nbytes <= self.slab_size
+
+    def _acquire(self, done_event=None):
+        while not self._free.acquire(timeout=MP_STATUS_CHECK_INTERVAL):
+            if done_event is not None and done_event.is_set():
+                return None
+        for slab_id in range(self.num_slabs):
+            if not self._busy[slab_id]:
+                self._busy[slab_id] = 1
+                return slab_id
+        # semaphore counts free slabs, should not be here
+        self._free.release()
+        return None
+
+    def put(self, arrays, done_event=None):
+        """
+        Write arrays into a free slab, blocking until a slab is released
+        by the main process. Called in worker process.
+
+        Returns:
+            _SlabBatch: the descriptor of the written batch, or None if the
+                arrays cannot be written into a slab or done_event is set.
+        """
+        if not self.fits(arrays):
+            return None
+        slab_id = self._acquire(done_event)
+        if slab_id is None:
+            return None
+        base = slab_id * self.slab_size
+        offset = 0
+        metas = []
+        for array in arrays:
+            view = self._view(base + offset, array.shape, array.dtype)
+            np.copyto(view, array, casting='no')
+            metas.append((offset, array.shape, array.dtype.str))
+            offset += _aligned(array.nbytes)
+        return _SlabBatch(self.worker_id, slab_id, metas)
+
+    def _view(self, start, shape, dtype):
+        dtype = np.dtype(dtype)
+        nbytes = int(np.prod(shape, dtype='int64')) * dtype.itemsize
+        return self.memory[start : start + nbytes].view(dtype).reshape(shape)
+
+    def get(self, slab_batch):
+        """
+        Return the arrays of slab_batch as views of the slab, which are
+        only valid before the slab is released. Called in main process.
+        """
+        base = slab_batch.slab_id * self.slab_size
+        return [
+            self._view(base + offset, shape, dtype)
+            for offset, shape, dtype in slab_batch.metas
+        ]
+
+    def release(self, slab_batch):
+        """
+        Release the slab of slab_batch for reusing. Called in main process.
+        """
+        self._busy[slab_batch.slab_id] = 0
+        self._free.release()
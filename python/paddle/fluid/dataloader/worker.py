@@ -21,6 +21,7 @@ import traceback
 from collections import namedtuple
 from .. import core
 from .fetcher import _IterableDatasetFetcher, _MapDatasetFetcher
+from .collate import CompiledCollateFn
 from ..multiprocess_utils import (
     _cleanup_mmap,
     CleanupFuncRegistrar,
@@ -277,6 +278,7 @@ def _worker_loop(
     num_workers,
     use_shared_memory,
     base_seed,
+    slab_pool=None,
 ):
     try:
         # NOTE: [ mmap files clear ] When the child process exits unexpectedly,
@@ -309,6 +311,12 @@ def _worker_loop(
             seed=base_seed,
         )
 
+        # NOTE: multiprocessing.Queue pickles batches in a feeder thread,
+        # reused batch buffers may be overwritten by the next batch before
+        # being sent when the batches are not copied into shared memory
+        if not use_shared_memory and isinstance(collate_fn, CompiledCollateFn):
+            collate_fn._reuse_buffers = False
+
         init_exception = None
         try:
             if init_fn is not None:
@@ -373,7 +381,15 @@ def _worker_loop(
                 if isinstance(batch, _WorkerException):
                     out_queue.put((idx, batch, None))
                 batch, structure = _flatten_batch(batch)
-                if use_shared_memory:
+                slab_batch = None
+                if slab_pool is not None:
+                    # NOTE: write batch into a reused shared memory slab,
+                    # fall back to sharing each tensor if the batch cannot
+                    # be written into a slab
+                    slab_batch = slab_pool.put(batch, done_event)
+                if slab_batch is not None:
+                    out_queue.put((idx, slab_batch, structure))
+                elif use_shared_memory:
                     # NOTE: In eager mode, Tensor._share_memory has no
                     # effect, fall back to _array_to_share_memory_tensor
                     def tensor_share_memory(tensor):
@@ -209,6 +209,49 @@ def create_and_update_origin_info_map(
     return origin_info_map
 
 
+def dump_origin_info_map(origin_info_map, func):
+    """
+    Dumps the original information map of a transformed function into records
+    of plain values, which can be loaded by `load_origin_info_map`.
+
+    Line numbers of the original function are saved relative to its first
+    line, so that the records are still valid after the function is moved
+    in its source file.
+    """
+    begin_lineno = inspect.getsourcelines(unwrap(func))[1]
+    return [
+        (
+            static_loc[1],
+            info.location.lineno - begin_lineno,
+            info.location.col_offset,
+            info.function_name,
+            info.source_code,
+        )
+        for static_loc, info in origin_info_map.items()
+    ]
+
+
+def load_origin_info_map(records, func, static_func):
+    """
+    Loads the original information map dumped by `dump_origin_info_map` for
+    the static function transformed from `func`, and updates it into the
+    global map.
+    """
+    func = unwrap(func)
+    filepath = inspect.getsourcefile(func)
+    begin_lineno = inspect.getsourcelines(func)[1]
+    static_filepath = inspect.getsourcefile(static_func)
+
+    origin_info_map = {}
+    for static_lineno, lineno, col_offset, func_name, code_line in records:
+        loc = Location(filepath, begin_lineno + lineno, col_offset)
+        origin_info_map[(static_filepath, static_lineno)] = OriginInfo(
+            loc, func_name, code_line
+        )
+    global_origin_info_map.update(origin_info_map)
+    return origin_info_map
+
+
 def attach_origin_info(ast_node, func):
     """
     Attach original source information to AST node according corresponding function.
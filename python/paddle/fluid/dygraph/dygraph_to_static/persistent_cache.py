@@ -0,0 +1,414 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import hashlib
+import inspect
+import numbers
+import os
+import pickle
+import sys
+import threading
+
+import paddle
+from paddle.fluid import framework
+from paddle.fluid.dygraph import layers
+from paddle.fluid.dygraph.base import switch_to_static_graph
+from paddle.fluid.layers.utils import flatten
+from paddle.fluid.layers.utils import pack_sequence_as
+from paddle.fluid.dygraph.dygraph_to_static import logging_utils
+from paddle.fluid.dygraph.dygraph_to_static.utils import func_to_source_code
+from paddle.fluid.dygraph.dygraph_to_static.utils import unwrap
+
+__all__ = ["set_cache_dir"]
+
+CACHE_DIR_ENV_NAME = 'TRANSLATOR_CACHE_DIR'
+
+_cache_dir = None
+_persistent_caches = {}
+_recorder = threading.local()
+
+
+def set_cache_dir(cache_dir=None):
+    """
+    Sets the directory of persistent cache for dygraph to static graph. The
+    transformed code and traced programs of functions decorated by
+    `@paddle.jit.to_static` are saved in it, so that the later processes
+    load them instead of transforming and tracing the functions again.
+
+    There are two means to set the cache directory:
+
+    1. Call function `set_cache_dir`
+
+    2. Set environment variable `TRANSLATOR_CACHE_DIR`
+
+
+    **Note**:
+    `set_cache_dir` has a higher priority than the environment variable.
+    Cached programs are keyed by the source code of decorated functions,
+    the version of Paddle, input specs and the attributes of Layer. They are
+    also invalidated once any source file of converted functions is modified.
+    Other states affecting the traced programs, such as global variables
+    read by the functions, are not tracked, so the persistent cache should
+    be cleared after changing them.
+
+    Args:
+        cache_dir(str|None): The cache directory. The default value is None,
+            which means to use the environment variable. An empty string
+            disables the persistent cache.
+
+    Examples:
+        .. code-block:: python
+
+            import paddle
+
+            paddle.jit.set_cache_dir('./to_static_cache')
+    """
+    global _cache_dir
+    _cache_dir = cache_dir
+
+
+def get_persistent_cache():
+    """
+    Returns the PersistentCache of current cache directory, or None if the
+    persistent cache is disabled.
+    """
+    cache_dir = _cache_dir
+    if cache_dir is None:
+        cache_dir = os.getenv(CACHE_DIR_ENV_NAME)
+    if not cache_dir:
+        return None
+    if cache_dir not in _persistent_caches:
+        _persistent_caches[cache_dir] = PersistentCache(cache_dir)
+    return _persistent_caches[cache_dir]
+
+
+def _source_file(func):
+    try:
+        return inspect.getsourcefile(unwrap(func))
+    except TypeError:
+        return None
+
+
+@contextlib.contextmanager
+def record_source_files():
+    """
+    Records the source files of functions converted in the context.
+    """
+    if not hasattr(_recorder, 'stack'):
+        _recorder.stack = []
+    source_files = set()
+    _recorder.stack.append(source_files)
+    try:
+        yield source_files
+    finally:
+        _recorder.stack.pop()
+
+
+def record_source_file(func):
+    stack = getattr(_recorder, 'stack', None)
+    if stack:
+        source_file = _source_file(func)
+        for source_files in stack:
+            source_files.add(source_file)
+
+
+class _Uncacheable(Exception):
+    pass
+
+
+def _describe(value):
+    """
+    Describes a value by plain text, which is the same in each process.
+    """
+    if isinstance(value, paddle.static.InputSpec):
+        # NOTE: the name is excluded like `InputSpec.__hash__`, because names
+        # of specs from tensors are counters differing among processes, and
+        # the feed variables are matched by position instead of name.
+        return 'InputSpec({}, {}, {})'.format(
+            value.shape,
+            value.dtype,
+            getattr(value, 'stop_gradient', None),
+        )
+    if isinstance(value, (list, tuple)):
+        return '{}({})'.format(
+            type(value).__name__, ','.join(_describe(v) for v in value)
+        )
+    if isinstance(value, dict):
+        return 'dict({})'.format(
+            ','.join(
+                '{!r}:{}'.format(k, _describe(value[k]))
+                for k in sorted(value, key=repr)
+            )
+        )
+    if isinstance(value, (numbers.Number, str, bytes, type(None))):
+        return repr(value)
+    if inspect.isclass(value) or inspect.isroutine(value):
+        module = getattr(value, '__module__', None)
+        qualname = getattr(value, '__qualname__', None)
+        # NOTE: lambdas and local functions share their qualified names, and
+        # bound methods depend on their instances.
+        if (
+            module is not None
+            and qualname is not None
+            and '<' not in qualname
+            and not inspect.ismethod(value)
+        ):
+            return '{}.{}'.format(module, qualname)
+    raise _Uncacheable()
+
+
+def _describe_layer(layer):
+    """
+    Describes a Layer and its sublayers by their classes and attributes. Raises
+    _Uncacheable if any public attribute can not be described, since it may
+    change the traced program.
+    """
+    items = []
+    for name, sublayer in [('', layer)] + list(layer.named_sublayers()):
+        attrs = []
+        for attr, value in sorted(vars(sublayer).items()):
+            try:
+                attrs.append('{}={}'.format(attr, _describe(value)))
+            except _Uncacheable:
+                # NOTE: private attributes mostly hold the states managed by
+                # Layer itself, such as parameters and sublayers, which are
+                # keyed separately.
+                if not attr.startswith('_'):
+                    raise
+        cls = type(sublayer)
+        items.append(
+            '{}:{}.{}({})'.format(
+                name, cls.__module__, cls.__qualname__, ','.join(attrs)
+            )
+        )
+    return '\n'.join(items)
+
+
+class _VarRef(object):
+    """
+    Reference of a Variable in cached program.
+    """
+
+    __slots__ = ['name']
+
+    def __init__(self, name):
+        self.name = name
+
+    def __getstate__(self):
+        return self.name
+
+    def __setstate__(self, name):
+        self.name = name
+
+
+def _dump_structure(structure):
+    flat = [
+        _VarRef(v.name) if isinstance(v, framework.Variable) else v
+        for v in flatten(structure)
+    ]
+    return pack_sequence_as(structure, flat)
+
+
+def _load_structure(structure, block):
+    flat = [
+        block.var(v.name) if isinstance(v, _VarRef) else v
+        for v in flatten(structure)
+    ]
+    return pack_sequence_as(structure, flat)
+
+
+class PersistentCache(object):
+    """
+    An on-disk cache of transformed code and traced programs, which can be
+    shared by processes.
+
+    Args:
+        cache_dir(str): The directory of cache entries.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        # {source_file : (mtime_ns, size, sha1 of content)}
+        self._file_hashes = {}
+
+    @staticmethod
+    def _version():
+        return '{}|{}|{}'.format(
+            paddle.__version__,
+            getattr(paddle.version, 'commit', ''),
+            sys.version_info[:2],
+        )
+
+    def _hash(self, *items):
+        key = '\0'.join([self._version()] + list(items))
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def _path(self, kind, key):
+        return os.path.join(self.cache_dir, kind, key[:2], key + '.pkl')
+
+    def _load(self, kind, key):
+        path = self._path(kind, key)
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging_utils.warn(
+                "Failed to load the persistent cache {}: {}".format(path, e)
+            )
+            return None
+
+    def _save(self, kind, key, value):
+        path = self._path(kind, key)
+        tmp_path = '{}.{}.{}.tmp'.format(
+            path, os.getpid(), threading.get_ident()
+        )
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # NOTE: the entry is renamed atomically, so that processes never
+            # read a partially written entry.
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logging_utils.log(
+                1, "Skip saving the persistent cache {}: {}".format(path, e)
+            )
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _file_hash(self, path):
+        stat = os.stat(path)
+        cached = self._file_hashes.get(path)
+        if cached is None or cached[:2] != (stat.st_mtime_ns, stat.st_size):
+            with open(path, 'rb') as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+            cached = (stat.st_mtime_ns, stat.st_size, digest)
+            self._file_hashes[path] = cached
+        return cached[2]
+
+    def load_code(self, source_code):
+        """
+        Returns the transformed source code and the records of original
+        information map of a function, or None if missing.
+        """
+        return self._load('code', self._hash(source_code))
+
+    def save_code(self, source_code, static_source, origin_info_records):
+        self._save(
+            'code',
+            self._hash(source_code),
+            (static_source, origin_info_records),
+        )
+
+    def program_key(
+        self,
+        function,
+        input_args_with_spec,
+        input_kwargs_with_spec,
+        class_instance,
+        with_hook=False,
+        is_train=True,
+    ):
+        """
+        Returns the key of a traced program, or None if the inputs can not be
+        described consistently among processes.
+        """
+        try:
+            function = unwrap(function)
+            items = [
+                '{}.{}'.format(function.__module__, function.__qualname__),
+                func_to_source_code(function),
+                _describe(input_args_with_spec),
+                _describe(input_kwargs_with_spec),
+                _describe(
+                    (
+                        with_hook,
+                        is_train,
+                        framework.default_main_program().random_seed,
+                    )
+                ),
+            ]
+            if isinstance(class_instance, layers.Layer):
+                items.append(_describe_layer(class_instance))
+            elif class_instance is not None:
+                return None
+        except (_Uncacheable, OSError, TypeError):
+            return None
+        return self._hash(*items)
+
+    @switch_to_static_graph
+    def load_program(self, key, parameters):
+        """
+        Returns a dict of `inputs`, `outputs`, `main_program` and
+        `startup_program` of a traced program, or None if missing or any
+        source file of converted functions or any parameter is changed.
+        """
+        entry = self._load('program', key)
+        if entry is None:
+            return None
+        try:
+            for path, digest in entry['source_files'].items():
+                if self._file_hash(path) != digest:
+                    return None
+        except OSError:
+            return None
+        if entry['parameters'] != [(p.name, list(p.shape)) for p in parameters]:
+            return None
+
+        main_program = framework.Program.parse_from_string(
+            entry['main_program']
+        )
+        startup_program = framework.Program.parse_from_string(
+            entry['startup_program']
+        )
+        random_seed = framework.default_main_program().random_seed
+        main_program.random_seed = random_seed
+        startup_program.random_seed = random_seed
+        block = main_program.global_block()
+        return {
+            'inputs': _load_structure(entry['inputs'], block),
+            'outputs': _load_structure(entry['outputs'], block),
+            'main_program': main_program,
+            'startup_program': startup_program,
+        }
+
+    def save_program(
+        self,
+        key,
+        inputs,
+        outputs,
+        parameters,
+        main_program,
+        startup_program,
+        source_files,
+    ):
+        if None in source_files:
+            return
+        try:
+            entry = {
+                'inputs': _dump_structure(inputs),
+                'outputs': _dump_structure(outputs),
+                'parameters': [(p.name, list(p.shape)) for p in parameters],
+                'main_program': main_program.desc.serialize_to_string(),
+                'startup_program': startup_program.desc.serialize_to_string(),
+                'source_files': {
+                    path: self._file_hash(path) for path in source_files
+                },
+            }
+        except OSError:
+            return
+        self._save('program', key, entry)
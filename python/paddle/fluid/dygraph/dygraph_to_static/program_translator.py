@@ -13,17 +13,23 @@
 # limitations under the License.
 
 import collections
+import copy
 from paddle.utils import gast
 import inspect
 import textwrap
 import threading
 import weakref
 
+import numpy as np
+
+import paddle
+from paddle.fluid import core
 from paddle.fluid import framework
 from paddle.fluid import _non_static_mode
 from paddle.fluid.dygraph import layers
 from paddle.fluid.data_feeder import check_type
 from paddle.fluid.layers.utils import flatten
+from paddle.fluid.layers.utils import pack_sequence_as
 from paddle.fluid.dygraph.base import param_guard
 from paddle.fluid.dygraph.base import switch_to_static_graph
 from paddle.fluid.dygraph.dygraph_to_static import DygraphToStaticAst
@@ -35,15 +41,24 @@ from paddle.fluid.dygraph.dygraph_to_static.origin_info import (
 from paddle.fluid.dygraph.dygraph_to_static.origin_info import (
     create_and_update_origin_info_map,
 )
+from paddle.fluid.dygraph.dygraph_to_static.origin_info import (
+    dump_origin_info_map,
+    load_origin_info_map,
+)
 from paddle.fluid.dygraph.dygraph_to_static.origin_info import (
     update_op_callstack_with_origin_info,
 )
 from paddle.fluid.dygraph.dygraph_to_static.partial_program import (
     partial_program_from,
 )
-from paddle.fluid.dygraph.dygraph_to_static.utils import ast_to_func
+from paddle.fluid.dygraph.dygraph_to_static.persistent_cache import (
+    get_persistent_cache,
+    record_source_file,
+    record_source_files,
+)
 from paddle.fluid.dygraph.dygraph_to_static.utils import ast_to_source_code
 from paddle.fluid.dygraph.dygraph_to_static.utils import func_to_source_code
+from paddle.fluid.dygraph.dygraph_to_static.utils import source_to_func
 from paddle.fluid.dygraph.dygraph_to_static.utils import input_specs_compatible
 from paddle.fluid.dygraph.dygraph_to_static.utils import type_name
 from paddle.fluid.dygraph.dygraph_to_static.utils import unwrap
@@ -67,6 +82,28 @@ __all__ = ['ProgramTranslator', 'convert_to_static']
 # Once exceeding the threshold, we will raise warning to users to make sure the conversion is as expected.
 MAX_TRACED_PROGRAM_COUNT = 10
 
+# The bounds of programs cached for each decorated function. Once exceeding
+# either of them, the least recently used programs are evicted. The size of
+# a program is estimated by its serialized ProgramDesc, parameters are shared
+# by all programs and not counted.
+MAX_CACHED_PROGRAM_COUNT = 64
+MAX_CACHED_PROGRAM_BYTES = 256 << 20
+
+# Once the inputs of a decorated function have shown this number of distinct
+# sizes in one dimension, the dimension is relaxed into -1 in InputSpec, so
+# that one program with dynamic shape serves all the sizes rather than
+# tracing a program for each of them. If tracing with the relaxed dimensions
+# fails, e.g. the function computes with `x.shape[i]` in Python, the program
+# is traced with the specialized sizes and the dimensions are never relaxed
+# again. None by default, which disables relaxation, and it is read whenever
+# a new program is traced, so it can be set at any time, such as:
+#     program_translator.SHAPE_RELAX_THRESHOLD = 4
+SHAPE_RELAX_THRESHOLD = None
+
+# The number of recently hit inputs of each decorated function, which are
+# checked by fingerprint before building the CacheKey in `__call__`.
+MAX_CALL_CACHE_COUNT = 8
+
 
 class FunctionCache(object):
     """
@@ -117,6 +154,19 @@ class FunctionCache(object):
         func = unwrap(func)
         source_code = func_to_source_code(func)
 
+        # Load the transformed code from persistent cache if enabled.
+        persistent_cache = get_persistent_cache()
+        if (
+            persistent_cache is not None
+            and source_code not in self._code_to_ast_caches
+        ):
+            cached = persistent_cache.load_code(source_code)
+            if cached is not None:
+                static_source, origin_info_records = cached
+                static_func, file_name = source_to_func(static_source, func)
+                load_origin_info_map(origin_info_records, func, static_func)
+                return static_func
+
         # TODO(liym27):
         #  Consider this case: source_code in self._code_to_ast_caches,
         #  but actually they are methods in different classes.
@@ -130,9 +180,18 @@ class FunctionCache(object):
             self._code_to_ast_caches[source_code] = root_wrapper
 
         # Get static function from AST
-        static_func, file_name = ast_to_func(root_wrapper.node, func)
+        static_source = ast_to_source_code(root_wrapper.node)
+        static_func, file_name = source_to_func(static_source, func)
 
-        create_and_update_origin_info_map(root_wrapper.node, static_func)
+        origin_info_map = create_and_update_origin_info_map(
+            root_wrapper.node, static_func, is_global=False
+        )
+        if persistent_cache is not None:
+            persistent_cache.save_code(
+                source_code,
+                static_source,
+                dump_origin_info_map(origin_info_map, func),
+            )
         return static_func
 
     def exist(self, func):
@@ -152,6 +211,7 @@ def convert_to_static(function):
     """
     if getattr(function, ALREADY_D2S, None):
         return function
+    record_source_file(function)
     with _CACHE_LOCK:
         static_func = _FUNCTION_CACHE.convert_with_cache(function)
         setattr(static_func, ALREADY_D2S, True)
@@ -260,6 +320,31 @@ class CacheKey(object):
         )
 
 
+def _fingerprint(value, names):
+    """
+    Describes the shape, dtype and nest structure of input value, which
+    decides the CacheKey generated by `CacheKey.from_func_and_args`. Names
+    of tensors are appended into `names`.
+    """
+    if isinstance(value, (core.VarBase, core.eager.Tensor)):
+        names.append(value.name)
+        return (
+            type(value),
+            tuple(value.shape),
+            value.dtype,
+            value.stop_gradient,
+        )
+    if isinstance(value, np.ndarray):
+        return (np.ndarray, value.shape, value.dtype)
+    if isinstance(value, (list, tuple)):
+        return (type(value),) + tuple(_fingerprint(v, names) for v in value)
+    if isinstance(value, dict):
+        return (dict,) + tuple(
+            (k, _fingerprint(v, names)) for k, v in value.items()
+        )
+    return value
+
+
 def unwrap_decorators(func):
     """
     Unwraps a decorated function and returns the decorator list and inner target.
@@ -325,6 +410,9 @@ class StaticFunction(object):
         self._cuda_graph_pool_id = 0
 
         self._property = kwargs.get("property", False)
+        # {fingerprint of inputs : (hash_id, cache_key)} of recent hits
+        self._call_cache = collections.OrderedDict()
+        self._last_call = (None, None)
 
     @property
     def is_property(self):
@@ -436,9 +524,10 @@ class StaticFunction(object):
         args, kwargs = self._function_spec.unified_args_and_kwargs(args, kwargs)
 
         try:
-            concrete_program, partial_program_layer = self.get_concrete_program(
-                *args, **kwargs, is_train=self._is_train_mode()
-            )
+            (
+                concrete_program,
+                partial_program_layer,
+            ) = self._get_concrete_program_for_call(args, kwargs)
             # 3. synchronize self.training attribute.
             if isinstance(self._class_instance, layers.Layer):
                 partial_program_layer.training = self._class_instance.training
@@ -469,6 +558,76 @@ class StaticFunction(object):
                 )
                 raise e
 
+    def _call_fingerprint(self, args, kwargs):
+        """
+        Returns the fingerprint of inputs of `__call__`, or None if the inputs
+        can't be identified by fingerprint.
+        """
+        input_spec = self._function_spec.input_spec
+        if input_spec is not None:
+            # NOTE: Tensors without InputSpec are kept in CacheKey by
+            # themselves rather than by their shapes.
+            for value in flatten(args[len(input_spec) :]):
+                if isinstance(value, (core.VarBase, core.eager.Tensor)):
+                    return None
+        names = []
+        fingerprint = (
+            self._is_train_mode(),
+            _fingerprint(args, names),
+            _fingerprint(kwargs, names),
+        )
+        # the same tensor fed by several arguments is one input of program,
+        # see `_hash_spec_names`
+        name_ids = {}
+        return fingerprint + (
+            tuple(name_ids.setdefault(name, len(name_ids)) for name in names),
+        )
+
+    def _get_concrete_program_for_call(self, args, kwargs):
+        """
+        Returns the traced program for inputs of `__call__`. Building the
+        CacheKey costs much more than running small programs, so the
+        fingerprint of inputs is compared with the last hit and looked up
+        in recent hits first, and the CacheKey is only built on misses.
+        """
+        # NOTE: ProgramCache.__getitem__ may be patched to rebuild programs,
+        # such as on IPU, which can't be skipped.
+        if ProgramCache.__getitem__ is not _PROGRAM_CACHE_GETITEM:
+            return self.get_concrete_program(
+                *args, **kwargs, is_train=self._is_train_mode()
+            )
+
+        try:
+            fingerprint = self._call_fingerprint(args, kwargs)
+            last_fingerprint, entry = self._last_call
+            if fingerprint is None:
+                entry = None
+            elif fingerprint != last_fingerprint:
+                entry = self._call_cache.get(fingerprint)
+        except TypeError:
+            # unhashable inputs
+            fingerprint, entry = None, None
+
+        if entry is not None:
+            program = self._program_cache.get_by_id(*entry)
+            if program is not None:
+                self._last_call = (fingerprint, entry)
+                return program
+
+        program = self.get_concrete_program(
+            *args, **kwargs, is_train=self._is_train_mode()
+        )
+        if fingerprint is not None:
+            entry = (
+                self._program_cache._recent_key,
+                self._program_cache._recent_cache_key,
+            )
+            self._call_cache[fingerprint] = entry
+            if len(self._call_cache) > MAX_CALL_CACHE_COUNT:
+                self._call_cache.popitem(last=False)
+            self._last_call = (fingerprint, entry)
+        return program
+
     def _is_train_mode(self):
         if self._class_instance is not None:
             if not hasattr(self._class_instance, 'training'):
@@ -1025,6 +1184,41 @@ class ConcreteProgram(object):
             **kwargs
         )
 
+    @staticmethod
+    def from_persistent_cache(
+        persistent_cache, key, func_spec, class_instance, **kwargs
+    ):
+        """
+        Loads the program traced by `from_func_spec` from persistent cache,
+        returns None if missing.
+
+        Args:
+            persistent_cache(PersistentCache): The persistent cache.
+            key(str): The key of program in persistent cache.
+            func_spec(FunctionSpec): A FunctionSpec instance for decorated function.
+            class_instance(Layer): The instance of Layer or None.
+        """
+        _verify_init_in_dynamic_mode(class_instance)
+        all_parameters_and_buffers = _extract_indeed_params_buffers(
+            class_instance
+        )
+        cached = persistent_cache.load_program(key, all_parameters_and_buffers)
+        if cached is None:
+            return None
+
+        inputs = cached['inputs']
+        if class_instance:
+            inputs = tuple([class_instance] + list(inputs))
+        return ConcreteProgram(
+            inputs=inputs,
+            outputs=cached['outputs'],
+            parameters=all_parameters_and_buffers,
+            function=func_spec.dygraph_function,
+            main_program=cached['main_program'],
+            startup_program=cached['startup_program'],
+            **kwargs
+        )
+
 
 def _extract_indeed_params_buffers(class_instance):
     """
@@ -1040,24 +1234,206 @@ def _extract_indeed_params_buffers(class_instance):
 class ProgramCache(object):
     """
     Wrapper class for the program functions defined by dygraph function.
+
+    Programs are evicted in LRU order once exceeding `max_count` programs or
+    `max_bytes` bytes. Dimensions of inputs that have shown
+    `relax_threshold` distinct sizes are relaxed into -1 in the cache keys,
+    and the programs specialized for these sizes are dropped. If a program
+    fails to be traced with relaxed dimensions, it is traced with the
+    specialized cache key instead, and these dimensions are not relaxed any
+    more. `relax_threshold` of -1 means `SHAPE_RELAX_THRESHOLD`.
     """
 
-    def __init__(self):
+    def __init__(self, max_count=None, max_bytes=None, relax_threshold=-1):
         # {hash_id : (concrete_program, partial_layer)}
         self._caches = collections.OrderedDict()
+        # {hash_id : (cache_key, size of program in bytes)}
+        self._entries = {}
+        self._total_bytes = 0
+        self._max_count = max_count or MAX_CACHED_PROGRAM_COUNT
+        self._max_bytes = max_bytes or MAX_CACHED_PROGRAM_BYTES
+        self._relax_threshold = relax_threshold
+        # {(arg_type, index, rank, dtype, dim) : set of seen sizes}
+        self._dim_sizes = collections.defaultdict(set)
+        # {(arg_type, index, rank, dtype) : set of relaxed dims}
+        self._relaxed_dims = {}
+        # {(arg_type, index, rank, dtype) : set of dims failed to relax}
+        self._fixed_dims = {}
         # trace mostly recent used program
         self._recent_key = None
         self._recent_cache_key = None
 
     def _build_once(self, cache_key):
-        concrete_program = ConcreteProgram.from_func_spec(
-            func_spec=cache_key.function_spec,
-            input_spec=cache_key.input_args_with_spec,
-            input_kwargs_spec=cache_key.input_kwargs_with_spec,
-            class_instance=cache_key.class_instance,
+        persistent_cache = get_persistent_cache()
+        concrete_program, key = None, None
+        if persistent_cache is not None:
+            key = persistent_cache.program_key(
+                cache_key.function_spec.dygraph_function,
+                cache_key.input_args_with_spec,
+                cache_key.input_kwargs_with_spec,
+                cache_key.class_instance,
+                with_hook=cache_key.kwargs.get("with_hook", False),
+                is_train=cache_key.kwargs.get("is_train", True),
+            )
+        if key is not None:
+            concrete_program = ConcreteProgram.from_persistent_cache(
+                persistent_cache,
+                key,
+                func_spec=cache_key.function_spec,
+                class_instance=cache_key.class_instance,
+                **cache_key.kwargs
+            )
+
+        if concrete_program is None:
+            with record_source_files() as source_files:
+                concrete_program = ConcreteProgram.from_func_spec(
+                    func_spec=cache_key.function_spec,
+                    input_spec=cache_key.input_args_with_spec,
+                    input_kwargs_spec=cache_key.input_kwargs_with_spec,
+                    class_instance=cache_key.class_instance,
+                    **cache_key.kwargs
+                )
+            if key is not None:
+                inputs = concrete_program.inputs
+                if cache_key.class_instance is not None:
+                    inputs = inputs[1:]
+                persistent_cache.save_program(
+                    key,
+                    inputs,
+                    concrete_program.outputs,
+                    concrete_program.parameters,
+                    concrete_program.main_program,
+                    concrete_program.startup_program,
+                    source_files,
+                )
+        return concrete_program, partial_program_from(concrete_program)
+
+    @staticmethod
+    def _spec_id(arg_type, index, spec):
+        return (arg_type, index, len(spec.shape), spec.dtype)
+
+    def _iter_specs(self, cache_key):
+        for arg_type, specs in [
+            ('args', cache_key.input_args_with_spec),
+            ('kwargs', cache_key.input_kwargs_with_spec),
+        ]:
+            for index, spec in enumerate(flatten(specs)):
+                if isinstance(spec, paddle.static.InputSpec):
+                    yield self._spec_id(arg_type, index, spec), spec
+
+    def _relax(self, cache_key):
+        """
+        Returns the cache key with relaxed dimensions replaced by -1.
+        """
+        if not self._relaxed_dims:
+            return cache_key
+
+        def relax(arg_type, specs):
+            flat_specs = flatten(specs)
+            changed = False
+            for index, spec in enumerate(flat_specs):
+                if not isinstance(spec, paddle.static.InputSpec):
+                    continue
+                dims = self._relaxed_dims.get(
+                    self._spec_id(arg_type, index, spec)
+                )
+                if not dims or all(spec.shape[d] == -1 for d in dims):
+                    continue
+                # NOTE: InputSpec may be specified by users and shared by
+                # cache keys, so a copy is modified.
+                new_spec = copy.copy(spec)
+                new_spec.shape = tuple(
+                    -1 if d in dims else s for d, s in enumerate(spec.shape)
+                )
+                flat_specs[index] = new_spec
+                changed = True
+            if not changed:
+                return specs
+            return pack_sequence_as(specs, flat_specs)
+
+        input_args_with_spec = relax('args', cache_key.input_args_with_spec)
+        input_kwargs_with_spec = relax(
+            'kwargs', cache_key.input_kwargs_with_spec
+        )
+        if (
+            input_args_with_spec is cache_key.input_args_with_spec
+            and input_kwargs_with_spec is cache_key.input_kwargs_with_spec
+        ):
+            return cache_key
+        return CacheKey(
+            cache_key.function_spec,
+            input_args_with_spec,
+            input_kwargs_with_spec,
+            cache_key.class_instance,
             **cache_key.kwargs
         )
-        return concrete_program, partial_program_from(concrete_program)
+
+    def _observe(self, cache_key):
+        """
+        Records sizes of input dimensions of a cache key to be traced, and
+        returns whether any dimension is newly relaxed.
+        """
+        threshold = self._relax_threshold
+        if threshold == -1:
+            threshold = SHAPE_RELAX_THRESHOLD
+        if threshold is None:
+            return False
+        relaxed = False
+        for spec_id, spec in self._iter_specs(cache_key):
+            fixed_dims = self._fixed_dims.get(spec_id, ())
+            for dim, size in enumerate(spec.shape):
+                if size == -1 or dim in fixed_dims:
+                    continue
+                sizes = self._dim_sizes[spec_id + (dim,)]
+                sizes.add(size)
+                if len(sizes) >= threshold:
+                    self._relaxed_dims.setdefault(spec_id, set()).add(dim)
+                    del self._dim_sizes[spec_id + (dim,)]
+                    relaxed = True
+        if relaxed:
+            logging_utils.log(
+                1,
+                "Relax dimensions {} of inputs of {} into -1.".format(
+                    self._relaxed_dims, cache_key.function_spec
+                ),
+            )
+            # drop the programs specialized for the relaxed dimensions
+            for item_id, (key, _) in list(self._entries.items()):
+                if self._relax(key) is not key:
+                    self._pop(item_id)
+        return relaxed
+
+    def _fix(self, cache_key):
+        """
+        Stops relaxing the dimensions relaxed in a cache key.
+        """
+        for spec_id, spec in self._iter_specs(cache_key):
+            dims = self._relaxed_dims.pop(spec_id, None)
+            if dims:
+                self._fixed_dims.setdefault(spec_id, set()).update(dims)
+        logging_utils.warn(
+            "Failed to trace {} with relaxed input dimensions, fall back to "
+            "tracing with the specialized input shapes and stop relaxing "
+            "dimensions {}.".format(cache_key.function_spec, self._fixed_dims)
+        )
+
+    @staticmethod
+    def _program_bytes(concrete_program):
+        return len(concrete_program.main_program.desc.serialize_to_string())
+
+    def _pop(self, item_id):
+        self._caches.pop(item_id)
+        _, nbytes = self._entries.pop(item_id)
+        self._total_bytes -= nbytes
+
+    def _evict(self):
+        # the most recently used program is always kept
+        while len(self._caches) > 1 and (
+            len(self._caches) > self._max_count
+            or self._total_bytes > self._max_bytes
+        ):
+            item_id = next(iter(self._caches))
+            self._pop(item_id)
 
     def __getitem__(self, item):
         if not isinstance(item, CacheKey):
@@ -1065,11 +1441,34 @@ class ProgramCache(object):
                 'type(item) should be CacheKey, but received %s'
                 % type_name(item)
             )
+        specialized_item = item
+        item = self._relax(specialized_item)
         item_id = hash(item)
+        if item_id not in self._caches and self._observe(specialized_item):
+            item = self._relax(specialized_item)
+            item_id = hash(item)
+        if item_id not in self._caches:
+            try:
+                program = self._build_once(item)
+            except Exception:
+                if item is specialized_item:
+                    raise
+                # NOTE: the function may not support dynamic shapes, such as
+                # computing with `x.shape[i]` in Python or numpy
+                self._fix(specialized_item)
+                item = specialized_item
+                item_id = hash(item)
+                program = self._caches.get(item_id)
+                if program is None:
+                    program = self._build_once(item)
         self._recent_cache_key = item
         self._recent_key = item_id
         if item_id not in self._caches:
-            self._caches[item_id] = self._build_once(item)
+            self._caches[item_id] = program
+            nbytes = self._program_bytes(self._caches[item_id][0])
+            self._entries[item_id] = (item, nbytes)
+            self._total_bytes += nbytes
+            self._evict()
             # Note: raise warnings if number of traced program is more than `max_tracing_count`
             current_tracing_count = len(self._caches)
             if current_tracing_count > MAX_TRACED_PROGRAM_COUNT:
@@ -1079,16 +1478,30 @@ class ProgramCache(object):
                         current_tracing_count, MAX_TRACED_PROGRAM_COUNT
                     )
                 )
+        else:
+            self._caches.move_to_end(item_id)
 
         return self._caches[item_id]
 
+    def get_by_id(self, item_id, item):
+        """
+        Returns the cached program of a hash id got by `__getitem__` before,
+        or None if it has been evicted.
+        """
+        program = self._caches.get(item_id)
+        if program is not None:
+            self._caches.move_to_end(item_id)
+            self._recent_key = item_id
+            self._recent_cache_key = item
+        return program
+
     def get_program(self, item):
         if not isinstance(item, CacheKey):
             raise ValueError(
                 "Input item's type should be FunctionSpec, but received %s"
                 % type_name(item)
             )
-        item_id = hash(item)
+        item_id = hash(self._relax(item))
         if item_id not in self._caches:
             raise RuntimeError(
                 "Failed to find program for input item, please decorate input function by `@paddle.jit.to_static`."
@@ -1105,10 +1518,20 @@ class ProgramCache(object):
     def __len__(self):
         return len(self._caches)
 
+    @property
+    def total_bytes(self):
+        """
+        Returns the estimated size of cached programs in bytes.
+        """
+        return self._total_bytes
+
     def concrete_programs(self):
         return [cp for key, (cp, _) in self._caches.items()]
 
 
+_PROGRAM_CACHE_GETITEM = ProgramCache.__getitem__
+
+
 def synchronized(func):
     func.__lock__ = threading.Lock()
 
@@ -44,6 +44,9 @@ from paddle.fluid.dygraph.dygraph_to_static.logging_utils import (
     set_code_level,
     set_verbosity,
 )
+from paddle.fluid.dygraph.dygraph_to_static.persistent_cache import (
+    set_cache_dir,
+)
 from paddle.fluid.dygraph.dygraph_to_static.program_translator import (
     ProgramTranslator,
     StaticFunction,
@@ -80,6 +83,7 @@ __all__ = [
     'dygraph_to_static_func',
     'set_code_level',
     'set_verbosity',
+    'set_cache_dir',
     'save',
     'load',
     'not_to_static',
@@ -536,25 +536,30 @@ def _get_strong_program_cache_key_for_new_exe(program, feed, fetch_list):
 
 
 def _get_strong_program_cache_key(program, feed, fetch_list):
-    # TODO(zhiqiu): use hash_str to generate cache key as above
-    def _get_varname_from_block(block):
-        block_str = []
-        for var_name in list(block.vars.keys()):
-            block_str.append(var_name)
-        return "\n".join(block_str)
-
+    # NOTE: the hash of variable names in block 0 is maintained incrementally
+    # by Block.vars, so the key is got in O(1) time for large programs.
     inner_program = (
         program._program
         if isinstance(program, compiler.CompiledProgram)
         else program
     )
     return (
-        _get_varname_from_block(inner_program.blocks[0])
-        + str(id(program))
-        + _get_program_cache_key(feed, fetch_list)
+        inner_program.blocks[0].vars.names_hash(),
+        id(program),
+        _get_feed_fetch_signature(feed, fetch_list),
     )
 
 
+def _get_feed_fetch_signature(feed, fetch_list):
+    if isinstance(feed, dict):
+        feed_var_names = tuple(feed)
+    elif isinstance(feed, (list, tuple)):
+        feed_var_names = tuple(name for each in feed for name in each)
+    else:
+        feed_var_names = ()
+    return feed_var_names, tuple(map(_to_name_str, fetch_list))
+
+
 def _get_program_cache_key(feed, fetch_list):
     feed_var_names = []
     if isinstance(feed, dict):
@@ -3549,6 +3549,68 @@ class Operator(object):
         self.desc.dist_attr = dist_attr
 
 
+class _VarDict(collections.OrderedDict):
+    """
+    OrderedDict of variables in a Block, which maintains the hash of the
+    variable names incrementally, so that whether the variables of a block
+    are changed can be checked in O(1) time.
+    """
+
+    _HASH_MASK = (1 << 64) - 1
+
+    def __init__(self, *args, **kwargs):
+        self._names_hash = 0
+        super(_VarDict, self).__init__(*args, **kwargs)
+
+    def _add_name(self, name):
+        self._names_hash = (self._names_hash + hash(name)) & self._HASH_MASK
+
+    def _remove_name(self, name):
+        self._names_hash = (self._names_hash - hash(name)) & self._HASH_MASK
+
+    def __setitem__(self, name, var):
+        if name not in self:
+            self._add_name(name)
+        super(_VarDict, self).__setitem__(name, var)
+
+    def __delitem__(self, name):
+        super(_VarDict, self).__delitem__(name)
+        self._remove_name(name)
+
+    def pop(self, name, *default):
+        if name in self:
+            self._remove_name(name)
+        return super(_VarDict, self).pop(name, *default)
+
+    def popitem(self, last=True):
+        name, var = super(_VarDict, self).popitem(last)
+        self._remove_name(name)
+        return name, var
+
+    def setdefault(self, name, default=None):
+        if name not in self:
+            self[name] = default
+        return self[name]
+
+    def update(self, *args, **kwargs):
+        for name, var in dict(*args, **kwargs).items():
+            self[name] = var
+
+    def clear(self):
+        super(_VarDict, self).clear()
+        self._names_hash = 0
+
+    def __reduce__(self):
+        # NOTE: the hash is rebuilt by inserting items in copy and pickle
+        return (self.__class__, (), None, None, iter(self.items()))
+
+    def names_hash(self):
+        """
+        Returns the hash of the set of variable names.
+        """
+        return (len(self), self._names_hash)
+
+
 class Block(object):
     """
     In Fluid, a Program is consistence of multi-Block, and Block stores
@@ -3583,7 +3645,7 @@ class Block(object):
 
     def __init__(self, program, idx):
         self.desc = program.desc.block(idx)
-        self.vars = collections.OrderedDict()  # var_name --> var
+        self.vars = _VarDict()  # var_name --> var
         self.ops = list()  # operator list
         self.program = program
         self.removed_vars = collections.OrderedDict()
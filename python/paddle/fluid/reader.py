@@ -417,6 +417,38 @@ class DataLoader(object):
         worker_init_fn(callable, optional): init function which will be called with
             worker id on each subproces starting if not set as None. Default
             None.
+        persistent_workers(bool, optional): whether to keep the subprocesses
+            alive after an epoch ends. Default False.
+        prefetch_next_epoch(bool, optional): whether to prefetch the first
+            batches of the next epoch while the current epoch drains, the
+            batch sampler is iterated for the next epoch once the current
+            epoch is exhausted. If :code:`set_epoch` of the batch sampler is
+            called with another epoch before the next epoch, the prefetched
+            batches are dropped. Only works when :attr:`persistent_workers`
+            is True for map-style dataset. Default False.
+        worker_dispatch(str, optional): how to dispatch batch indices to
+            subprocesses, 'round_robin' puts indices to subprocesses in
+            turn, 'least_loaded' puts indices to the subprocess with fewest
+            outstanding batches, which avoids piling batches on a subprocess
+            slowed down by expensive samples. Default 'round_robin'.
+        reorder_window(int, optional): the bound of outputting batches out of
+            order in multi-process mode, a batch can be output once it is
+            loaded if there are less than :attr:`reorder_window` batches
+            from the earliest not output batch to it, so a slow batch does
+            not block the batches behind it. None for keeping the order of
+            batches. Only works for map-style dataset. Default None.
+        shm_slab_size(int, optional): the size in bytes of the shared memory
+            slabs. If set, each subprocess writes batches into a pool of
+            pre-allocated shared memory slabs which are reused across batches,
+            instead of creating shared memory for each batch, it should be
+            larger than the size of a batch, otherwise the batch falls back to
+            the default way. Only works when :attr:`use_shared_memory` is True
+            in multi-process mode. Note that the main process copies each
+            batch out of its slab before releasing the slab, which replaces
+            the page faults of mapping a new shared memory per batch with a
+            memory copy of similar cost, while subprocesses save the cost of
+            creating shared memory, so it helps most when subprocesses are
+            the bottleneck. Default None.
 
     Returns:
         DataLoader: an iterable object for data iterating, each elemnet of the generated data is a Tensor.
@@ -507,6 +539,10 @@ class DataLoader(object):
         timeout=0,
         worker_init_fn=None,
         persistent_workers=False,
+        shm_slab_size=None,
+        prefetch_next_epoch=False,
+        worker_dispatch='round_robin',
+        reorder_window=None,
     ):
         self.return_list = return_list
         self.collate_fn = collate_fn
@@ -547,6 +583,22 @@ class DataLoader(object):
         if use_shared_memory and num_workers == 0:
             self.use_shared_memory = False
 
+        assert (
+            shm_slab_size is None or shm_slab_size > 0
+        ), "shm_slab_size should be None or a positive value"
+        self.shm_slab_size = shm_slab_size
+
+        if worker_dispatch not in ['round_robin', 'least_loaded']:
+            raise ValueError(
+                "worker_dispatch should be 'round_robin' or 'least_loaded', "
+                "but got {}".format(worker_dispatch)
+            )
+        self.worker_dispatch = worker_dispatch
+        assert (
+            reorder_window is None or reorder_window > 0
+        ), "reorder_window should be None or a positive value"
+        self.reorder_window = reorder_window
+
         assert timeout >= 0, "timeout should be a non-negative value"
         self.timeout = timeout
 
@@ -603,6 +655,7 @@ class DataLoader(object):
             )
 
         self._persistent_workers = persistent_workers
+        self.prefetch_next_epoch = prefetch_next_epoch
         self._iterator = None
         self.num_workers = AuToTune(self).__call__()
 
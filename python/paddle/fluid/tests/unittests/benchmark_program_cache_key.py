@@ -0,0 +1,80 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import unittest
+
+import paddle
+import paddle.fluid as fluid
+from paddle.fluid.executor import (
+    _get_program_cache_key,
+    _get_strong_program_cache_key,
+)
+
+# Benchmark of the program cache key of Executor.run over large generated
+# programs, run it by `python benchmark_program_cache_key.py`.
+
+paddle.enable_static()
+
+
+def _get_varname_key(program, feed, fetch_list):
+    # the cache key before the hash of variable names is maintained by Block
+    block_str = "\n".join(list(program.blocks[0].vars.keys()))
+    return (
+        block_str + str(id(program)) + _get_program_cache_key(feed, fetch_list)
+    )
+
+
+def timeit_function(callback, iters, *args, **kwargs):
+    assert iters != 0, "Iters should >= 1"
+    start = time.time()
+    for i in range(iters):
+        callback(*args, **kwargs)
+    elapse = time.time() - start
+    return elapse / iters
+
+
+class BenchmarkProgramCacheKey(unittest.TestCase):
+    def build_program(self, num_layers):
+        program = fluid.Program()
+        with fluid.program_guard(program, fluid.Program()):
+            x = fluid.data(name='x', shape=[-1, 8], dtype='float32')
+            out = x
+            for _ in range(num_layers):
+                out = fluid.layers.scale(out, 1.0)
+                out = fluid.layers.relu(out)
+        return program, {'x': None}, [out]
+
+    def test_cache_key(self):
+        for num_layers in [1000, 10000, 50000]:
+            program, feed, fetch_list = self.build_program(num_layers)
+            iters = 20
+            legacy = timeit_function(
+                _get_varname_key, iters, program, feed, fetch_list
+            )
+            current = timeit_function(
+                _get_strong_program_cache_key, iters, program, feed, fetch_list
+            )
+            print(
+                "vars: {}, key by variable names: {:.3f} ms, key by hash: "
+                "{:.3f} ms".format(
+                    len(program.global_block().vars),
+                    legacy * 1e3,
+                    current * 1e3,
+                )
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
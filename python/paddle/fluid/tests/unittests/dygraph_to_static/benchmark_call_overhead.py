@@ -0,0 +1,96 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import unittest
+
+import paddle
+
+# Micro-benchmark of the python overhead of calling a function decorated by
+# `@paddle.jit.to_static`, run it by `python benchmark_call_overhead.py`.
+
+
+class Net(paddle.nn.Layer):
+    def __init__(self):
+        super(Net, self).__init__()
+        self.fc = paddle.nn.Linear(16, 16)
+
+    @paddle.jit.to_static
+    def forward(self, x, inputs, scale=1.0):
+        out = self.fc(x)
+        for y in inputs:
+            out = out + y * scale
+        return out
+
+
+def timeit_function(callback, iters, *args, **kwargs):
+    assert iters != 0, "Iters should >= 1"
+    start = time.time()
+    for i in range(iters):
+        callback(*args, **kwargs)
+    elapse = time.time() - start
+    return elapse / iters
+
+
+class BenchmarkCallOverhead(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.iters = 2000
+        self.net = Net()
+        self.net.eval()
+        self.x = paddle.rand([1, 16])
+        self.inputs = [paddle.rand([1, 16]) for _ in range(4)]
+
+    def test_overhead(self):
+        static_func = self.net.forward
+        args, kwargs = static_func._function_spec.unified_args_and_kwargs(
+            (self.x, self.inputs), {}
+        )
+        # warm up and trace the program
+        static_func(self.x, self.inputs)
+
+        # lookup of program by fingerprint of inputs
+        fast = timeit_function(
+            static_func._get_concrete_program_for_call,
+            self.iters,
+            args,
+            kwargs,
+        )
+        # lookup of program by building the full CacheKey
+        slow = timeit_function(
+            static_func.get_concrete_program,
+            self.iters,
+            *args,
+            **kwargs,
+            is_train=False
+        )
+        call = timeit_function(static_func, self.iters, self.x, self.inputs)
+        dygraph = timeit_function(
+            static_func.dygraph_function,
+            self.iters,
+            self.net,
+            self.x,
+            self.inputs,
+        )
+        print(
+            "lookup with fingerprint: {:.2f} us, lookup with CacheKey: "
+            "{:.2f} us, static call: {:.2f} us, dygraph call: {:.2f} us".format(
+                fast * 1e6, slow * 1e6, call * 1e6, dygraph * 1e6
+            )
+        )
+        self.assertEqual(static_func.get_traced_count(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
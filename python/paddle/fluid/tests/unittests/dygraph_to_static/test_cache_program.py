@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import unittest
+from unittest import mock
 import numpy as np
 from collections import Counter
 import paddle
@@ -21,8 +22,13 @@ import paddle.fluid as fluid
 from paddle.fluid.dygraph.jit import declarative
 from paddle.fluid.dygraph.dygraph_to_static import ProgramTranslator
 from paddle.fluid.dygraph.dygraph_to_static import convert_to_static
+from paddle.fluid.dygraph.dygraph_to_static import program_translator
+from paddle.fluid.dygraph.dygraph_to_static.program_translator import (
+    StaticFunction,
+)
 
 from test_fetch_feed import Pool2D, Linear
+from test_declarative import foo_func
 
 
 class TestCacheProgram(unittest.TestCase):
@@ -170,5 +176,120 @@ class TestToOutputWithCache(unittest.TestCase):
             self.assertEqual(ret.numpy(), 5050)
 
 
+def scale_func(x):
+    return x * 2 + 1
+
+
+def numpy_shape_func(x):
+    # numpy fails with the relaxed dimension of -1
+    ones = np.ones(x.shape, dtype='float32')
+    return x + paddle.assign(ones)
+
+
+class TestBoundedProgramCache(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+
+    def test_relax_disabled_by_default(self):
+        foo = paddle.jit.to_static(scale_func)
+        for batch_size in range(1, 9):
+            foo(paddle.rand([batch_size, 4]))
+        self.assertEqual(foo.get_traced_count(), 8)
+
+    @mock.patch.object(program_translator, 'SHAPE_RELAX_THRESHOLD', 4)
+    def test_relax_shape(self):
+        foo = paddle.jit.to_static(scale_func)
+        threshold = program_translator.SHAPE_RELAX_THRESHOLD
+        for batch_size in range(1, threshold):
+            x = paddle.rand([batch_size, 4])
+            np.testing.assert_allclose(foo(x).numpy(), x.numpy() * 2 + 1)
+        self.assertEqual(foo.get_traced_count(), threshold - 1)
+
+        # the batch dimension is relaxed, programs specialized for each
+        # batch size are replaced by one program
+        for batch_size in range(threshold, threshold * 2):
+            x = paddle.rand([batch_size, 4])
+            np.testing.assert_allclose(foo(x).numpy(), x.numpy() * 2 + 1)
+            self.assertEqual(foo.get_traced_count(), 1)
+        self.assertEqual(foo.inputs[0].shape, (-1, 4))
+
+        # the other dimension is still specialized
+        foo(paddle.rand([2, 8]))
+        self.assertEqual(foo.get_traced_count(), 2)
+
+    def test_relax_shape_fallback(self):
+        foo = paddle.jit.to_static(numpy_shape_func)
+        foo._program_cache = program_translator.ProgramCache(relax_threshold=2)
+        # the relaxed program fails to trace, programs are traced with the
+        # specialized shapes instead
+        for batch_size in [1, 2, 3, 1]:
+            x = paddle.rand([batch_size, 4])
+            np.testing.assert_allclose(foo(x).numpy(), x.numpy() + 1)
+        self.assertEqual(foo.get_traced_count(), 3)
+        for cp in foo._program_cache.concrete_programs():
+            self.assertNotEqual(cp.inputs[0].shape[0], -1)
+
+    def test_lru(self):
+        cache = program_translator.ProgramCache(
+            max_count=2, relax_threshold=None
+        )
+        foo = paddle.jit.to_static(scale_func)
+        foo._program_cache = cache
+        for batch_size in [1, 2, 1, 3]:
+            foo(paddle.rand([batch_size, 4]))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(
+            sorted(cp.inputs[0].shape[0] for cp in cache.concrete_programs()),
+            [1, 3],
+        )
+        self.assertGreater(cache.total_bytes, 0)
+
+        cache = program_translator.ProgramCache(
+            max_bytes=1, relax_threshold=None
+        )
+        foo._program_cache = cache
+        for batch_size in [1, 2, 3]:
+            foo(paddle.rand([batch_size, 4]))
+        # the most recently used program is always kept
+        self.assertEqual(len(cache), 1)
+
+
+class TestCallFastPath(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+
+    def test_fast_path(self):
+        foo = paddle.jit.to_static(foo_func)
+        x = paddle.rand([4, 10])
+        y = paddle.rand([10])
+        with mock.patch.object(
+            StaticFunction,
+            'get_concrete_program',
+            autospec=True,
+            side_effect=StaticFunction.get_concrete_program,
+        ) as get_concrete_program:
+            for _ in range(3):
+                np.testing.assert_allclose(
+                    foo(x, y).numpy(), (x + y).numpy(), rtol=1e-05
+                )
+            # the CacheKey is only built for the first call
+            self.assertEqual(get_concrete_program.call_count, 1)
+
+            # different shape, python value and aliasing of inputs
+            foo(paddle.rand([2, 10]), y)
+            foo(x, y, 3)
+            foo(y, y)
+            self.assertEqual(get_concrete_program.call_count, 4)
+            self.assertEqual(foo.get_traced_count(), 4)
+
+            foo(x, y)
+            self.assertEqual(get_concrete_program.call_count, 4)
+
+        # the program evicted from ProgramCache is traced again
+        foo._program_cache = program_translator.ProgramCache()
+        foo(x, y)
+        self.assertEqual(foo.get_traced_count(), 1)
+
+
 if __name__ == '__main__':
     unittest.main()
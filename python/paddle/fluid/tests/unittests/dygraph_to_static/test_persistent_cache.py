@@ -0,0 +1,149 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import paddle
+from paddle.fluid.dygraph.dygraph_to_static import persistent_cache
+from paddle.fluid.dygraph.dygraph_to_static import program_translator
+from paddle.fluid.dygraph.dygraph_to_static.program_translator import (
+    CacheKey,
+    ConcreteProgram,
+    FunctionCache,
+)
+
+
+class Net(paddle.nn.Layer):
+    def __init__(self, scale=2.0):
+        super(Net, self).__init__()
+        self.fc = paddle.nn.Linear(4, 3)
+        self.scale = scale
+
+    def forward(self, x):
+        out = self.fc(x)
+        if paddle.mean(out) > 0:
+            out = out * self.scale
+        return out, [x + 1]
+
+
+class ActNet(paddle.nn.Layer):
+    def __init__(self, activation):
+        super(ActNet, self).__init__()
+        self.activation = getattr(paddle.nn.functional, activation)
+
+    def forward(self, x):
+        return self.activation(x)
+
+
+def add_one(x):
+    return x + 1
+
+
+class TestPersistentCache(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        paddle.jit.set_cache_dir(self.temp_dir.name)
+
+    def tearDown(self):
+        paddle.jit.set_cache_dir(None)
+        self.temp_dir.cleanup()
+
+    def test_code_cache(self):
+        static_func = FunctionCache().convert_with_cache(add_one)
+        self.assertTrue(os.listdir(os.path.join(self.temp_dir.name, 'code')))
+
+        # a new FunctionCache loads the transformed code without transforming
+        with mock.patch.object(
+            program_translator.DygraphToStaticAst,
+            'get_static_ast',
+            side_effect=AssertionError('should not transform'),
+        ):
+            cached_func = FunctionCache().convert_with_cache(add_one)
+        x = paddle.ones([2])
+        np.testing.assert_array_equal(
+            cached_func(x).numpy(), static_func(x).numpy()
+        )
+
+    def test_program_cache(self):
+        paddle.seed(2022)
+        net = Net()
+        x = paddle.rand([2, 4])
+        out, (y,) = paddle.jit.to_static(net.forward)(x)
+        self.assertTrue(os.listdir(os.path.join(self.temp_dir.name, 'program')))
+
+        # a new decorated function loads the program without tracing
+        with mock.patch.object(
+            ConcreteProgram,
+            'from_func_spec',
+            side_effect=AssertionError('should not trace'),
+        ):
+            cached_out, (cached_y,) = paddle.jit.to_static(net.forward)(x)
+        np.testing.assert_allclose(cached_out.numpy(), out.numpy())
+        np.testing.assert_allclose(cached_y.numpy(), y.numpy())
+
+        # the program is traced again once the Layer is changed
+        net.scale = 3.0
+        with mock.patch.object(
+            ConcreteProgram,
+            'from_func_spec',
+            wraps=ConcreteProgram.from_func_spec,
+        ) as from_func_spec:
+            paddle.jit.to_static(net.forward)(x)
+            self.assertEqual(from_func_spec.call_count, 1)
+
+    def _program_key(self, net, x):
+        function_spec = paddle.jit.to_static(net.forward).function_spec
+        cache_key = CacheKey.from_func_and_args(function_spec, (x,), {}, net)
+        return persistent_cache.get_persistent_cache().program_key(
+            net.forward,
+            cache_key.input_args_with_spec,
+            cache_key.input_kwargs_with_spec,
+            net,
+        )
+
+    def test_program_key_of_new_tensor(self):
+        # specs of tensors are named by counters differing among processes
+        net = Net()
+        key = self._program_key(net, paddle.rand([2, 4]))
+        self.assertIsNotNone(key)
+        self.assertEqual(self._program_key(net, paddle.rand([2, 4])), key)
+        self.assertNotEqual(self._program_key(net, paddle.rand([3, 4])), key)
+
+    def test_program_key_of_callable_attribute(self):
+        x = paddle.rand([2, 4])
+        relu_key = self._program_key(ActNet('relu'), x)
+        gelu_key = self._program_key(ActNet('gelu'), x)
+        self.assertIsNotNone(relu_key)
+        self.assertIsNotNone(gelu_key)
+        self.assertNotEqual(relu_key, gelu_key)
+
+        # a public attribute which can not be described disables the cache
+        net = ActNet('relu')
+        net.activation = lambda x: x
+        self.assertIsNone(self._program_key(net, x))
+
+    def test_disable(self):
+        paddle.jit.set_cache_dir('')
+        paddle.jit.to_static(add_one)(paddle.ones([2]))
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,11 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+import tempfile
 import unittest
 
 import numpy as np
 from paddle.io import (
     BatchSampler,
+    BucketBatchSampler,
     Dataset,
     Sampler,
     SequenceSampler,
@@ -288,5 +291,146 @@ class TestWeightedRandomSampler(unittest.TestCase):
             self.assertTrue(True)
 
 
+class VarLenDataset(Dataset):
+    def __init__(self, sample_num):
+        self.lengths = np.random.RandomState(0).randint(1, 100, [sample_num])
+
+    def __getitem__(self, idx):
+        return np.ones([self.lengths[idx]], dtype='int64')
+
+    def __len__(self):
+        return len(self.lengths)
+
+
+class TestBucketBatchSampler(unittest.TestCase):
+    def test_max_tokens(self):
+        dataset = VarLenDataset(500)
+        sampler = BucketBatchSampler(
+            dataset,
+            max_tokens=256,
+            lengths=dataset.lengths,
+            num_replicas=1,
+            rank=0,
+        )
+        batches = list(sampler)
+        self.assertEqual(len(batches), len(sampler))
+        self.assertEqual(sorted(sum(batches, [])), list(range(500)))
+        padded = 0
+        for batch in batches:
+            max_length = dataset.lengths[batch].max()
+            self.assertTrue(len(batch) == 1 or len(batch) * max_length <= 256)
+            padded += len(batch) * max_length
+        # bucketing keeps padding low
+        self.assertGreater(dataset.lengths.sum() / padded, 0.85)
+        # not shuffled
+        self.assertEqual(batches, list(sampler))
+
+    def test_batch_size_and_boundaries(self):
+        dataset = VarLenDataset(100)
+        sampler = BucketBatchSampler(
+            dataset,
+            batch_size=8,
+            lengths=dataset.lengths,
+            bucket_boundaries=[30, 60],
+            num_replicas=1,
+            rank=0,
+        )
+        for batch in sampler:
+            self.assertLessEqual(len(batch), 8)
+            buckets = np.searchsorted([30, 60], dataset.lengths[batch], 'right')
+            self.assertEqual(len(set(buckets.tolist())), 1)
+
+    def test_shuffle_and_distributed(self):
+        dataset = VarLenDataset(300)
+        epochs = []
+        for epoch in range(2):
+            ranks = []
+            for rank in range(4):
+                sampler = BucketBatchSampler(
+                    dataset,
+                    max_tokens=200,
+                    lengths=dataset.lengths,
+                    shuffle=True,
+                    num_replicas=4,
+                    rank=rank,
+                    seed=1,
+                )
+                sampler.set_epoch(epoch)
+                self.assertEqual(len(sampler), len(list(sampler)))
+                sampler.set_epoch(epoch)
+                ranks.append(list(sampler))
+            self.assertEqual(len(set(len(batches) for batches in ranks)), 1)
+            indices = sum(sum(ranks, []), [])
+            self.assertEqual(set(indices), set(range(300)))
+            epochs.append(ranks)
+        self.assertNotEqual(epochs[0][0], epochs[1][0])
+
+    def test_drop_last(self):
+        dataset = VarLenDataset(100)
+        ranks = [
+            list(
+                BucketBatchSampler(
+                    dataset,
+                    batch_size=7,
+                    lengths=dataset.lengths,
+                    drop_last=True,
+                    num_replicas=3,
+                    rank=rank,
+                )
+            )
+            for rank in range(3)
+        ]
+        indices = sum(sum(ranks, []), [])
+        self.assertEqual(len(indices), len(set(indices)))
+
+    def test_length_fn_cache(self):
+        dataset = VarLenDataset(50)
+        calls = []
+
+        def length_fn(sample):
+            calls.append(1)
+            return len(sample)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = os.path.join(tmp_dir, 'lengths.npy')
+            sampler = BucketBatchSampler(
+                dataset,
+                batch_size=4,
+                length_fn=length_fn,
+                cache_path=cache_path,
+                num_replicas=1,
+                rank=0,
+            )
+            np.testing.assert_array_equal(sampler.lengths, dataset.lengths)
+            self.assertEqual(len(calls), 50)
+            sampler = BucketBatchSampler(
+                dataset,
+                batch_size=4,
+                length_fn=length_fn,
+                cache_path=cache_path,
+                num_replicas=1,
+                rank=0,
+            )
+            np.testing.assert_array_equal(sampler.lengths, dataset.lengths)
+            self.assertEqual(len(calls), 50)
+            self.assertEqual(os.listdir(tmp_dir), ['lengths.npy'])
+
+            # the suffix appended by np.save is taken into account
+            cache_path = os.path.join(tmp_dir, 'lengths_no_suffix')
+            for _ in range(2):
+                sampler = BucketBatchSampler(
+                    dataset,
+                    batch_size=4,
+                    length_fn=length_fn,
+                    cache_path=cache_path,
+                    num_replicas=1,
+                    rank=0,
+                )
+                np.testing.assert_array_equal(sampler.lengths, dataset.lengths)
+            self.assertEqual(len(calls), 100)
+            self.assertTrue(os.path.exists(cache_path + '.npy'))
+            self.assertEqual(len(os.listdir(tmp_dir)), 2)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,120 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.io import CompiledCollateFn, DataLoader, Dataset
+from paddle.fluid.dataloader.collate import default_collate_fn
+
+
+class RandomDataset(Dataset):
+    def __init__(self, sample_num):
+        self.sample_num = sample_num
+
+    def __getitem__(self, idx):
+        np.random.seed(idx)
+        image = np.random.random([3, 8, 8]).astype('float32')
+        return {
+            'image': image,
+            'meta': [idx, 'sample_{}'.format(idx)],
+            'label': np.array([idx % 10]).astype('int64'),
+        }
+
+    def __len__(self):
+        return self.sample_num
+
+
+class TestCompiledCollateFn(unittest.TestCase):
+    def check_same(self, out, expected):
+        np.testing.assert_allclose(out['image'], expected['image'])
+        np.testing.assert_array_equal(out['label'], expected['label'])
+        np.testing.assert_array_equal(out['meta'][0], expected['meta'][0])
+        self.assertEqual(out['meta'][1], expected['meta'][1])
+
+    def test_same_as_default(self):
+        dataset = RandomDataset(10)
+        collate_fn = CompiledCollateFn()
+        for indices in [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]:
+            batch = [dataset[i] for i in indices]
+            self.check_same(collate_fn(batch), default_collate_fn(batch))
+
+    def test_reuse_buffers(self):
+        dataset = RandomDataset(8)
+        batch = [dataset[i] for i in range(4)]
+
+        collate_fn = CompiledCollateFn(reuse_buffers=True)
+        out0 = collate_fn(batch)['image']
+        out1 = collate_fn(batch)['image']
+        self.assertTrue(out0 is out1)
+
+        collate_fn = CompiledCollateFn()
+        out0 = collate_fn(batch)['image']
+        out1 = collate_fn(batch)['image']
+        self.assertFalse(out0 is out1)
+
+    def test_schema_mismatch(self):
+        collate_fn = CompiledCollateFn()
+        batch = [np.ones([2, 3], dtype='float32')] * 4
+        self.assertEqual(collate_fn(batch).shape, (4, 2, 3))
+
+        batch = [np.ones([5, 3], dtype='float64')] * 4
+        out = collate_fn(batch)
+        self.assertEqual(out.shape, (4, 5, 3))
+        self.assertEqual(out.dtype, np.float64)
+
+    def test_dataloader(self):
+        dataset = RandomDataset(10)
+        for num_workers in [0, 2]:
+            loader = DataLoader(
+                dataset,
+                batch_size=4,
+                num_workers=num_workers,
+                collate_fn=CompiledCollateFn(),
+            )
+            expected = DataLoader(dataset, batch_size=4, num_workers=0)
+            for out, exp in zip(loader, expected):
+                np.testing.assert_allclose(
+                    out['image'].numpy(), exp['image'].numpy()
+                )
+                np.testing.assert_array_equal(
+                    out['label'].numpy(), exp['label'].numpy()
+                )
+
+    def test_dataloader_without_shared_memory(self):
+        # batches are pickled asynchronously without shared memory, reused
+        # buffers must not be overwritten before being sent
+        dataset = RandomDataset(64)
+        loader = DataLoader(
+            dataset,
+            batch_size=4,
+            num_workers=2,
+            use_shared_memory=False,
+            collate_fn=CompiledCollateFn(reuse_buffers=True),
+        )
+        expected = DataLoader(dataset, batch_size=4, num_workers=0)
+        for out, exp in zip(loader, expected):
+            np.testing.assert_allclose(
+                out['image'].numpy(), exp['image'].numpy()
+            )
+            np.testing.assert_array_equal(
+                out['label'].numpy(), exp['label'].numpy()
+            )
+
+
+if __name__ == '__main__':
+    paddle.disable_static()
+    unittest.main()
@@ -0,0 +1,103 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import unittest
+
+import numpy as np
+
+from paddle.io import DataLoader, Dataset
+
+BATCH_SIZE = 2
+
+
+class SlowSampleDataset(Dataset):
+    def __init__(self, sample_num, slow_indices=(), delay=1.0):
+        self.sample_num = sample_num
+        self.slow_indices = set(slow_indices)
+        self.delay = delay
+
+    def __getitem__(self, idx):
+        if idx in self.slow_indices:
+            time.sleep(self.delay)
+        return np.array([idx]).astype('int64')
+
+    def __len__(self):
+        return self.sample_num
+
+
+class TestDataLoaderDispatch(unittest.TestCase):
+    def run_loader(self, dataset, **kwargs):
+        loader = DataLoader(
+            dataset, batch_size=BATCH_SIZE, num_workers=2, **kwargs
+        )
+        loader_iter = iter(loader)
+        batch_ids = [
+            int(data.numpy()[0][0]) // BATCH_SIZE for data in loader_iter
+        ]
+        return batch_ids, loader_iter.worker_stats
+
+    def test_least_loaded_keep_order(self):
+        dataset = SlowSampleDataset(40, slow_indices=[2], delay=0.5)
+        batch_ids, stats = self.run_loader(
+            dataset, worker_dispatch='least_loaded'
+        )
+        self.assertEqual(batch_ids, list(range(20)))
+        self.assertEqual(len(stats), 2)
+        self.assertEqual(sum(s['batches'] for s in stats), 20)
+        for s in stats:
+            self.assertEqual(s['outstanding'], 0)
+            self.assertGreaterEqual(s['max_latency'], s['avg_latency'])
+        # latency of the batch with the slow sample is recorded
+        self.assertGreaterEqual(max(s['max_latency'] for s in stats), 0.5)
+
+    def test_reorder_window(self):
+        window = 4
+        dataset = SlowSampleDataset(40, slow_indices=[0, 10], delay=1.0)
+        batch_ids, _ = self.run_loader(
+            dataset, worker_dispatch='least_loaded', reorder_window=window
+        )
+        self.assertEqual(sorted(batch_ids), list(range(20)))
+        self.assertNotEqual(batch_ids[0], 0)
+        output = set()
+        for batch_id in batch_ids:
+            oldest = min(set(range(20)) - output)
+            self.assertLess(batch_id, oldest + window)
+            output.add(batch_id)
+
+    def test_reorder_window_persistent(self):
+        dataset = SlowSampleDataset(12, slow_indices=[0], delay=0.5)
+        loader = DataLoader(
+            dataset,
+            batch_size=BATCH_SIZE,
+            num_workers=2,
+            persistent_workers=True,
+            prefetch_next_epoch=True,
+            reorder_window=3,
+        )
+        for epoch in range(3):
+            batch_ids = [
+                int(data.numpy()[0][0]) // BATCH_SIZE for data in loader()
+            ]
+            self.assertEqual(sorted(batch_ids), list(range(6)))
+
+    def test_invalid_dispatch(self):
+        dataset = SlowSampleDataset(4)
+        self.assertRaises(
+            ValueError, DataLoader, dataset, worker_dispatch='random'
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+from paddle.io import DataLoader, Dataset, DistributedBatchSampler
+
+
+class IndexDataset(Dataset):
+    def __init__(self, sample_num):
+        self.sample_num = sample_num
+
+    def __getitem__(self, idx):
+        return np.array([idx]).astype('int64')
+
+    def __len__(self):
+        return self.sample_num
+
+
+class TestDataLoaderPrefetchNextEpoch(unittest.TestCase):
+    def run_epochs(self, loader, epoch_num, set_epoch=None, break_at=None):
+        epochs = []
+        for epoch in range(epoch_num):
+            if set_epoch is not None:
+                loader.batch_sampler.set_epoch(set_epoch(epoch))
+            indices = []
+            for i, data in enumerate(loader()):
+                indices.extend(data.numpy().flatten().tolist())
+                if break_at is not None and i == break_at:
+                    break
+            epochs.append(indices)
+        return epochs
+
+    def build_loader(self, dataset, batch_sampler, prefetch):
+        return DataLoader(
+            dataset,
+            batch_sampler=batch_sampler,
+            num_workers=2,
+            persistent_workers=True,
+            prefetch_next_epoch=prefetch,
+        )
+
+    def test_sequential(self):
+        dataset = IndexDataset(10)
+        loader = DataLoader(
+            dataset,
+            batch_size=3,
+            num_workers=2,
+            persistent_workers=True,
+            prefetch_next_epoch=True,
+        )
+        epochs = self.run_epochs(loader, 4)
+        for indices in epochs:
+            self.assertEqual(indices, list(range(10)))
+
+    def test_short_epoch(self):
+        # epoch shorter than the prefetch capacity
+        dataset = IndexDataset(3)
+        loader = DataLoader(
+            dataset,
+            batch_size=2,
+            num_workers=2,
+            persistent_workers=True,
+            prefetch_next_epoch=True,
+        )
+        for indices in self.run_epochs(loader, 5):
+            self.assertEqual(indices, [0, 1, 2])
+
+    def test_same_as_no_prefetch(self):
+        dataset = IndexDataset(20)
+        results = []
+        for prefetch in [False, True]:
+            sampler = DistributedBatchSampler(
+                dataset, batch_size=4, num_replicas=1, rank=0, shuffle=True
+            )
+            loader = self.build_loader(dataset, sampler, prefetch)
+            results.append(self.run_epochs(loader, 3))
+        self.assertEqual(results[0], results[1])
+        self.assertNotEqual(results[1][0], results[1][1])
+
+    def test_set_epoch(self):
+        dataset = IndexDataset(20)
+        for set_epoch in [lambda e: e, lambda e: 10 - e]:
+            results = []
+            for prefetch in [False, True]:
+                sampler = DistributedBatchSampler(
+                    dataset, batch_size=4, num_replicas=1, rank=0, shuffle=True
+                )
+                loader = self.build_loader(dataset, sampler, prefetch)
+                results.append(self.run_epochs(loader, 3, set_epoch))
+            self.assertEqual(results[0], results[1])
+
+    def test_break(self):
+        dataset = IndexDataset(20)
+        loader = DataLoader(
+            dataset,
+            batch_size=4,
+            num_workers=2,
+            persistent_workers=True,
+            prefetch_next_epoch=True,
+        )
+        epochs = self.run_epochs(loader, 3, break_at=1)
+        for indices in epochs:
+            self.assertEqual(indices, list(range(8)))
+        for indices in self.run_epochs(loader, 2):
+            self.assertEqual(indices, list(range(20)))
+
+
+if __name__ == '__main__':
+    unittest.main()
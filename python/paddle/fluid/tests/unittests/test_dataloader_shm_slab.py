@@ -0,0 +1,131 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import multiprocessing
+import pickle
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.io import DataLoader, Dataset
+from paddle.fluid.dataloader.slab import _SlabPool
+
+
+class RandomDataset(Dataset):
+    def __init__(self, sample_num, image_size=8):
+        self.sample_num = sample_num
+        self.image_size = image_size
+
+    def __getitem__(self, idx):
+        np.random.seed(idx)
+        size = self.image_size
+        image = np.random.random([3, size, size]).astype('float32')
+        return image, np.array([idx]).astype('int64')
+
+    def __len__(self):
+        return self.sample_num
+
+
+def _put_in_worker(pool, queue):
+    arrays = [
+        np.arange(12, dtype='float32').reshape([3, 4]),
+        np.asarray(7, dtype='int64'),
+    ]
+    for _ in range(4):
+        queue.put(pickle.dumps(pool.put(arrays)))
+
+
+class TestSlabPool(unittest.TestCase):
+    def test_put_get_release(self):
+        pool = _SlabPool(0, 2, 1024)
+        arrays = [
+            np.arange(10, dtype='int64'),
+            np.ones([2, 3], dtype='float32')[:, ::2],
+            np.asarray(3.0),
+        ]
+        batch = pool.put(arrays)
+        self.assertEqual(batch.worker_id, 0)
+        outs = pool.get(batch)
+        for out, array in zip(outs, arrays):
+            np.testing.assert_array_equal(out, array)
+            self.assertEqual(out.dtype, array.dtype)
+            self.assertEqual(out.shape, array.shape)
+
+        other = pool.put(arrays)
+        self.assertNotEqual(other.slab_id, batch.slab_id)
+        pool.release(batch)
+        reused = pool.put(arrays)
+        self.assertEqual(reused.slab_id, batch.slab_id)
+
+    def test_not_fits(self):
+        pool = _SlabPool(0, 1, 64)
+        self.assertIsNone(pool.put([np.zeros([100], dtype='float32')]))
+        self.assertIsNone(pool.put([np.array(['a', None], dtype=object)]))
+        self.assertIsNone(pool.put([paddle.zeros([2])]))
+
+    def test_cross_process(self):
+        pool = _SlabPool(0, 2, 1024)
+        queue = multiprocessing.Queue()
+        worker = multiprocessing.Process(
+            target=_put_in_worker, args=(pool, queue)
+        )
+        worker.start()
+        # worker blocks on the 3rd batch until a slab is released
+        for _ in range(4):
+            batch = pickle.loads(queue.get(timeout=60))
+            image, label = pool.get(batch)
+            np.testing.assert_array_equal(
+                image, np.arange(12, dtype='float32').reshape([3, 4])
+            )
+            self.assertEqual(int(label), 7)
+            pool.release(batch)
+        worker.join(60)
+
+
+class TestDataLoaderShmSlab(unittest.TestCase):
+    def run_loader(self, shm_slab_size, image_size=8, persistent=False):
+        dataset = RandomDataset(20, image_size)
+        loader = DataLoader(
+            dataset,
+            batch_size=4,
+            num_workers=2,
+            shm_slab_size=shm_slab_size,
+            persistent_workers=persistent,
+        )
+        results = []
+        for epoch in range(2):
+            for image, label in loader():
+                results.append((image.numpy(), label.numpy()))
+        return results
+
+    def check_same(self, results, expected):
+        self.assertEqual(len(results), len(expected))
+        for (image, label), (e_image, e_label) in zip(results, expected):
+            np.testing.assert_allclose(image, e_image)
+            np.testing.assert_array_equal(label, e_label)
+
+    def test_same_as_default(self):
+        expected = self.run_loader(None)
+        self.check_same(self.run_loader(1 << 20), expected)
+        self.check_same(self.run_loader(1 << 20, persistent=True), expected)
+
+    def test_fallback(self):
+        # batch larger than slab falls back to default transport
+        expected = self.run_loader(None, image_size=64)
+        self.check_same(self.run_loader(1024, image_size=64), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,6 +17,7 @@ import unittest
 import numpy as np
 import paddle.fluid.core as core
 import paddle.fluid as fluid
+from paddle.fluid.executor import _get_strong_program_cache_key
 from test_eager_deletion_padding_rnn import RNNConfig, PaddingRNNTestBase
 
 
@@ -83,6 +84,44 @@ class TestExecutor(unittest.TestCase):
         print("run time with program cache: %f" % run_time_with_cache)
 
 
+class TestProgramCacheKey(unittest.TestCase):
+    def test_cache_key(self):
+        program = fluid.Program()
+        with fluid.program_guard(program, fluid.Program()):
+            a = fluid.layers.data(name='a', shape=[10], dtype='float32')
+            out = fluid.layers.scale(a, 2.0)
+
+        feed, fetch_list = {'a': None}, [out]
+        key = _get_strong_program_cache_key(program, feed, fetch_list)
+        self.assertEqual(
+            key, _get_strong_program_cache_key(program, feed, [out.name])
+        )
+        self.assertNotEqual(
+            key, _get_strong_program_cache_key(program, feed, [a])
+        )
+
+        # the key is changed once variables of block 0 are changed
+        block = program.global_block()
+        block.create_var(name='tmp', shape=[1], dtype='float32')
+        new_key = _get_strong_program_cache_key(program, feed, fetch_list)
+        self.assertNotEqual(key, new_key)
+        block._remove_var('tmp')
+        self.assertEqual(
+            key, _get_strong_program_cache_key(program, feed, fetch_list)
+        )
+        key_a = _get_strong_program_cache_key(program, feed, [a])
+        block._rename_var(out.name, 'renamed_out')
+        self.assertNotEqual(
+            key_a, _get_strong_program_cache_key(program, feed, [a])
+        )
+
+        # the key of cloned program is different
+        self.assertNotEqual(
+            key,
+            _get_strong_program_cache_key(program.clone(), feed, fetch_list),
+        )
+
+
 class ExecutorPaddingRNNTest(PaddingRNNTestBase):
     def train_and_save_inference_program(
         self, rnn_model="static", parallel=True, use_program_cache=True
@@ -0,0 +1,143 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+import unittest
+
+from paddle.distributed.fleet.launch_utils import find_free_ports
+from paddle.distributed.launch.utils.kv_client import KVClient
+from paddle.distributed.launch.utils.kv_server import KVServer
+
+
+class TestKVServer(unittest.TestCase):
+    def setUp(self):
+        port = list(find_free_ports(1))[0]
+        self.server = KVServer(port)
+        self.server.start()
+        self.client = KVClient("127.0.0.1:{}".format(port))
+        self.assertTrue(self.client.wait_server_ready(timeout=10))
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_prefix(self):
+        self.client.put("/job/b/1", "b1")
+        self.client.put("/job/a/1", "a1")
+        self.client.put("/job/a/2", "a2")
+        self.client.put("/jobs/a", "x")
+        self.assertEqual(
+            self.client.get_prefix("/job/a"),
+            {"/job/a/1": "a1", "/job/a/2": "a2"},
+        )
+        self.assertEqual(len(self.client.get_prefix("/job/")), 3)
+        # the cached response is invalidated by put and delete
+        self.client.put("/job/a/1", "a3")
+        self.assertEqual(self.client.get_prefix("/job/a")["/job/a/1"], "a3")
+        self.assertTrue(self.client.delete("/job/a/1"))
+        self.assertFalse(self.client.delete("/job/a/1"))
+        self.assertEqual(self.client.get_prefix("/job/a"), {"/job/a/2": "a2"})
+
+    def test_wait_prefix(self):
+        size = 16
+        results = [None] * size
+
+        def pod(rank):
+            self.client.put("/peers/{:02d}".format(rank), str(rank))
+            results[rank] = self.client.wait_prefix("/peers", size, timeout=10)
+
+        threads = [threading.Thread(target=pod, args=(i,)) for i in range(size)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for r in results:
+            self.assertEqual(len(r), size)
+
+        # returns the partial key-values on timeout
+        start = time.time()
+        self.assertEqual(len(self.client.wait_prefix("/peers", 32, 0.5)), size)
+        self.assertGreaterEqual(time.time() - start, 0.4)
+
+    def test_watch_prefix(self):
+        self.client.put("/watch/0", "0")
+        value, revision = self.client.watch_prefix("/watch", timeout=1)
+        self.assertEqual(value, {"/watch/0": "0"})
+
+        def put():
+            time.sleep(0.2)
+            self.client.put("/other", "1")
+            self.client.put("/watch/1", "1")
+
+        t = threading.Thread(target=put)
+        t.start()
+        value, new_revision = self.client.watch_prefix(
+            "/watch", revision, timeout=10
+        )
+        t.join()
+        self.assertGreater(new_revision, revision)
+        self.assertEqual(len(value), 2)
+
+        # putting the same value is not a change
+        self.client.put("/watch/1", "1")
+        _, same_revision = self.client.watch_prefix(
+            "/watch", new_revision, timeout=0.2
+        )
+        self.assertEqual(same_revision, new_revision)
+
+    def test_barrier(self):
+        size = 8
+        results = [None] * size
+
+        def pod(rank):
+            results[rank] = self.client.barrier("step", rank, size, 10)
+
+        threads = [threading.Thread(target=pod, args=(i,)) for i in range(size)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertTrue(all(results))
+        self.assertFalse(self.client.barrier("never", 0, 2, timeout=0.2))
+
+    def test_barrier_rounds(self):
+        size = 4
+        results = [[] for _ in range(size)]
+
+        def pod(rank):
+            for generation in range(3):
+                results[rank].append(
+                    self.client.barrier(
+                        "round", rank, size, 10, generation=generation
+                    )
+                )
+
+        threads = [threading.Thread(target=pod, args=(i,)) for i in range(size)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, [[True] * 3] * size)
+        # the arrived ids are dropped once a round completes
+        self.assertEqual(self.server.barriers['/_barrier/round'], [3, set()])
+
+        # retrying a completed round returns at once, and a new round waits
+        self.assertTrue(self.client.barrier("round", 0, size, 0, generation=2))
+        self.assertFalse(
+            self.client.barrier("round", 0, size, 0.2, generation=3)
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -423,5 +423,73 @@ class TestTimerOnly(unittest.TestCase):
         p.stop()
 
 
+class TestStepTelemetry(unittest.TestCase):
+    def test_with_dataloader(self):
+        dataset = RandomDataset(10 * 4)
+        simple_net = SimpleNet()
+        opt = paddle.optimizer.SGD(
+            learning_rate=1e-3, parameters=simple_net.parameters()
+        )
+        loader = DataLoader(dataset, batch_size=4, drop_last=True)
+        telemetry = profiler.StepTelemetry(capacity=8)
+        telemetry.attach()
+        p = profiler.Profiler(timer_only=True)
+        p.start()
+        for i, (image, label) in enumerate(loader()):
+            with telemetry.phase('forward'):
+                out = simple_net(image)
+                loss = F.cross_entropy(out, label)
+                avg_loss = paddle.mean(loss)
+            with telemetry.phase('backward'):
+                avg_loss.backward()
+            with telemetry.phase('optimizer'):
+                opt.minimize(avg_loss)
+                simple_net.clear_gradients()
+            p.step(num_samples=4)
+        p.stop()
+        telemetry.detach()
+
+        self.assertEqual(telemetry.num_steps, 10)
+        records = telemetry.get_records()
+        self.assertEqual(len(records), 8)
+        self.assertEqual([r['step'] for r in records], list(range(2, 10)))
+        for record in records:
+            self.assertEqual(record['num_samples'], 4)
+            self.assertGreater(record['dataloader'], 0)
+            self.assertGreater(record['forward'], 0)
+            self.assertGreaterEqual(record['step_time'], record['forward'])
+
+        percentiles = telemetry.percentiles(q=(50, 99))
+        self.assertEqual(list(percentiles['step'].keys()), ['p50', 'p99'])
+        self.assertLessEqual(
+            percentiles['forward']['p50'], percentiles['forward']['p99']
+        )
+        text = telemetry.to_prometheus()
+        self.assertIn(
+            'paddle_step_phase_seconds_count{phase="backward"} 10', text
+        )
+        self.assertIn('paddle_step_samples_total 40.0', text)
+        lines = telemetry.to_json_lines().splitlines()
+        self.assertEqual(len(lines), 8)
+
+    def test_record(self):
+        telemetry = profiler.StepTelemetry(capacity=4)
+        for i in range(6):
+            telemetry.record('collective', float(i))
+            telemetry.record('collective', 1.0)
+            telemetry.step()
+        records = telemetry.get_records()
+        self.assertEqual(
+            [r['collective'] for r in records], [3.0, 4.0, 5.0, 6.0]
+        )
+        self.assertEqual(
+            telemetry.percentiles(q=(50,))['collective']['p50'], 4.5
+        )
+        telemetry.reset()
+        self.assertEqual(telemetry.get_records(), [])
+        self.assertEqual(telemetry.percentiles(), {})
+        self.assertRaises(ValueError, profiler.StepTelemetry, capacity=0)
+
+
 if __name__ == '__main__':
     unittest.main()
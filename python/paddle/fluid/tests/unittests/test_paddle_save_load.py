@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import unittest
+from unittest import mock
 import numpy as np
 import os
 import sys
@@ -1109,5 +1110,139 @@ class TestSaveLoadLayer(unittest.TestCase):
         temp_dir.cleanup()
 
 
+class TestSaveLoadMmapFormat(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_save_load_mmap_format(self):
+        paddle.disable_static()
+        paddle.set_device("cpu")
+        layer = LinearNet()
+        adam = opt.Adam(learning_rate=0.001, parameters=layer.parameters())
+        x = paddle.randn([2, IMAGE_SIZE], dtype='float32')
+        layer(x).mean().backward()
+        adam.step()
+        obj = {
+            'model': layer.state_dict(),
+            'opt': adam.state_dict(),
+            'epoch': 3,
+            'array': np.arange(6).reshape(2, 3),
+        }
+        path = os.path.join(self.temp_dir.name, "mmap", "model.pdparams")
+        paddle.save(obj, path, use_mmap_format=True)
+
+        load_obj = paddle.load(path)
+        self.assertEqual(load_obj['epoch'], 3)
+        np.testing.assert_array_equal(load_obj['array'], obj['array'])
+        for key, value in obj['model'].items():
+            self.assertTrue(isinstance(load_obj['model'][key], paddle.Tensor))
+            self.assertEqual(load_obj['model'][key].name, value.name)
+            np.testing.assert_array_equal(
+                load_obj['model'][key].numpy(), value.numpy()
+            )
+        for key, value in obj['opt'].items():
+            if isinstance(value, paddle.Tensor):
+                np.testing.assert_array_equal(
+                    load_obj['opt'][key].numpy(), value.numpy()
+                )
+
+        new_layer = LinearNet()
+        new_layer.set_state_dict(load_obj['model'])
+        np.testing.assert_array_equal(new_layer(x).numpy(), layer(x).numpy())
+
+        # partial load by key prefix
+        load_model = paddle.load(path, key_prefix='model.', return_numpy=True)
+        self.assertEqual(list(load_model.keys()), ['model'])
+        for key, value in obj['model'].items():
+            np.testing.assert_array_equal(
+                load_model['model'][key], value.numpy()
+            )
+
+        paddle.save(obj, path + '.pickle')
+        with self.assertRaises(ValueError):
+            paddle.load(path + '.pickle', key_prefix='model.')
+
+    def test_save_load_mmap_format_memory(self):
+        paddle.disable_static()
+        paddle.set_device("cpu")
+        tensor = paddle.randn([3, 4], dtype='float32')
+        byio = BytesIO()
+        paddle.save([tensor, tensor * 2], byio, use_mmap_format=True)
+        byio.seek(0)
+        load_list = paddle.load(byio)
+        np.testing.assert_array_equal(load_list[0].numpy(), tensor.numpy())
+        np.testing.assert_array_equal(
+            load_list[1].numpy(), (tensor * 2).numpy()
+        )
+
+        with self.assertRaises(TypeError):
+            paddle.save(tensor, byio, use_mmap_format=1)
+
+
+class TestAsyncSave(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_async_save(self):
+        paddle.disable_static()
+        layer = LinearNet()
+        state_dict = layer.state_dict()
+        origin = {k: v.numpy() for k, v in state_dict.items()}
+        path = os.path.join(self.temp_dir.name, "async", "layer.pdparams")
+        task = paddle.async_save(state_dict, path)
+        # modifying the parameters does not change the saved snapshot
+        for param in layer.parameters():
+            param.set_value(np.zeros(param.shape, dtype='float32'))
+        task.result()
+        paddle.clear_async_save_task_queue()
+
+        self.assertFalse(
+            any('.tmp' in f for f in os.listdir(os.path.dirname(path)))
+        )
+        load_dict = paddle.load(path)
+        for key, value in origin.items():
+            np.testing.assert_array_equal(load_dict[key].numpy(), value)
+
+        tasks = [paddle.async_save(state_dict, path + str(i)) for i in range(4)]
+        paddle.clear_async_save_task_queue()
+        self.assertTrue(all(task.done() for task in tasks))
+
+        with self.assertRaises(ValueError):
+            paddle.async_save(state_dict, BytesIO())
+
+    def test_async_save_failure(self):
+        paddle.disable_static()
+        layer = LinearNet()
+        save_dir = os.path.join(self.temp_dir.name, "async_failure")
+        os.makedirs(save_dir)
+        path = os.path.join(save_dir, "layer.pdparams")
+
+        # failed snapshots and saves release their slots, more tasks than
+        # the limit of tasks in flight do not block
+        for _ in range(3):
+            with self.assertRaises(ValueError):
+                with mock.patch.object(
+                    paddle.framework.io,
+                    '_snapshot_for_async_save',
+                    side_effect=ValueError('snapshot failed'),
+                ):
+                    paddle.async_save(layer.state_dict(), path)
+        for _ in range(3):
+            task = paddle.async_save({'fn': lambda x: x}, path)
+            with self.assertRaises(Exception):
+                task.result()
+        # failed saves do not leave temporary files
+        self.assertEqual(os.listdir(save_dir), [])
+
+        paddle.async_save(layer.state_dict(), path).result()
+        self.assertEqual(os.listdir(save_dir), ["layer.pdparams"])
+
+
 if __name__ == '__main__':
     unittest.main()
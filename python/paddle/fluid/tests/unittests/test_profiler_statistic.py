@@ -1045,5 +1045,126 @@ class TestProfilerStatistic(unittest.TestCase):
             )
 
 
+class TestStreamingSummary(unittest.TestCase):
+    def build_tree(self, offset):
+        root_node = HostPythonNode(
+            'Root Node',
+            profiler.TracerEventType.UserDefined,
+            0,
+            float('inf'),
+            1000,
+            1001,
+        )
+        profilerstep_node = HostPythonNode(
+            'ProfileStep#1',
+            profiler.TracerEventType.ProfileStep,
+            0,
+            400 + offset,
+            1000,
+            1001,
+        )
+        forward_node = HostPythonNode(
+            'Forward', profiler.TracerEventType.Forward, 20, 200, 1000, 1001
+        )
+        conv2d_node = HostPythonNode(
+            'conv2d',
+            profiler.TracerEventType.Operator,
+            25,
+            100 + offset,
+            1000,
+            1001,
+        )
+        conv2d_launchkernel = HostPythonNode(
+            'cudalaunchkernel',
+            profiler.TracerEventType.CudaRuntime,
+            30,
+            35,
+            1000,
+            1001,
+        )
+        conv2d_kernel = DevicePythonNode(
+            'conv2d_kernel',
+            profiler.TracerEventType.Kernel,
+            35,
+            50 + offset,
+            0,
+            0,
+            0,
+        )
+        conv2d_memcpy = DevicePythonNode(
+            'conv2d_memcpy', profiler.TracerEventType.Memcpy, 50, 60, 0, 0, 0
+        )
+        root_node.children_node.append(profilerstep_node)
+        profilerstep_node.children_node.append(forward_node)
+        forward_node.children_node.append(conv2d_node)
+        conv2d_node.runtime_node.append(conv2d_launchkernel)
+        conv2d_launchkernel.device_node.extend([conv2d_kernel, conv2d_memcpy])
+        return {'thread1001': root_node}
+
+    def test_streaming_summary(self):
+        summary = profiler.StreamingSummary()
+        event_summary = profiler_statistic.EventSummary()
+        for offset in range(100):
+            thread_tree = self.build_tree(offset)
+            event_summary.parse(thread_tree)
+            summary.add_nodetrees(self.build_tree(offset))
+        self.assertEqual(summary.num_results, 100)
+
+        conv2d = summary.operator_items['conv2d']
+        self.assertEqual(conv2d.call, event_summary.items['conv2d'].call)
+        self.assertEqual(
+            conv2d.cpu_time.total, event_summary.items['conv2d'].cpu_time
+        )
+        self.assertEqual(
+            conv2d.gpu_time.total, event_summary.items['conv2d'].gpu_time
+        )
+        self.assertEqual(conv2d.cpu_time.max, 174)
+        self.assertEqual(conv2d.cpu_time.min, 75)
+
+        kernel = summary.kernel_items['conv2d_kernel']
+        self.assertEqual(
+            kernel.gpu_time.total,
+            event_summary.kernel_items['conv2d_kernel'].gpu_time,
+        )
+        self.assertNotIn('conv2d_memcpy', summary.kernel_items)
+
+        step = summary.model_perspective_items['ProfileStep']
+        self.assertEqual(step.call, 100)
+        self.assertAlmostEqual(step.cpu_time.quantile(0.5), 449.5, delta=5)
+        self.assertAlmostEqual(step.cpu_time.quantile(0.99), 498, delta=5)
+        self.assertEqual(summary.model_perspective_items['Forward'].call, 100)
+
+        for sort_key in [
+            profiler.SortedKeys.CPUTotal,
+            profiler.SortedKeys.CPUMin,
+            profiler.SortedKeys.GPUAvg,
+        ]:
+            summary.summary(sorted_by=sort_key, time_unit='us')
+
+        summary.reset()
+        self.assertEqual(len(summary.operator_items), 0)
+
+    def test_quantile_sketch(self):
+        sketch = profiler_statistic.QuantileSketch(relative_accuracy=0.01)
+        other = profiler_statistic.QuantileSketch(relative_accuracy=0.01)
+        for value in range(1, 501):
+            sketch.add(value)
+        for value in range(501, 1001):
+            other.add(value)
+        sketch.merge(other)
+        self.assertEqual(sketch.count, 1000)
+        self.assertEqual(sketch.max, 1000)
+        self.assertEqual(sketch.min, 1)
+        self.assertAlmostEqual(sketch.avg, 500.5)
+        self.assertAlmostEqual(sketch.quantile(0.5), 500.5, delta=500.5 * 0.01)
+        self.assertAlmostEqual(sketch.quantile(0.99), 990, delta=990 * 0.01)
+
+        bounded = profiler_statistic.QuantileSketch(max_buckets=16)
+        for value in range(1, 10001):
+            bounded.add(value)
+        self.assertLessEqual(len(bounded._buckets), 16)
+        self.assertAlmostEqual(bounded.quantile(0.99), 9900, delta=9900 * 0.01)
+
+
 if __name__ == '__main__':
     unittest.main()
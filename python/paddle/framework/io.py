@@ -15,10 +15,12 @@
 import os
 import collections
 import pickle
+import threading
 import warnings
 import sys
 import numpy as np
 import copyreg
+from concurrent.futures import ThreadPoolExecutor
 import paddle
 
 # deprecated module import
@@ -40,6 +42,7 @@ from paddle.fluid.framework import (
     ParamBase,
     EagerParamBase,
     _current_expected_place,
+    _in_eager_without_dygraph_check,
     Program,
 )
 from paddle.fluid.dygraph.jit import _SaveLoadConfig
@@ -223,6 +226,7 @@ def _parse_load_config(configs):
         'params_filename',
         'keep_name_table',
         'return_numpy',
+        'key_prefix',
     ]
 
     # input check
@@ -239,12 +243,17 @@ def _parse_load_config(configs):
     inner_config.params_filename = configs.get('params_filename', None)
     inner_config.keep_name_table = configs.get('keep_name_table', None)
     inner_config.return_numpy = configs.get('return_numpy', False)
+    inner_config.key_prefix = configs.get('key_prefix', None)
 
     return inner_config
 
 
 def _parse_save_config(configs):
-    supported_configs = ['use_binary_format', 'pickle_protocol']
+    supported_configs = [
+        'use_binary_format',
+        'use_mmap_format',
+        'pickle_protocol',
+    ]
 
     # input check
     for key in configs:
@@ -257,6 +266,7 @@ def _parse_save_config(configs):
     # construct inner config
     inner_config = _SaveLoadConfig()
     inner_config.use_binary_format = configs.get('use_binary_format', False)
+    inner_config.use_mmap_format = configs.get('use_mmap_format', False)
     inner_config.pickle_protocol = configs.get('pickle_protocol', None)
 
     return inner_config
@@ -637,6 +647,209 @@ def _save_binary_var(obj, path):
         )
 
 
+# The mmap format of `paddle.save`: a fixed preamble, the raw data of every
+# tensor aligned to `_MMAP_FORMAT_ALIGNMENT` bytes, and a pickled header at
+# the end of the file, which records the offset, dtype and shape of every
+# tensor and the structure of the saved object.
+_MMAP_FORMAT_MAGIC = b'PDMMAP\x00\x01'
+_MMAP_FORMAT_ALIGNMENT = 64
+# magic, header offset (uint64), header length (uint64)
+_MMAP_FORMAT_PREAMBLE_SIZE = len(_MMAP_FORMAT_MAGIC) + 16
+
+
+class _MmapTensorRef(object):
+    """
+    Placeholder of a tensor in the pickled structure of the mmap format.
+    """
+
+    def __init__(self, key, is_ndarray):
+        self.key = key
+        self.is_ndarray = is_ndarray
+
+
+def _is_mmap_format(path):
+    if _is_memory_buffer(path):
+        pos = path.tell()
+        magic = path.read(len(_MMAP_FORMAT_MAGIC))
+        path.seek(pos)
+    else:
+        with open(path, 'rb') as f:
+            magic = f.read(len(_MMAP_FORMAT_MAGIC))
+    return magic == _MMAP_FORMAT_MAGIC
+
+
+def _save_mmap_format(obj, path, protocol):
+    def _align(f):
+        padding = -f.tell() % _MMAP_FORMAT_ALIGNMENT
+        if padding:
+            f.write(b'\x00' * padding)
+
+    tensors = collections.OrderedDict()
+
+    def _write_tensor(f, key, value):
+        if key in tensors:
+            raise ValueError(
+                "Duplicated key '{}' when saving with `use_mmap_format`.".format(
+                    key
+                )
+            )
+        is_ndarray = isinstance(value, np.ndarray)
+        if is_ndarray:
+            name, data = None, value
+        elif isinstance(value, core.LoDTensor):
+            name, data = None, np.array(value)
+        else:
+            if not value.value().get_tensor()._is_initialized():
+                raise ValueError(
+                    "The saved tensor is not initialized. If you used group sharded, please use save_group_sharded_model."
+                )
+            # NOTE: only one tensor is copied to host memory at a time
+            name, data = value.name, value.numpy()
+        # NOTE: np.ascontiguousarray turns 0-D arrays into 1-D
+        data = np.require(data, requirements='C')
+        _align(f)
+        tensors[key] = (name, data.dtype.str, data.shape, f.tell())
+        f.write(data.reshape(-1).data)
+        return _MmapTensorRef(key, is_ndarray)
+
+    def _flatten(f, obj, prefix):
+        if isinstance(
+            obj, (core.VarBase, core.eager.Tensor, core.LoDTensor, np.ndarray)
+        ):
+            return _write_tensor(f, prefix, obj)
+        elif isinstance(obj, core.SelectedRows):
+            raise NotImplementedError(
+                "`paddle.save` do not support saving 'SelectedRows'."
+            )
+        elif isinstance(obj, fluid.Layer):
+            raise ValueError(
+                "paddle do not support saving `paddle.nn.Layer` object."
+            )
+        elif type(obj) in (dict, collections.OrderedDict):
+            return type(obj)(
+                (k, _flatten(f, v, _join_key(prefix, k)))
+                for k, v in obj.items()
+            )
+        elif type(obj) in (list, tuple):
+            return type(obj)(
+                _flatten(f, v, _join_key(prefix, i)) for i, v in enumerate(obj)
+            )
+        return obj
+
+    with _open_file_buffer(path, 'wb') as f:
+        start = f.tell()
+        f.write(b'\x00' * _MMAP_FORMAT_PREAMBLE_SIZE)
+        structure = _flatten(f, obj, '')
+
+        header = pickle.dumps(
+            {
+                'tensors': [
+                    (key,) + value[:3] + (value[3] - start,)
+                    for key, value in tensors.items()
+                ],
+                'structure': structure,
+            },
+            protocol=protocol,
+        )
+        header_offset = f.tell() - start
+        f.write(header)
+        end = f.tell()
+
+        f.seek(start)
+        f.write(_MMAP_FORMAT_MAGIC)
+        f.write(np.array([header_offset, len(header)], dtype='<u8').tobytes())
+        f.seek(end)
+
+
+def _join_key(prefix, key):
+    return '{}.{}'.format(prefix, key) if prefix else str(key)
+
+
+def _load_mmap_format(path, config):
+    if _is_memory_buffer(path):
+        start = path.tell()
+        # NOTE: copy the content, exporting the buffer of BytesIO forbids
+        # writing to it while the loaded tensors are alive
+        buffer = np.frombuffer(bytearray(path.getvalue()), dtype=np.uint8)
+        buffer = buffer[start:]
+    else:
+        # copy-on-write mapping, pages are only read when they are accessed
+        buffer = np.memmap(path, dtype=np.uint8, mode='c')
+
+    preamble = buffer[:_MMAP_FORMAT_PREAMBLE_SIZE].tobytes()
+    if preamble[: len(_MMAP_FORMAT_MAGIC)] != _MMAP_FORMAT_MAGIC:
+        raise ValueError(
+            "`paddle.load` can not parse the file:{}.".format(path)
+        )
+    header_offset, header_len = np.frombuffer(
+        preamble[len(_MMAP_FORMAT_MAGIC) :], dtype='<u8'
+    ).tolist()
+    header = pickle.loads(
+        buffer[header_offset : header_offset + header_len].tobytes()
+    )
+    if _is_memory_buffer(path):
+        path.seek(start + header_offset + header_len)
+
+    prefix = config.key_prefix
+    tensors = {}
+    for key, name, dtype, shape, offset in header['tensors']:
+        if prefix is not None and not key.startswith(prefix):
+            continue
+        dtype = np.dtype(dtype)
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+        tensors[key] = (
+            name,
+            buffer[offset : offset + nbytes].view(dtype).reshape(shape),
+        )
+
+    def _to_tensor(ref):
+        name, data = tensors[ref.key]
+        if ref.is_ndarray or config.return_numpy:
+            return data
+        if not _non_static_mode():
+            return _to_LodTensor(data)
+        place = _current_expected_place()
+        if isinstance(place, core.CPUPlace):
+            # share memory with the mapped file instead of copying
+            tensor_type = (
+                core.eager.Tensor
+                if _in_eager_without_dygraph_check()
+                else core.VarBase
+            )
+            t = tensor_type(value=data, place=place, zero_copy=True)
+        else:
+            t = paddle.to_tensor(data, place=place)
+        if name is not None:
+            t.name = name
+        return t
+
+    def _restore(obj, prefix):
+        if isinstance(obj, _MmapTensorRef):
+            return _to_tensor(obj) if obj.key in tensors else None
+        elif type(obj) in (dict, collections.OrderedDict):
+            result = type(obj)()
+            for k, v in obj.items():
+                key = _join_key(prefix, k)
+                if not _match_key_prefix(key, config.key_prefix):
+                    continue
+                result[k] = _restore(v, key)
+            return result
+        elif type(obj) in (list, tuple):
+            return type(obj)(
+                _restore(v, _join_key(prefix, i)) for i, v in enumerate(obj)
+            )
+        return obj
+
+    return _restore(header['structure'], '')
+
+
+def _match_key_prefix(key, key_prefix):
+    # a key matches if it is inside the prefix, or is a parent of the prefix
+    if key_prefix is None:
+        return True
+    return key.startswith(key_prefix) or key_prefix.startswith(key + '.')
+
+
 def save(obj, path, protocol=4, **configs):
     '''
     Save an object to the specified path.
@@ -663,6 +876,9 @@ def save(obj, path, protocol=4, **configs):
           use_binary_format(bool): When the saved object is static graph variable, you can specify ``use_binary_for_var``.
           If True, save the file in the c++ binary format when saving a single static graph variable; otherwise, save it in pickle format.
           Default: False
+          use_mmap_format(bool): If True, save the raw data of all tensors in the nested structure aligned in the file, with
+          an index of them, so that ``paddle.load`` can memory-map the file and create tensors without unpickling and copying
+          the data. ``paddle.load`` detects this format automatically. Default: False
 
     Returns:
         None
@@ -754,6 +970,13 @@ def save(obj, path, protocol=4, **configs):
             tensor = paddle.randn([2, 3], dtype='float32')
             paddle.save(tensor, byio)
 
+
+            # example 6: save state_dict in mmap format
+            import paddle
+
+            linear = paddle.nn.Linear(5, 10)
+            paddle.save(linear.state_dict(), "linear.pdparams", use_mmap_format=True)
+
     '''
     if _is_file_path(path):
         # 1. input check
@@ -785,6 +1008,13 @@ def save(obj, path, protocol=4, **configs):
             )
         )
 
+    if not isinstance(config.use_mmap_format, bool):
+        raise TypeError(
+            "Type of `use_mmap_format` should be bool, but received {}.".format(
+                type(config.use_mmap_format)
+            )
+        )
+
     if config.use_binary_format:
         _save_binary_var(obj, path)
     else:
@@ -795,7 +1025,9 @@ def save(obj, path, protocol=4, **configs):
                 "'pickle_protocol' is a deprecated argument. Please use 'protocol' instead."
             )
 
-        if isinstance(obj, Program):
+        if config.use_mmap_format:
+            _save_mmap_format(obj, path, protocol)
+        elif isinstance(obj, Program):
             obj.desc.flush()
             with _open_file_buffer(path, "wb") as f:
                 f.write(obj.desc.serialize_to_string())
@@ -810,6 +1042,170 @@ def save(obj, path, protocol=4, **configs):
                 _pickle_save(obj, f, protocol)
 
 
+# Background saving of `paddle.async_save`. Tasks are executed one by one in
+# submission order, and at most `_ASYNC_SAVE_MAX_INFLIGHT` snapshots are kept
+# in memory, `async_save` blocks until an earlier task finishes beyond it.
+_ASYNC_SAVE_MAX_INFLIGHT = 2
+_async_save_lock = threading.Lock()
+_async_save_executor = None
+_async_save_semaphore = threading.BoundedSemaphore(_ASYNC_SAVE_MAX_INFLIGHT)
+_async_save_tasks = []
+
+
+def _snapshot_for_async_save(obj):
+    # copy every tensor, so that the training can go on modifying the
+    # parameters while the snapshot is serialized in background
+    if isinstance(obj, (core.VarBase, core.eager.Tensor)):
+        if not obj.value().get_tensor()._is_initialized():
+            raise ValueError(
+                "The saved tensor is not initialized. If you used group sharded, please use save_group_sharded_model."
+            )
+        t = obj._copy_to(core.CPUPlace(), True)
+        t.name = obj.name
+        t.stop_gradient = obj.stop_gradient
+        return t
+    elif isinstance(obj, core.LoDTensor):
+        t = core.LoDTensor()
+        t.set(np.array(obj), core.CPUPlace())
+        return t
+    elif isinstance(obj, np.ndarray):
+        return obj.copy()
+    elif type(obj) in (dict, collections.OrderedDict):
+        return type(obj)(
+            (k, _snapshot_for_async_save(v)) for k, v in obj.items()
+        )
+    elif type(obj) in (list, tuple):
+        return type(obj)(_snapshot_for_async_save(v) for v in obj)
+    return obj
+
+
+def _async_save_task(obj, path, protocol, configs):
+    tmp_path = '{}.tmp{}'.format(path, os.getpid())
+    try:
+        save(obj, tmp_path, protocol, **configs)
+        with open(tmp_path, 'r+b') as f:
+            os.fsync(f.fileno())
+        # the checkpoint at `path` is either the old one or the complete
+        # new one, even if the process is killed while saving
+        os.replace(tmp_path, path)
+    except:
+        # do not leave partially written files beside the checkpoints
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        _async_save_semaphore.release()
+
+
+def async_save(obj, path, protocol=4, sync_other_task=False, **configs):
+    '''
+    Save an object to the specified path asynchronously.
+
+    The tensors in ``obj`` are copied to CPU memory when this function is
+    called, and the copy is serialized and written to ``path`` by a
+    background thread, so the training loop is only blocked by the copy
+    instead of the whole serialization and file writing. The file is
+    written to a temporary file and renamed to ``path`` when finished, so
+    ``path`` never holds a partially written checkpoint.
+
+    Saving tasks are executed in the order they are submitted. At most 2
+    tasks are kept in flight, and this function blocks until an earlier
+    task is finished if the limit is exceeded.
+
+    Note:
+        The supported objects and configs are the same as ``paddle.save`` ,
+        except that saving to ``BytesIO`` is not supported.
+
+    Args:
+        obj(Object) : The object to be saved.
+        path(str) : The path of the object to be saved.
+        protocol(int, optional): The protocol version of pickle module must be greater than 1 and less than 5.
+                                 Default: 4
+        sync_other_task(bool, optional): Whether to wait for all the unfinished
+            saving tasks before submitting this one. Default: False.
+        **configs(dict, optional): optional keyword arguments, which are the same as ``paddle.save`` .
+
+    Returns:
+        concurrent.futures.Future: The future of the saving task, call its
+        ``result()`` to wait until the checkpoint is written.
+
+    Examples:
+        .. code-block:: python
+
+            import paddle
+
+            emb = paddle.nn.Embedding(10, 10)
+            task = paddle.async_save(emb.state_dict(), "emb.pdparams")
+            # training goes on here
+            task.result()
+            paddle.clear_async_save_task_queue()
+    '''
+    if not _is_file_path(path):
+        raise ValueError(
+            "`paddle.async_save` only supports saving objects to file, but got {}".format(
+                type(path)
+            )
+        )
+    filename = os.path.basename(path)
+    if filename == "":
+        raise ValueError(
+            "The input path MUST be format of dirname/filename "
+            "[dirname\\filename in Windows system], but received "
+            "filename is empty string."
+        )
+
+    global _async_save_executor
+    if sync_other_task:
+        clear_async_save_task_queue()
+
+    # NOTE: acquire before taking the snapshot, so that the snapshots in
+    # memory never exceed `_ASYNC_SAVE_MAX_INFLIGHT`
+    _async_save_semaphore.acquire()
+    try:
+        snapshot = _snapshot_for_async_save(obj)
+    except:
+        _async_save_semaphore.release()
+        raise
+
+    with _async_save_lock:
+        if _async_save_executor is None:
+            _async_save_executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            task = _async_save_executor.submit(
+                _async_save_task, snapshot, path, protocol, configs
+            )
+        except:
+            _async_save_semaphore.release()
+            raise
+        _async_save_tasks[:] = [t for t in _async_save_tasks if not t.done()]
+        _async_save_tasks.append(task)
+    return task
+
+
+def clear_async_save_task_queue():
+    '''
+    Wait for all the saving tasks submitted by ``paddle.async_save`` to
+    finish. The exception of the first failed task, if any, is raised.
+
+    Returns:
+        None
+
+    Examples:
+        .. code-block:: python
+
+            import paddle
+
+            emb = paddle.nn.Embedding(10, 10)
+            paddle.async_save(emb.state_dict(), "emb.pdparams")
+            paddle.clear_async_save_task_queue()
+    '''
+    with _async_save_lock:
+        tasks = list(_async_save_tasks)
+        del _async_save_tasks[:]
+    for task in tasks:
+        task.result()
+
+
 def _legacy_save(obj, path, protocol=2):
     # 1. input check
     if not isinstance(obj, dict):
@@ -912,6 +1308,9 @@ def load(path, **configs):
             by default.
             (3) return_numpy(bool): If specified as True, return tensor as numpy.ndarray, otherwise return tensor as paddle.Tensor.
             Default False.
+            (4) key_prefix(str): Only supported for the result saved with ``use_mmap_format=True`` . If specified, only load
+            the tensors whose keys start with ``key_prefix`` , the keys of nested structures are joined by ``.`` , such as
+            ``model.linear.weight`` . Default None.
 
     Returns:
         Object(Object): a target object can be used in paddle
@@ -1024,6 +1423,13 @@ def load(path, **configs):
 
     if _is_memory_buffer(path) or os.path.isfile(path):
         config = _parse_load_config(configs)
+        if _is_mmap_format(path):
+            return _load_mmap_format(path, config)
+        if config.key_prefix is not None:
+            raise ValueError(
+                "The config `key_prefix` of `paddle.load` is only supported "
+                "for the result saved with `use_mmap_format=True`."
+            )
         exception_type = pickle.UnpicklingError
         try:
             with _open_file_buffer(path, 'rb') as f:
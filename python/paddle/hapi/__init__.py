@@ -17,6 +17,7 @@ from . import callbacks  # noqa: F401
 from . import hub  # noqa: F401
 from . import progressbar  # noqa: F401
 from . import static_flops  # noqa: F401
+from . import predict_sink  # noqa: F401
 
 from .model import Model  # noqa: F401
 from .model_summary import summary  # noqa: F401
@@ -559,6 +559,10 @@ class ModelCheckpoint(Callback):
             are saved. Default: 1.
         save_dir(str|None): The directory to save checkpoint during training.
             If None, will not save checkpoint. Default: None.
+        async_save(bool, optional): Whether to save checkpoint in background
+            by `paddle.async_save`, training is only blocked by copying the
+            states. It only takes effect in dynamic graph mode, and all the
+            checkpoints are finished when training ends. Default: False.
 
     Examples:
         .. code-block:: python
@@ -590,9 +594,10 @@ class ModelCheckpoint(Callback):
             model.fit(train_dataset, batch_size=64, callbacks=callback)
     """
 
-    def __init__(self, save_freq=1, save_dir=None):
+    def __init__(self, save_freq=1, save_dir=None, async_save=False):
         self.save_freq = save_freq
         self.save_dir = save_dir
+        self.async_save = async_save
 
     def on_epoch_begin(self, epoch=None, logs=None):
         self.epoch = epoch
@@ -600,17 +605,24 @@ class ModelCheckpoint(Callback):
     def _is_save(self):
         return self.model and self.save_dir and ParallelEnv().local_rank == 0
 
+    def _save(self, path):
+        print('save checkpoint at {}'.format(os.path.abspath(path)))
+        if self.async_save and paddle.in_dynamic_mode():
+            self.model._adapter.save(path, async_save=True)
+        else:
+            self.model.save(path)
+
     def on_epoch_end(self, epoch, logs=None):
         if self._is_save() and self.epoch % self.save_freq == 0:
             path = '{}/{}'.format(self.save_dir, epoch)
-            print('save checkpoint at {}'.format(os.path.abspath(path)))
-            self.model.save(path)
+            self._save(path)
 
     def on_train_end(self, logs=None):
         if self._is_save():
             path = '{}/final'.format(self.save_dir)
-            print('save checkpoint at {}'.format(os.path.abspath(path)))
-            self.model.save(path)
+            self._save(path)
+            if self.async_save:
+                paddle.clear_async_save_task_queue()
 
 
 class LRScheduler(Callback):
@@ -37,9 +37,11 @@ from paddle.fluid.dygraph.io import INFER_PARAMS_SUFFIX
 from paddle.fluid.layers.utils import flatten
 from paddle.fluid.layers import collective
 
+from paddle.io import BatchSampler
 from paddle.io import DataLoader
 from paddle.io import Dataset
 from paddle.io import DistributedBatchSampler
+from paddle.io import SequenceSampler
 from paddle.metric import Metric
 from paddle.static import InputSpec as Input
 import paddle.distributed as dist
@@ -49,6 +51,7 @@ from paddle.autograd import no_grad
 
 from .callbacks import config_callbacks, EarlyStopping
 from .model_summary import summary
+from .predict_sink import config_sink
 
 __all__ = []
 
@@ -241,6 +244,44 @@ def prepare_distributed_context(place=None):
     return strategy
 
 
+class _LazyValue(object):
+    """
+    A value of logs which is computed when it is accessed.
+    """
+
+    __slots__ = ['fn']
+
+    def __init__(self, fn):
+        self.fn = fn
+
+
+class _LazyLogs(dict):
+    """
+    Logs passed to callbacks, values of `_LazyValue` are materialized and
+    replaced when they are accessed, so the values which are not accessed
+    by callbacks are not fetched from device.
+    """
+
+    def __getitem__(self, key):
+        value = super(_LazyLogs, self).__getitem__(key)
+        if isinstance(value, _LazyValue):
+            value = value.fn()
+            super(_LazyLogs, self).__setitem__(key, value)
+        return value
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def items(self):
+        return [(k, self[k]) for k in self]
+
+    def values(self):
+        return [self[k] for k in self]
+
+    def materialize(self):
+        return dict(self.items())
+
+
 def _update_input_info(inputs):
     "Get input shape list by given inputs in Model initialization."
     shapes = None
@@ -317,9 +358,9 @@ class StaticGraphAdapter(object):
         self.mode = 'eval'
         return self._run(inputs, labels)
 
-    def predict_batch(self, inputs):
+    def predict_batch(self, inputs, gather=True):
         self.mode = 'test'
-        return self._run(inputs, None)
+        return self._run(inputs, None, gather)
 
     def parameters(self, *args, **kwargs):
         return self.model.network.parameters(*args, **kwargs)
@@ -486,7 +527,7 @@ class StaticGraphAdapter(object):
 
         t.set(ndarray, place)
 
-    def _run(self, inputs, labels=None):
+    def _run(self, inputs, labels=None, gather=True):
         compiled_prog = self._compiled_progs.get(self.mode, None)
         assert (
             compiled_prog
@@ -523,7 +564,8 @@ class StaticGraphAdapter(object):
 
         endpoints = self._endpoints[self.mode]
         if self.mode == 'test':
-            fetch_list = endpoints['output']
+            # outputs of current rank are fetched if not gather
+            fetch_list = endpoints['output' if gather else 'local_output']
         else:
             metric_list, metric_splits = flatten_list(endpoints['metric'])
             fetch_list = endpoints['loss'] + metric_list
@@ -628,6 +670,7 @@ class StaticGraphAdapter(object):
             labels = [k._create_feed_layer() for k in to_list(labels)]
             self._label_vars[mode] = labels
             outputs = to_list(self.model.network.forward(*inputs))
+            local_outputs = outputs
 
             if mode != 'test' and self.model._loss:
                 losses = self.model._loss(*(outputs + labels))
@@ -683,6 +726,7 @@ class StaticGraphAdapter(object):
         self._progs[mode] = prog
         self._endpoints[mode] = {
             "output": outputs,
+            "local_output": local_outputs,
             "loss": to_list(losses),
             "metric": metrics,
         }
@@ -734,6 +778,28 @@ class StaticGraphAdapter(object):
         self._compiled_progs[mode] = compiled_prog
 
 
+class _TrainStep(paddle.nn.Layer):
+    """
+    The network forward and loss computing of a training step, which is
+    converted to static graph by `paddle.jit.to_static` if `compile=True`
+    in `Model.prepare`.
+    """
+
+    def __init__(self, network, loss):
+        super(_TrainStep, self).__init__()
+        self.network = network
+        self.loss = loss
+
+    def forward(self, inputs, labels):
+        outputs = self.network(*inputs)
+        if not isinstance(outputs, (list, tuple)):
+            outputs = [outputs]
+        losses = self.loss(*(list(outputs) + labels))
+        if not isinstance(losses, (list, tuple)):
+            losses = [losses]
+        return list(outputs), list(losses)
+
+
 class DynamicGraphAdapter(object):
     def __init__(self, model):
         super(DynamicGraphAdapter, self).__init__()
@@ -752,6 +818,7 @@ class DynamicGraphAdapter(object):
         self._amp_configs = {}
         self._amp_custom_lists = {}
         self._use_fp16_guard = True
+        self._train_step = None
 
         if self._nranks > 1:
             dist.init_parallel_env()
@@ -773,7 +840,7 @@ class DynamicGraphAdapter(object):
         self.model.mode = value
 
     # TODO multi device in dygraph mode not implemented at present time
-    def train_batch(self, inputs, labels=None, update=True):
+    def train_batch(self, inputs, labels=None, update=True, lazy=False):
         assert (
             self.model._optimizer
         ), "model not ready, please call `model.prepare()` first"
@@ -788,18 +855,26 @@ class DynamicGraphAdapter(object):
         if self._amp_level != "O0" and self.model._scaler is None:
             self.model._scaler = paddle.amp.GradScaler(**self._amp_configs)
 
-        with paddle.amp.auto_cast(
-            enable=self._amp_level != 'O0',
-            **self._amp_custom_lists,
-            level=self._amp_level
-        ):
-            if self._nranks > 1:
-                outputs = self.ddp_model(*[to_variable(x) for x in inputs])
-            else:
-                outputs = self.model.network(*[to_variable(x) for x in inputs])
+        rets = None
+        if self._train_step is not None:
+            rets = self._run_train_step(inputs, labels)
+        if rets is not None:
+            outputs, losses = rets
+        else:
+            with paddle.amp.auto_cast(
+                enable=self._amp_level != 'O0',
+                **self._amp_custom_lists,
+                level=self._amp_level
+            ):
+                if self._nranks > 1:
+                    outputs = self.ddp_model(*[to_variable(x) for x in inputs])
+                else:
+                    outputs = self.model.network(
+                        *[to_variable(x) for x in inputs]
+                    )
 
-        losses = self.model._loss(*(to_list(outputs) + labels))
-        losses = to_list(losses)
+            losses = self.model._loss(*(to_list(outputs) + labels))
+            losses = to_list(losses)
         final_loss = fluid.layers.sum(losses)
 
         if self._amp_level != "O0":
@@ -814,6 +889,15 @@ class DynamicGraphAdapter(object):
                 self.model._optimizer.minimize(final_loss)
                 self.model.network.clear_gradients()
 
+        if lazy:
+            # NOTE: keep losses and the inputs of metric updating on device,
+            # they are fetched and metrics are updated by Model later
+            metric_outs = [
+                to_list(metric.compute(*(to_list(outputs) + labels)))
+                for metric in self.model._metrics
+            ]
+            return [l.detach() for l in losses], metric_outs
+
         metrics = []
         for metric in self.model._metrics:
             metric_outs = metric.compute(*(to_list(outputs) + labels))
@@ -826,6 +910,19 @@ class DynamicGraphAdapter(object):
             else [to_numpy(l) for l in losses]
         )
 
+    def _run_train_step(self, inputs, labels):
+        # programs are cached per input signature by `paddle.jit.to_static`
+        try:
+            return self._train_step([to_variable(x) for x in inputs], labels)
+        except Exception as e:
+            warnings.warn(
+                "Failed to run the training step of Model in static graph "
+                "compiled by `paddle.jit.to_static`, fall back to dynamic "
+                "graph. The error is: {}".format(e)
+            )
+            self._train_step = None
+            return None
+
     def eval_batch(self, inputs, labels=None):
         self.model.network.eval()
         self.mode = 'eval'
@@ -888,13 +985,17 @@ class DynamicGraphAdapter(object):
         else:
             return metrics
 
-    def predict_batch(self, inputs):
+    def predict_batch(self, inputs, gather=True):
         self.model.network.eval()
         self.mode = 'test'
         inputs = [to_variable(x) for x in to_list(inputs)]
         self._input_info = _update_input_info(inputs)
         outputs = self.model.network(*inputs)
-        if self._nranks > 1 and isinstance(self.model._place, fluid.CUDAPlace):
+        if (
+            gather
+            and self._nranks > 1
+            and isinstance(self.model._place, fluid.CUDAPlace)
+        ):
             outputs = [_all_gather(o, self._nranks) for o in to_list(outputs)]
 
         return [to_numpy(o) for o in to_list(outputs)]
@@ -902,17 +1003,28 @@ class DynamicGraphAdapter(object):
     def parameters(self, *args, **kwargs):
         return self.model.network.parameters(*args, **kwargs)
 
-    def save(self, path):
+    def save(self, path, async_save=False):
         params = self.model.network.state_dict()
-        fluid.save_dygraph(params, path)
+        if async_save:
+            # only the snapshot of states blocks, files are written in
+            # background by `paddle.async_save`
+            paddle.async_save(params, path + '.pdparams')
+        else:
+            fluid.save_dygraph(params, path)
         if self.model._optimizer is not None:
             if self.model._optimizer.state_dict():
                 optim = self.model._optimizer.state_dict()
-                fluid.save_dygraph(optim, path)
+                if async_save:
+                    paddle.async_save(optim, path + '.pdopt')
+                else:
+                    fluid.save_dygraph(optim, path)
         if hasattr(self.model, '_scaler') and self.model._scaler is not None:
             if self.model._scaler.state_dict():
                 scaler = self.model._scaler.state_dict()
-                paddle.save(scaler, path + '.pdscaler')
+                if async_save:
+                    paddle.async_save(scaler, path + '.pdscaler')
+                else:
+                    paddle.save(scaler, path + '.pdscaler')
 
     def load(self, param_state_pairs, optim_state, scaler_state=None):
         # restore parameter states
@@ -1005,6 +1117,18 @@ class DynamicGraphAdapter(object):
         if self._amp_level != "O0":
             self.model._scaler = None
 
+        self._train_step = None
+        if self.model._compile and self.model._loss:
+            if self._amp_level != "O0" or self._nranks > 1:
+                warnings.warn(
+                    "`compile=True` is not supported with AMP or multiple "
+                    "cards by now, training step runs in dynamic graph."
+                )
+            else:
+                self._train_step = paddle.jit.to_static(
+                    _TrainStep(self.model.network, self.model._loss)
+                )
+
 
 class Model(object):
     """
@@ -1124,10 +1248,14 @@ class Model(object):
         self._loss = None
         self._loss_weights = None
         self._optimizer = None
+        self._compile = False
         self._input_info = None
         self._is_shape_inferred = False
         self._test_dataloader = None
         self.stop_training = False
+        self._sync_freq = None
+        self._pending_metric_outs = []
+        self._metric_results = None
 
         if not _non_static_mode():
             if not isinstance(inputs, (list, tuple, dict, Input)):
@@ -1609,7 +1737,12 @@ class Model(object):
             self._adapter._amp_configs[key] = amp_configs[key]
 
     def prepare(
-        self, optimizer=None, loss=None, metrics=None, amp_configs=None
+        self,
+        optimizer=None,
+        loss=None,
+        metrics=None,
+        amp_configs=None,
+        compile=False,
     ):
         """
         Configures the model before runing.
@@ -1640,6 +1773,14 @@ class Model(object):
                 for details. For convenience, 'amp_configs' could be set to
                 'O1' or 'O2' if no more parameters are needed. 'amp_configs'
                 could be None in float32 training. Default: None.
+            compile (bool, optional): Whether to convert the network forward
+                and loss computing of training step to static graph by
+                `paddle.jit.to_static` in dynamic graph mode, which reduces
+                the overhead of Python operator dispatching. The compiled
+                programs are cached per input signature, and training falls
+                back to dynamic graph if the conversion fails. It is not
+                supported with AMP or multiple cards, and is ignored in
+                static graph mode. Default: False.
 
         Returns:
             None
@@ -1679,6 +1820,7 @@ class Model(object):
                 metric, Metric
             ), "{} is not sub class of Metric".format(metric.__class__.__name__)
         self._metrics = to_list(metrics)
+        self._compile = compile
         self._prepare_amp(amp_configs)
 
         self._adapter.prepare()
@@ -1700,6 +1842,7 @@ class Model(object):
         callbacks=None,
         accumulate_grad_batches=1,
         num_iters=None,
+        sync_freq=None,
     ):
         """
         Trains the model for a fixed number of epochs. If `eval_data` is set,
@@ -1747,6 +1890,13 @@ class Model(object):
             num_iters (int|None, optional): The number of iterations to evaluate the model.
                 If None, evaluate on whole input dataset, otherwise, evaluate `num_iters` times.
                 Default: None.
+            sync_freq (int|None, optional): The frequency, in number of steps, losses and
+                the inputs of metrics are fetched from device to host and metrics are
+                updated in dynamic graph mode. Between the synchronizations, losses and
+                metric inputs are kept on device, and the logs passed to callbacks are
+                only fetched when they are accessed, so the host does not wait for the
+                device at every step. It is suggested to be the same as `log_freq`. If
+                None, they are fetched at every step. Default: None.
 
         Returns:
             None
@@ -1873,6 +2023,12 @@ class Model(object):
         self._test_dataloader = eval_loader
 
         self._accumulate = accumulate_grad_batches
+        if sync_freq is not None:
+            assert (
+                isinstance(sync_freq, int) and sync_freq > 0
+            ), "sync_freq should be None or a positive integer"
+        # static graph fetches outputs of every step from executor
+        self._sync_freq = sync_freq if fluid._non_static_mode() else None
 
         steps = self._len_data_loader(train_loader)
         self.num_iters = num_iters
@@ -1921,6 +2077,7 @@ class Model(object):
 
         cbks.on_end('train', logs)
         self._test_dataloader = None
+        self._sync_freq = None
 
     def evaluate(
         self,
@@ -2042,6 +2199,7 @@ class Model(object):
         stack_outputs=False,
         verbose=1,
         callbacks=None,
+        sink=None,
     ):
         """
         Compute the output predictions on testing data.
@@ -2064,9 +2222,20 @@ class Model(object):
             verbose (int, optional): The verbosity mode, should be 0, 1, or 2. 0 = silent,
                 1 = progress bar, 2 = one line per batch. Default: 1.
             callbacks(Callback, optional): A Callback instance, Default: None.
+            sink(PredictSink|callable, optional): If set, the outputs of each
+                batch are written to the sink instead of being held in memory
+                and returned, and each rank writes the outputs of its own
+                samples without gathering among ranks. A callable is called
+                with the list of outputs of each batch. Sinks writing to files
+                are provided in `paddle.hapi.predict_sink`, such as
+                `NpyShardSink` and `MemmapSink`, which also write the dataset
+                indices of samples, so that the outputs of ranks can be merged
+                into the order of dataset by `predict_sink.merge_outputs`.
+                `stack_outputs` is ignored if `sink` is set. Default: None.
 
         Returns:
-            list: output of models.
+            list: output of models, or the return value of `sink.end()` if
+            `sink` is set.
 
         Examples:
 
@@ -2112,19 +2281,20 @@ class Model(object):
                 # 157 (64, 10)
         """
 
-        if test_data is not None and isinstance(test_data, Dataset):
-            test_sampler = DistributedBatchSampler(
-                test_data, batch_size=batch_size
-            )
-            test_loader = DataLoader(
-                test_data,
-                batch_sampler=test_sampler,
-                places=self._place,
-                num_workers=num_workers,
-                return_list=True,
-            )
-        else:
-            test_loader = test_data
+        test_loader = self._predict_loader(test_data, batch_size, num_workers)
+
+        if sink is not None:
+            sink = config_sink(sink)
+            indices = self._local_sample_indices(test_loader)
+            if indices is not None:
+                sink.begin(len(indices), indices)
+            else:
+                sink.begin(self._num_local_samples(test_loader))
+            for outs in self.predict_iter(
+                test_loader, verbose=verbose, callbacks=callbacks
+            ):
+                sink.write(outs)
+            return sink.end()
 
         self._test_dataloader = test_loader
 
@@ -2151,6 +2321,136 @@ class Model(object):
         cbks.on_end('predict', logs)
         return outputs
 
+    def predict_iter(
+        self,
+        test_data,
+        batch_size=1,
+        num_workers=0,
+        verbose=1,
+        callbacks=None,
+    ):
+        """
+        A generator version of `predict`, which yields the output predictions
+        batch by batch, so that the memory usage does not grow with the size
+        of testing data. In distributed predicting, each rank yields the
+        outputs of its own samples, which are not gathered among ranks.
+
+        Args:
+            test_data (Dataset|DataLoader): An iterable data loader is used for
+                predict. An instance of paddle.io.Dataset or paddle.io.Dataloader
+                is recomended.
+            batch_size (int, optional): The batch size of test_data. When test_data is the
+                instance of Dataloader, this argument will be ignored. Default: 1.
+            num_workers (int, optional): The number of subprocess to load data, 0 for no subprocess
+                used and loading data in main process. When test_data is the instance of Dataloader,
+                this argument will be ignored. Default: 0.
+            verbose (int, optional): The verbosity mode, should be 0, 1, or 2. 0 = silent,
+                1 = progress bar, 2 = one line per batch. Default: 1.
+            callbacks(Callback, optional): A Callback instance, Default: None.
+
+        Returns:
+            generator: yields a list of numpy.ndarray, the outputs of model
+            forward of each batch.
+
+        Examples:
+
+          .. code-block:: python
+
+                import paddle
+                from paddle.static import InputSpec
+
+                test_dataset = paddle.vision.datasets.MNIST(mode='test')
+
+                input = InputSpec([-1, 1, 28, 28], 'float32', 'image')
+                model = paddle.Model(paddle.vision.models.LeNet(), input)
+                model.prepare()
+                for outs in model.predict_iter(test_dataset, batch_size=64):
+                    print(outs[0].shape)
+                    # (64, 10)
+                    break
+        """
+        test_loader = self._predict_loader(test_data, batch_size, num_workers)
+        self._test_dataloader = test_loader
+
+        cbks = config_callbacks(callbacks, model=self, verbose=verbose)
+        logs = {'steps': self._len_data_loader(test_loader)}
+        cbks.on_begin('predict', logs)
+        try:
+            for step, data in enumerate(test_loader):
+                # see _run_one_epoch for the formats of data
+                data = flatten(data)
+                batch_size = (
+                    data[0].shape()[0]
+                    if callable(data[0].shape)
+                    else data[0].shape[0]
+                )
+
+                cbks.on_batch_begin('predict', step, logs)
+                if self._inputs is not None:
+                    data = data[: len(self._inputs)]
+                # NOTE: grad is only disabled in forward, but not while the
+                # caller runs between yields
+                with no_grad():
+                    outs = self._adapter.predict_batch(data, gather=False)
+                if fluid._non_static_mode() and self._input_info is None:
+                    self._update_inputs()
+
+                logs['step'] = step
+                logs['batch_size'] = batch_size
+                cbks.on_batch_end('predict', step, logs)
+                yield outs
+        finally:
+            self._test_dataloader = None
+        cbks.on_end('predict', logs)
+
+    def _predict_loader(self, test_data, batch_size, num_workers):
+        if test_data is not None and isinstance(test_data, Dataset):
+            test_sampler = DistributedBatchSampler(
+                test_data, batch_size=batch_size
+            )
+            return DataLoader(
+                test_data,
+                batch_sampler=test_sampler,
+                places=self._place,
+                num_workers=num_workers,
+                return_list=True,
+            )
+        return test_data
+
+    def _local_sample_indices(self, data_loader):
+        # the dataset indices of samples loaded by current rank in loading
+        # order, None if they cannot be inferred before loading
+        batch_sampler = getattr(data_loader, 'batch_sampler', None)
+        if type(batch_sampler) is DistributedBatchSampler:
+            # NOTE: iterating a shuffled sampler advances its epoch, restore
+            # it so that the data loader loads samples in the same order
+            epoch = batch_sampler.epoch
+            indices = [i for batch in batch_sampler for i in batch]
+            batch_sampler.epoch = epoch
+        elif type(batch_sampler) is BatchSampler and isinstance(
+            batch_sampler.sampler, SequenceSampler
+        ):
+            indices = [i for batch in batch_sampler for i in batch]
+        else:
+            return None
+        return np.array(indices, dtype='int64')
+
+    def _num_local_samples(self, data_loader):
+        # the number of samples loaded by current rank, None if unknown
+        batch_sampler = getattr(data_loader, 'batch_sampler', None)
+        if type(batch_sampler) is DistributedBatchSampler:
+            num_samples = batch_sampler.num_samples
+        elif type(batch_sampler) is BatchSampler:
+            try:
+                num_samples = len(batch_sampler.sampler)
+            except TypeError:
+                return None
+        else:
+            return None
+        if batch_sampler.drop_last:
+            num_samples -= num_samples % batch_sampler.batch_size
+        return num_samples
+
     def _save_inference_model(self, path):
         """
         Save inference model can be used in static or dynamic mode.
@@ -2223,6 +2523,9 @@ class Model(object):
         logs={},
     ):
         outputs = []
+        lazy = mode == 'train' and self._sync_freq is not None
+        if lazy:
+            logs = _LazyLogs(logs)
         for step, data in enumerate(data_loader):
             # data might come from different types of data_loader and have
             # different format, as following:
@@ -2255,23 +2558,29 @@ class Model(object):
                         or step + 1 == len(data_loader)
                     )
 
-                outs = getattr(self, mode + '_batch')(*_inputs)
-
-                if self._metrics and self._loss:
-                    metrics = [[l[0] for l in outs[0]]]
-                elif self._loss:
-                    metrics = [[l[0] for l in outs]]
+                if lazy:
+                    sync = (step + 1) % self._sync_freq == 0 or (
+                        step + 1 == self._len_data_loader(data_loader)
+                    )
+                    self._lazy_train_batch(*_inputs, logs=logs, sync=sync)
                 else:
-                    metrics = []
+                    outs = getattr(self, mode + '_batch')(*_inputs)
+
+                    if self._metrics and self._loss:
+                        metrics = [[l[0] for l in outs[0]]]
+                    elif self._loss:
+                        metrics = [[l[0] for l in outs]]
+                    else:
+                        metrics = []
 
-                # metrics
-                for metric in self._metrics:
-                    res = metric.accumulate()
-                    metrics.extend(to_list(res))
+                    # metrics
+                    for metric in self._metrics:
+                        res = metric.accumulate()
+                        metrics.extend(to_list(res))
 
-                assert len(self._metrics_name()) == len(metrics)
-                for k, v in zip(self._metrics_name(), metrics):
-                    logs[k] = v
+                    assert len(self._metrics_name()) == len(metrics)
+                    for k, v in zip(self._metrics_name(), metrics):
+                        logs[k] = v
             else:
                 if self._inputs is not None:
                     outs = self.predict_batch(data[: len(self._inputs)])
@@ -2296,12 +2605,51 @@ class Model(object):
                     self.stop_training = True
                     del self.num_iters
                     break
+        if lazy:
+            logs = logs.materialize()
         self._reset_metrics()
 
         if mode == 'predict':
             return logs, outputs
         return logs
 
+    def _lazy_train_batch(self, inputs, labels, update, logs, sync):
+        losses, metric_outs = self._adapter.train_batch(
+            inputs, labels, update, lazy=True
+        )
+        if self._input_info is None:
+            self._update_inputs()
+        self._pending_metric_outs.append(metric_outs)
+        self._metric_results = None
+
+        values = []
+        if self._loss:
+            values.append(_LazyValue(lambda: [to_numpy(l)[0] for l in losses]))
+        num_metric_values = len(self._metrics_name()) - len(values)
+        for i in range(num_metric_values):
+            values.append(_LazyValue(lambda i=i: self._accumulate_metrics()[i]))
+        for k, v in zip(self._metrics_name(), values):
+            logs[k] = v
+
+        if sync:
+            logs.materialize()
+
+    def _update_pending_metrics(self):
+        # update metrics with the inputs kept on device since last update
+        for metric_outs in self._pending_metric_outs:
+            for metric, outs in zip(self._metrics, metric_outs):
+                metric.update(*[to_numpy(m) for m in outs])
+        self._pending_metric_outs = []
+
+    def _accumulate_metrics(self):
+        if self._metric_results is None:
+            self._update_pending_metrics()
+            results = []
+            for metric in self._metrics:
+                results.extend(to_list(metric.accumulate()))
+            self._metric_results = results
+        return self._metric_results
+
     def summary(self, input_size=None, dtype=None):
         """Prints a string summary of the network.
 
@@ -2393,6 +2741,8 @@ class Model(object):
         return out_specs
 
     def _reset_metrics(self):
+        self._pending_metric_outs = []
+        self._metric_results = None
         for metric in self._metrics:
             metric.reset()
 
@@ -0,0 +1,342 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import numpy as np
+
+from paddle.fluid.dygraph.parallel import ParallelEnv
+
+__all__ = []
+
+
+def merge_outputs(outputs, indices):
+    """
+    Merges the outputs written by ranks into the order of dataset.
+
+    In distributed predicting, `DistributedBatchSampler` interleaves batches
+    among ranks and pads duplicate samples so that each rank predicts the
+    same number of samples. Sorting the outputs by the dataset indices
+    written along with them and keeping the first occurrence of each index
+    restores the order of dataset without duplicates.
+
+    Args:
+        outputs (list): A list of numpy.ndarray, the outputs of one model
+            output written by all ranks, such as the shards of all ranks
+            written by `NpyShardSink`.
+        indices (list): A list of numpy.ndarray, the dataset indices of the
+            samples in the corresponding arrays of `outputs`.
+
+    Returns:
+        numpy.ndarray: the outputs in the order of dataset.
+
+    Examples:
+
+        .. code-block:: python
+
+            import glob
+            import numpy as np
+            from paddle.hapi.predict_sink import merge_outputs
+
+            # shards of the 1st output and the indices written by NpyShardSink
+            outputs = [np.load(f) for f in sorted(glob.glob(
+                'predictions/output_0.rank*.npy'))]
+            indices = [np.load(f) for f in sorted(glob.glob(
+                'predictions/output_index.rank*.npy'))]
+            # merged = merge_outputs(outputs, indices)
+    """
+    assert len(outputs) == len(indices), (
+        "the number of outputs {} should be equal to the number of "
+        "indices {}".format(len(outputs), len(indices))
+    )
+    _, first = np.unique(np.concatenate(indices), return_index=True)
+    return np.concatenate(outputs)[first]
+
+
+def config_sink(sink):
+    if sink is None or isinstance(sink, PredictSink):
+        return sink
+    if callable(sink):
+        return CallbackSink(sink)
+    raise TypeError(
+        "sink should be an instance of PredictSink or a callable, "
+        "but received {}".format(type(sink))
+    )
+
+
+class PredictSink(object):
+    """
+    Base class of the sinks which `Model.predict` writes the outputs to
+    batch by batch, instead of holding all outputs in memory.
+
+    In distributed predicting, each rank writes the outputs of its own
+    samples to its sink, and outputs are not gathered among ranks. The
+    samples of ranks are interleaved and may contain padded duplicates, so
+    the outputs should be merged by the indices given in `begin`, see
+    `merge_outputs`.
+
+    Subclasses should implement `write` and optionally `begin` and `end`.
+    """
+
+    def begin(self, num_samples=None, indices=None):
+        """
+        Called before predicting.
+
+        Args:
+            num_samples (int|None): The number of samples predicted by
+                current rank if it can be inferred from the data loader,
+                otherwise None.
+            indices (numpy.ndarray|None): The dataset indices of samples
+                predicted by current rank in predicting order, including the
+                duplicate samples padded by `DistributedBatchSampler`, if
+                they can be inferred from the data loader, otherwise None.
+        """
+        pass
+
+    def write(self, outputs):
+        """
+        Called with the outputs of each batch.
+
+        Args:
+            outputs (list): A list of numpy.ndarray, the outputs of model
+                forward of one batch.
+        """
+        raise NotImplementedError
+
+    def end(self):
+        """
+        Called after predicting, the return value of which is returned
+        by `Model.predict`.
+        """
+        return None
+
+
+class CallbackSink(PredictSink):
+    """
+    Call a function with the outputs of each batch.
+
+    Args:
+        fn (callable): A function called as `fn(outputs)`, `outputs` is a
+            list of numpy.ndarray of one batch.
+
+    Examples:
+
+        .. code-block:: python
+
+            import paddle
+            from paddle.hapi.predict_sink import CallbackSink
+
+            sink = CallbackSink(lambda outputs: print(outputs[0].shape))
+    """
+
+    def __init__(self, fn):
+        assert callable(fn), "fn should be callable"
+        self.fn = fn
+
+    def write(self, outputs):
+        self.fn(outputs)
+
+
+class NpyShardSink(PredictSink):
+    """
+    Write the outputs to `.npy` shard files, each of which holds
+    `shard_size` samples at most. The shard of the `i`-th output of model
+    is saved as `{save_dir}/{prefix}_{i}.rank{rank}.{shard_id:05d}.npy`,
+    so each rank writes its own shards.
+
+    Only the outputs of at most one shard are held in memory, and the
+    outputs of a shard are stacked along the first dimension, which
+    should be the batch dimension.
+
+    If the dataset indices of samples can be inferred from the data loader,
+    the indices of each shard are saved as
+    `{save_dir}/{prefix}_index.rank{rank}.{shard_id:05d}.npy`, the list of
+    which is `index_files` after predicting. The shards of all ranks can be
+    merged into the order of dataset by `merge_outputs`.
+
+    Args:
+        save_dir (str): The directory to save shard files.
+        shard_size (int, optional): The max number of samples in a shard.
+            Default: 65536.
+        prefix (str, optional): The prefix of shard file names.
+            Default: 'output'.
+
+    Examples:
+
+        .. code-block:: python
+
+            import paddle
+            from paddle.hapi.predict_sink import NpyShardSink
+
+            sink = NpyShardSink('predictions', shard_size=10000)
+            # files = model.predict(dataset, batch_size=64, sink=sink)
+            # files[0] is the list of shard files of the 1st output, and
+            # sink.index_files is the list of index files of the shards
+    """
+
+    def __init__(self, save_dir, shard_size=65536, prefix='output'):
+        assert shard_size > 0, "shard_size should be a positive value"
+        self.save_dir = save_dir
+        self.shard_size = shard_size
+        self.prefix = prefix
+        self.rank = ParallelEnv().rank
+
+    def begin(self, num_samples=None, indices=None):
+        if not os.path.exists(self.save_dir):
+            os.makedirs(self.save_dir)
+        self._buffers = None
+        self._buffered = 0
+        self._files = None
+        self._indices = indices
+        self._written = 0
+        self.index_files = []
+
+    def _shard_path(self, idx, shard_id):
+        return os.path.join(
+            self.save_dir,
+            '{}_{}.rank{}.{:05d}.npy'.format(
+                self.prefix, idx, self.rank, shard_id
+            ),
+        )
+
+    def write(self, outputs):
+        if self._buffers is None:
+            self._buffers = [[] for _ in outputs]
+            self._files = [[] for _ in outputs]
+        start = 0
+        batch_size = outputs[0].shape[0]
+        while start < batch_size:
+            end = min(batch_size, start + self.shard_size - self._buffered)
+            for buf, out in zip(self._buffers, outputs):
+                buf.append(out[start:end])
+            self._buffered += end - start
+            start = end
+            if self._buffered == self.shard_size:
+                self._flush()
+
+    def _flush(self):
+        if not self._buffered:
+            return
+        shard_id = len(self._files[0])
+        for idx, buf in enumerate(self._buffers):
+            path = self._shard_path(idx, shard_id)
+            np.save(path, np.concatenate(buf))
+            self._files[idx].append(path)
+            del buf[:]
+        if self._indices is not None:
+            path = self._shard_path('index', shard_id)
+            end = self._written + self._buffered
+            np.save(path, self._indices[self._written : end])
+            self.index_files.append(path)
+        self._written += self._buffered
+        self._buffered = 0
+
+    def end(self):
+        if self._buffers is None:
+            return []
+        self._flush()
+        return self._files
+
+
+class MemmapSink(PredictSink):
+    """
+    Write the outputs into memory-mapped `.npy` files, the `i`-th output
+    of model is saved as `{save_dir}/{prefix}_{i}.rank{rank}.npy` in shape
+    `[num_samples] + sample_shape`, where `sample_shape` is inferred from
+    the first batch. Written pages are flushed to disk by the OS, so the
+    memory usage does not grow with the number of samples.
+
+    If the dataset indices of samples can be inferred from the data loader,
+    they are saved as `{save_dir}/{prefix}_index.rank{rank}.npy`, the path
+    of which is `index_file` after predicting, otherwise `index_file` is
+    None. The outputs of all ranks can be merged into the order of dataset
+    by `merge_outputs`.
+
+    Args:
+        save_dir (str): The directory to save the files.
+        num_samples (int, optional): The number of samples predicted by
+            current rank. If None, it is inferred from the batch sampler of
+            the data loader. Default: None.
+        prefix (str, optional): The prefix of file names. Default: 'output'.
+
+    Examples:
+
+        .. code-block:: python
+
+            import paddle
+            from paddle.hapi.predict_sink import MemmapSink
+
+            sink = MemmapSink('predictions')
+            # outputs = model.predict(dataset, batch_size=64, sink=sink)
+            # outputs[0] is a numpy.memmap of the 1st output, and
+            # np.load(sink.index_file) is the dataset indices of its samples
+    """
+
+    def __init__(self, save_dir, num_samples=None, prefix='output'):
+        self.save_dir = save_dir
+        self.num_samples = num_samples
+        self.prefix = prefix
+        self.rank = ParallelEnv().rank
+
+    def begin(self, num_samples=None, indices=None):
+        if self.num_samples is not None:
+            num_samples = self.num_samples
+        if num_samples is None:
+            raise ValueError(
+                "num_samples of MemmapSink cannot be inferred from the "
+                "data loader, please set it explicitly."
+            )
+        if not os.path.exists(self.save_dir):
+            os.makedirs(self.save_dir)
+        self._num_samples = num_samples
+        self._arrays = None
+        self._offset = 0
+        self._indices = indices
+        self.index_file = None
+
+    def _path(self, idx):
+        return os.path.join(
+            self.save_dir,
+            '{}_{}.rank{}.npy'.format(self.prefix, idx, self.rank),
+        )
+
+    def write(self, outputs):
+        if self._arrays is None:
+            self._arrays = [
+                np.lib.format.open_memmap(
+                    self._path(idx),
+                    mode='w+',
+                    dtype=out.dtype,
+                    shape=(self._num_samples,) + out.shape[1:],
+                )
+                for idx, out in enumerate(outputs)
+            ]
+        batch_size = outputs[0].shape[0]
+        assert self._offset + batch_size <= self._num_samples, (
+            "the number of predicted samples exceeds num_samples {} "
+            "of MemmapSink".format(self._num_samples)
+        )
+        for array, out in zip(self._arrays, outputs):
+            array[self._offset : self._offset + batch_size] = out
+        self._offset += batch_size
+
+    def end(self):
+        if self._arrays is None:
+            return []
+        for array in self._arrays:
+            array.flush()
+        if self._indices is not None:
+            self.index_file = self._path('index')
+            np.save(self.index_file, self._indices[: self._offset])
+        return [array[: self._offset] for array in self._arrays]
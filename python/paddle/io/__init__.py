@@ -24,11 +24,13 @@ from ..fluid.dataloader import Sampler  # noqa: F401
 from ..fluid.dataloader import SequenceSampler  # noqa: F401
 from ..fluid.dataloader import RandomSampler  # noqa: F401
 from ..fluid.dataloader import DistributedBatchSampler  # noqa: F401
+from ..fluid.dataloader import BucketBatchSampler  # noqa: F401
 from ..fluid.dataloader import ComposeDataset  # noqa: F401
 from ..fluid.dataloader import ChainDataset  # noqa: F401
 from ..fluid.dataloader import WeightedRandomSampler  # noqa: F401
 from ..fluid.dataloader import Subset  # noqa: F401
 from ..fluid.dataloader import random_split  # noqa: F401
+from ..fluid.dataloader.collate import CompiledCollateFn  # noqa: F401
 
 __all__ = [  # noqa
     'Dataset',
@@ -38,6 +40,7 @@ __all__ = [  # noqa
     'ChainDataset',
     'BatchSampler',
     'DistributedBatchSampler',
+    'BucketBatchSampler',
     'DataLoader',
     'get_worker_info',
     'Sampler',
@@ -46,4 +49,5 @@ __all__ = [  # noqa
     'WeightedRandomSampler',
     'random_split',
     'Subset',
+    'CompiledCollateFn',
 ]
@@ -18,6 +18,7 @@ from ..fluid.dygraph.jit import load  # noqa: F401
 from ..fluid.dygraph.jit import TracedLayer  # noqa: F401
 from ..fluid.dygraph.jit import set_code_level  # noqa: F401
 from ..fluid.dygraph.jit import set_verbosity  # noqa: F401
+from ..fluid.dygraph.jit import set_cache_dir  # noqa: F401
 from ..fluid.dygraph.jit import declarative as to_static  # noqa: F401
 from ..fluid.dygraph.jit import not_to_static  # noqa: F401
 from ..fluid.dygraph import ProgramTranslator  # noqa: F401
@@ -34,5 +35,6 @@ __all__ = [  # noqa
     'TranslatedLayer',
     'set_code_level',
     'set_verbosity',
+    'set_cache_dir',
     'not_to_static',
 ]
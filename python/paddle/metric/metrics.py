@@ -28,6 +28,55 @@ def _is_numpy_(var):
     return isinstance(var, (np.ndarray, np.generic))
 
 
+def _check_average(average, num_classes):
+    if average not in ('binary', 'macro', 'micro'):
+        raise ValueError(
+            "average should be 'binary', 'macro' or 'micro', but got "
+            "{}.".format(average)
+        )
+    if average != 'binary' and (num_classes is None or num_classes < 2):
+        raise ValueError(
+            "num_classes should be an integer no less than 2 when average "
+            "is '{}', but got {}.".format(average, num_classes)
+        )
+
+
+def _confusion_matrix(preds, labels, num_classes):
+    """
+    Count the (label, prediction) pairs of a mini-batch into a confusion
+    matrix with shape (num_classes, num_classes), the rows are indexed by
+    labels and the columns by predictions. `preds` are either class ids
+    or scores of shape (batch_size, num_classes).
+    """
+    sample_num = labels.shape[0]
+    labels = labels.reshape(sample_num).astype('int64')
+    if preds.ndim > 1 and preds.shape[-1] == num_classes:
+        preds = preds.reshape(sample_num, num_classes).argmax(axis=-1)
+    else:
+        preds = preds.reshape(sample_num).astype('int64')
+    if sample_num > 0 and (
+        min(labels.min(), preds.min()) < 0
+        or max(labels.max(), preds.max()) >= num_classes
+    ):
+        raise ValueError(
+            "The class ids of 'preds' and 'labels' should be in "
+            "[0, {}).".format(num_classes)
+        )
+    return np.bincount(
+        labels * num_classes + preds, minlength=num_classes * num_classes
+    ).reshape(num_classes, num_classes)
+
+
+def _average_score(tp, total, average):
+    # tp and total are per-class counts, classes without any sample
+    # contribute 0 to the macro average
+    if average == 'micro':
+        total = total.sum()
+        return float(tp.sum()) / total if total != 0 else 0.0
+    scores = np.where(total > 0, tp / np.maximum(total, 1), 0.0)
+    return float(scores.mean())
+
+
 class Metric(metaclass=abc.ABCMeta):
     r"""
     Base class for metric, encapsulates metric logic and APIs
@@ -319,6 +368,28 @@ class Accuracy(Metric):
         res = res[0] if len(self.topk) == 1 else res
         return res
 
+    def merge(self, other):
+        """
+        Merge the states of another Accuracy instance into this one, e.g.
+        the states accumulated by another worker or rank.
+
+        Args:
+            other (Accuracy): The metric instance to merge from, it should
+                be created with the same `topk`.
+        """
+        if not isinstance(other, Accuracy):
+            raise TypeError(
+                "Can only merge an Accuracy, but got {}.".format(type(other))
+            )
+        if tuple(other.topk) != tuple(self.topk):
+            raise ValueError(
+                "Can not merge Accuracy with topk {} into Accuracy with "
+                "topk {}.".format(other.topk, self.topk)
+            )
+        for i in range(len(self.topk)):
+            self.total[i] += other.total[i]
+            self.count[i] += other.count[i]
+
     def _init_name(self, name):
         name = name or 'acc'
         if self.maxk != 1:
@@ -339,12 +410,19 @@ class Precision(Metric):
     relevant instances among the retrieved instances. Refer to
     https://en.wikipedia.org/wiki/Evaluation_of_binary_classifiers
 
-    Noted that this class manages the precision score only for binary
-    classification task.
+    By default this class manages the precision score for binary
+    classification task, multi-class precision is computed from a confusion
+    matrix when `average` is 'macro' or 'micro'.
 
     Args:
         name (str, optional): String name of the metric instance.
             Default is `precision`.
+        num_classes (int, optional): The number of classes, it is required
+            when `average` is 'macro' or 'micro'. Default is None.
+        average (str, optional): 'binary' for the precision of the positive
+            class, 'macro' for the unweighted mean of the per-class precision,
+            or 'micro' for the precision computed from the total counts of
+            all classes. Default is 'binary'.
 
     Example by standalone:
 
@@ -399,8 +477,20 @@ class Precision(Metric):
           model.fit(data, batch_size=16)
     """
 
-    def __init__(self, name='precision', *args, **kwargs):
+    def __init__(
+        self,
+        name='precision',
+        num_classes=None,
+        average='binary',
+        *args,
+        **kwargs
+    ):
         super(Precision, self).__init__(*args, **kwargs)
+        _check_average(average, num_classes)
+        self._num_classes = num_classes
+        self._average = average
+        if average != 'binary':
+            self.confusion = np.zeros((num_classes, num_classes), 'int64')
         self.tp = 0  # true positive
         self.fp = 0  # false positive
         self._name = name
@@ -413,6 +503,9 @@ class Precision(Metric):
             preds (numpy.ndarray): The prediction result, usually the output
                 of two-class sigmoid function. It should be a vector (column
                 vector or row vector) with data type: 'float64' or 'float32'.
+                When `average` is 'macro' or 'micro', it is either the
+                predicted class ids or the scores with shape
+                [batch_size, num_classes].
             labels (numpy.ndarray): The ground truth (labels),
                 the shape should keep the same as preds.
                 The data type is 'int32' or 'int64'.
@@ -427,17 +520,51 @@ class Precision(Metric):
         elif not _is_numpy_(labels):
             raise ValueError("The 'labels' must be a numpy ndarray or Tensor.")
 
+        if self._average != 'binary':
+            self.confusion += _confusion_matrix(
+                preds, labels, self._num_classes
+            )
+            return
+
         sample_num = labels.shape[0]
-        preds = np.floor(preds + 0.5).astype("int32")
+        preds = np.floor(preds + 0.5).astype("int32").reshape(sample_num)
+        labels = labels.reshape(sample_num)
+
+        pos = preds == 1
+        tp = int(np.count_nonzero(pos & (labels == 1)))
+        self.tp += tp
+        self.fp += int(np.count_nonzero(pos)) - tp
 
-        for i in range(sample_num):
-            pred = preds[i]
-            label = labels[i]
-            if pred == 1:
-                if pred == label:
-                    self.tp += 1
-                else:
-                    self.fp += 1
+    def merge(self, other):
+        """
+        Merge the states of another Precision instance into this one, e.g.
+        the states accumulated by another worker or rank.
+
+        Args:
+            other (Precision): The metric instance to merge from.
+        """
+        if not isinstance(other, Precision):
+            raise TypeError(
+                "Can only merge a Precision, but got {}.".format(type(other))
+            )
+        if (
+            other._average != self._average
+            or other._num_classes != self._num_classes
+        ):
+            raise ValueError(
+                "Can not merge Precision with average '{}' and num_classes {} "
+                "into Precision with average '{}' and num_classes {}.".format(
+                    other._average,
+                    other._num_classes,
+                    self._average,
+                    self._num_classes,
+                )
+            )
+        if self._average != 'binary':
+            self.confusion += other.confusion
+            return
+        self.tp += other.tp
+        self.fp += other.fp
 
     def reset(self):
         """
@@ -445,6 +572,8 @@ class Precision(Metric):
         """
         self.tp = 0
         self.fp = 0
+        if self._average != 'binary':
+            self.confusion[...] = 0
 
     def accumulate(self):
         """
@@ -453,6 +582,12 @@ class Precision(Metric):
         Returns:
             A scaler float: results of the calculated precision.
         """
+        if self._average != 'binary':
+            return _average_score(
+                np.diag(self.confusion),
+                self.confusion.sum(axis=0),
+                self._average,
+            )
         ap = self.tp + self.fp
         return float(self.tp) / ap if ap != 0 else 0.0
 
@@ -472,12 +607,19 @@ class Recall(Metric):
     Refer to:
     https://en.wikipedia.org/wiki/Precision_and_recall
 
-    Noted that this class manages the recall score only for
-    binary classification task.
+    By default this class manages the recall score for binary
+    classification task, multi-class recall is computed from a confusion
+    matrix when `average` is 'macro' or 'micro'.
 
     Args:
         name (str, optional): String name of the metric instance.
             Default is `recall`.
+        num_classes (int, optional): The number of classes, it is required
+            when `average` is 'macro' or 'micro'. Default is None.
+        average (str, optional): 'binary' for the recall of the positive
+            class, 'macro' for the unweighted mean of the per-class recall,
+            or 'micro' for the recall computed from the total counts of all
+            classes. Default is 'binary'.
 
     Example by standalone:
 
@@ -532,8 +674,15 @@ class Recall(Metric):
           model.fit(data, batch_size=16)
     """
 
-    def __init__(self, name='recall', *args, **kwargs):
+    def __init__(
+        self, name='recall', num_classes=None, average='binary', *args, **kwargs
+    ):
         super(Recall, self).__init__(*args, **kwargs)
+        _check_average(average, num_classes)
+        self._num_classes = num_classes
+        self._average = average
+        if average != 'binary':
+            self.confusion = np.zeros((num_classes, num_classes), 'int64')
         self.tp = 0  # true positive
         self.fn = 0  # false negative
         self._name = name
@@ -546,6 +695,9 @@ class Recall(Metric):
             preds(numpy.array): prediction results of current mini-batch,
                 the output of two-class sigmoid function.
                 Shape: [batch_size, 1]. Dtype: 'float64' or 'float32'.
+                When `average` is 'macro' or 'micro', it is either the
+                predicted class ids or the scores with shape
+                [batch_size, num_classes].
             labels(numpy.array): ground truth (labels) of current mini-batch,
                 the shape should keep the same as preds.
                 Shape: [batch_size, 1], Dtype: 'int32' or 'int64'.
@@ -560,17 +712,51 @@ class Recall(Metric):
         elif not _is_numpy_(labels):
             raise ValueError("The 'labels' must be a numpy ndarray or Tensor.")
 
+        if self._average != 'binary':
+            self.confusion += _confusion_matrix(
+                preds, labels, self._num_classes
+            )
+            return
+
         sample_num = labels.shape[0]
-        preds = np.rint(preds).astype("int32")
+        preds = np.rint(preds).astype("int32").reshape(sample_num)
+        labels = labels.reshape(sample_num)
+
+        pos = labels == 1
+        tp = int(np.count_nonzero(pos & (preds == 1)))
+        self.tp += tp
+        self.fn += int(np.count_nonzero(pos)) - tp
 
-        for i in range(sample_num):
-            pred = preds[i]
-            label = labels[i]
-            if label == 1:
-                if pred == label:
-                    self.tp += 1
-                else:
-                    self.fn += 1
+    def merge(self, other):
+        """
+        Merge the states of another Recall instance into this one, e.g.
+        the states accumulated by another worker or rank.
+
+        Args:
+            other (Recall): The metric instance to merge from.
+        """
+        if not isinstance(other, Recall):
+            raise TypeError(
+                "Can only merge a Recall, but got {}.".format(type(other))
+            )
+        if (
+            other._average != self._average
+            or other._num_classes != self._num_classes
+        ):
+            raise ValueError(
+                "Can not merge Recall with average '{}' and num_classes {} "
+                "into Recall with average '{}' and num_classes {}.".format(
+                    other._average,
+                    other._num_classes,
+                    self._average,
+                    self._num_classes,
+                )
+            )
+        if self._average != 'binary':
+            self.confusion += other.confusion
+            return
+        self.tp += other.tp
+        self.fn += other.fn
 
     def accumulate(self):
         """
@@ -579,6 +765,12 @@ class Recall(Metric):
         Returns:
             A scaler float: results of the calculated Recall.
         """
+        if self._average != 'binary':
+            return _average_score(
+                np.diag(self.confusion),
+                self.confusion.sum(axis=1),
+                self._average,
+            )
         recall = self.tp + self.fn
         return float(self.tp) / recall if recall != 0 else 0.0
 
@@ -588,6 +780,8 @@ class Recall(Metric):
         """
         self.tp = 0
         self.fn = 0
+        if self._average != 'binary':
+            self.confusion[...] = 0
 
     def name(self):
         """
@@ -600,7 +794,8 @@ class Auc(Metric):
     """
     The auc metric is for binary classification.
     Refer to https://en.wikipedia.org/wiki/Receiver_operating_characteristic#Area_under_the_curve.
-    Please notice that the auc metric is implemented with python, which may be a little bit slow.
+    The statistics of each mini-batch are bucketed in a vectorized way, and
+    instances accumulated on different workers can be combined by `merge`.
 
     The `auc` function creates four local variables, `true_positives`,
     `true_negatives`, `false_positives` and `false_negatives` that are used to
@@ -615,12 +810,9 @@ class Auc(Metric):
             'ROC' or 'PR' for the Precision-Recall-curve. Default is 'ROC'.
         num_thresholds (int): The number of thresholds to use when
             discretizing the roc curve. Default is 4095.
-            'ROC' or 'PR' for the Precision-Recall-curve. Default is 'ROC'.
         name (str, optional): String name of the metric instance. Default
             is `auc`.
 
-    "NOTE: only implement the ROC curve type via Python now."
-
     Example by standalone:
         .. code-block:: python
 
@@ -712,14 +904,42 @@ class Auc(Metric):
         elif not _is_numpy_(preds):
             raise ValueError("The 'preds' must be a numpy ndarray or Tensor.")
 
-        for i, lbl in enumerate(labels):
-            value = preds[i, 1]
-            bin_idx = int(value * self._num_thresholds)
-            assert bin_idx <= self._num_thresholds
-            if lbl:
-                self._stat_pos[bin_idx] += 1.0
-            else:
-                self._stat_neg[bin_idx] += 1.0
+        sample_num = labels.shape[0]
+        values = preds[:sample_num, 1]
+        bin_idx = (values * self._num_thresholds).astype("int64")
+        assert bin_idx.max(initial=0) <= self._num_thresholds
+        is_pos = labels.reshape(sample_num, -1)[:, 0] != 0
+
+        _num_pred_buckets = self._num_thresholds + 1
+        self._stat_pos += np.bincount(
+            bin_idx[is_pos], minlength=_num_pred_buckets
+        )
+        self._stat_neg += np.bincount(
+            bin_idx[~is_pos], minlength=_num_pred_buckets
+        )
+
+    def merge(self, other):
+        """
+        Merge the bucket statistics of another Auc instance into this one,
+        e.g. the states accumulated by another worker or rank.
+
+        Args:
+            other (Auc): The metric instance to merge from, it should be
+                created with the same `num_thresholds`.
+        """
+        if not isinstance(other, Auc):
+            raise TypeError(
+                "Can only merge an Auc, but got {}.".format(type(other))
+            )
+        if other._num_thresholds != self._num_thresholds:
+            raise ValueError(
+                "Can not merge Auc with num_thresholds {} into Auc with "
+                "num_thresholds {}.".format(
+                    other._num_thresholds, self._num_thresholds
+                )
+            )
+        self._stat_pos += other._stat_pos
+        self._stat_neg += other._stat_neg
 
     @staticmethod
     def trapezoid_area(x1, x2, y1, y2):
@@ -732,24 +952,39 @@ class Auc(Metric):
         Return:
             float: the area under auc curve
         """
-        tot_pos = 0.0
-        tot_neg = 0.0
-        auc = 0.0
-
-        idx = self._num_thresholds
-        while idx >= 0:
-            tot_pos_prev = tot_pos
-            tot_neg_prev = tot_neg
-            tot_pos += self._stat_pos[idx]
-            tot_neg += self._stat_neg[idx]
-            auc += self.trapezoid_area(
-                tot_neg, tot_neg_prev, tot_pos, tot_pos_prev
+        # accumulate from the highest threshold bucket to the lowest one
+        tot_pos = np.cumsum(self._stat_pos[::-1])
+        tot_neg = np.cumsum(self._stat_neg[::-1])
+        if tot_pos[-1] <= 0.0 or tot_neg[-1] <= 0.0:
+            return 0.0
+
+        if self._curve == 'PR':
+            # precision is defined as 1.0 before any instance is retrieved
+            predicted = tot_pos + tot_neg
+            precision = np.divide(
+                tot_pos,
+                predicted,
+                out=np.ones_like(tot_pos),
+                where=predicted > 0,
+            )
+            recall = tot_pos / tot_pos[-1]
+            precision = np.concatenate(([1.0], precision))
+            recall = np.concatenate(([0.0], recall))
+            return float(
+                np.sum(
+                    self.trapezoid_area(
+                        recall[1:], recall[:-1], precision[1:], precision[:-1]
+                    )
+                )
             )
-            idx -= 1
 
-        return (
-            auc / tot_pos / tot_neg if tot_pos > 0.0 and tot_neg > 0.0 else 0.0
+        tot_pos_prev = tot_pos - self._stat_pos[::-1]
+        auc = np.sum(
+            self.trapezoid_area(
+                tot_neg, tot_neg - self._stat_neg[::-1], tot_pos, tot_pos_prev
+            )
         )
+        return float(auc / tot_pos[-1] / tot_neg[-1])
 
     def reset(self):
         """
@@ -18,7 +18,8 @@ from .profiler import Profiler
 from .profiler import SummaryView
 from .profiler import TracerEventType
 from .utils import RecordEvent, load_profiler_result
-from .profiler_statistic import SortedKeys
+from .profiler_statistic import SortedKeys, StreamingSummary
+from .timer import StepTelemetry
 
 __all__ = [
     'ProfilerState',
@@ -31,4 +32,6 @@ __all__ = [
     'load_profiler_result',
     'SortedKeys',
     'SummaryView',
+    'StreamingSummary',
+    'StepTelemetry',
 ]
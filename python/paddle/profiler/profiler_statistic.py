@@ -13,6 +13,7 @@
 # limitations under the License.
 import collections
 from enum import Enum
+import math
 import re
 
 from paddle.fluid.core import TracerEventType, TracerMemEventType
@@ -44,6 +45,14 @@ _AllTracerEventType = [
 
 _CommunicationOpName = ['allreduce', 'broadcast', 'rpc']
 
+_ModelPerspectiveEventName = {
+    TracerEventType.ProfileStep: 'ProfileStep',
+    TracerEventType.Dataloader: 'Dataloader',
+    TracerEventType.Forward: 'Forward',
+    TracerEventType.Backward: 'Backward',
+    TracerEventType.Optimization: 'Optimization',
+}
+
 
 class SortedKeys(Enum):
     r"""
@@ -771,6 +780,316 @@ class StatisticData:
         self.memory_summary.parse(node_trees)
 
 
+class QuantileSketch:
+    r"""
+    Mergeable sketch to estimate quantiles of non-negative values with bounded
+    memory. Values are counted in logarithmic buckets, so the estimated
+    quantile is within `relative_accuracy` of the exact one, as long as the
+    number of buckets does not exceed `max_buckets`, beyond which the lowest
+    buckets are collapsed.
+    """
+
+    def __init__(self, relative_accuracy=0.01, max_buckets=2048):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets = collections.defaultdict(int)
+        self._zero_count = 0
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.min = float('inf')
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        if value < self.min:
+            self.min = value
+        if value <= 0:
+            self._zero_count += 1
+            return
+        self._buckets[int(math.ceil(math.log(value) / self._log_gamma))] += 1
+        if len(self._buckets) > self.max_buckets:
+            self._collapse()
+
+    def merge(self, other):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError(
+                "Can not merge QuantileSketch with different relative_accuracy."
+            )
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        self.min = min(self.min, other.min)
+        self._zero_count += other._zero_count
+        for index, count in other._buckets.items():
+            self._buckets[index] += count
+        while len(self._buckets) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self):
+        # merge the lowest bucket into the next one
+        indices = sorted(self._buckets)
+        self._buckets[indices[1]] += self._buckets.pop(indices[0])
+
+    @property
+    def avg(self):
+        return self.total / self.count if self.count else 0
+
+    def quantile(self, q):
+        if self.count == 0:
+            return 0
+        rank = q * (self.count - 1)
+        seen = self._zero_count
+        if rank < seen:
+            return 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if rank < seen:
+                value = 2 * self._gamma**index / (self._gamma + 1)
+                # the estimation never goes beyond the observed range
+                return min(max(value, self.min), self.max)
+        return self.max
+
+
+class StreamingSummary:
+    r"""
+    Fold the profiling result of each record period into running statistics,
+    so that the event trees can be released once they are summarized, and
+    summarizing a long profiling window does not need to keep all the events.
+
+    It is used as ``on_trace_ready`` of :ref:`Profiler <api_paddle_profiler_Profiler>` ,
+    and keeps the number of calls, total, average, max, min and the quantiles
+    (p50 and p99 by default) of CPU and GPU time for each operator, kernel,
+    user defined event and model perspective event (ProfileStep, Dataloader,
+    Forward, Backward and Optimization).
+
+    Args:
+        on_trace_ready(Callable, optional): Callable object called after the
+            profiling result is folded, such as the return value of
+            :ref:`export_chrome_tracing <api_paddle_profiler_export_chrome_tracing>` . Default: None.
+        quantiles(list[float], optional): Quantiles to print in the summary table.
+            Default: [0.5, 0.99].
+        relative_accuracy(float, optional): Relative accuracy of the estimated
+            quantiles. Default: 0.01.
+
+    Examples:
+        .. code-block:: python
+
+            # required: gpu
+            import paddle.profiler as profiler
+            summary = profiler.StreamingSummary()
+            # fold the result of every step, and keep no event trees
+            with profiler.Profiler(
+                    targets=[profiler.ProfilerTarget.CPU, profiler.ProfilerTarget.GPU],
+                    scheduler=profiler.make_scheduler(closed=0, ready=0, record=1),
+                    on_trace_ready=summary) as p:
+                for iter in range(1000):
+                    #train()
+                    p.step()
+            summary.summary(time_unit='ms')
+    """
+
+    class Item:
+        def __init__(self, name, relative_accuracy):
+            self.name = name
+            self.cpu_time = QuantileSketch(relative_accuracy)
+            self.gpu_time = QuantileSketch(relative_accuracy)
+
+        @property
+        def call(self):
+            return max(self.cpu_time.count, self.gpu_time.count)
+
+    def __init__(
+        self, on_trace_ready=None, quantiles=(0.5, 0.99), relative_accuracy=0.01
+    ):
+        self.on_trace_ready = on_trace_ready
+        self.quantiles = list(quantiles)
+        self.relative_accuracy = relative_accuracy
+        self.reset()
+
+    def reset(self):
+        r"""
+        Clear all the folded statistics.
+        """
+        self.operator_items = {}
+        self.kernel_items = {}
+        self.userdefined_items = {}
+        self.model_perspective_items = {}
+        self.num_results = 0
+
+    def __call__(self, prof):
+        if prof.profiler_result:
+            self.add_nodetrees(prof.profiler_result.get_data())
+        if self.on_trace_ready:
+            self.on_trace_ready(prof)
+
+    def _get_item(self, items, name):
+        if name not in items:
+            items[name] = StreamingSummary.Item(name, self.relative_accuracy)
+        return items[name]
+
+    def add_nodetrees(self, nodetrees):
+        r"""
+        Fold the event trees of one profiling result into the statistics.
+        """
+        self.num_results += 1
+        for rootnode in nodetrees.values():
+            self._fold_tree(rootnode)
+
+    def _fold_tree(self, rootnode):
+        # post-order traversal, kernel time of a host node includes the
+        # kernels launched by all of its descendants, and only the outermost
+        # model perspective events are counted, the same as EventSummary
+        gpu_times = {}
+        stack = [(rootnode, False, False)]
+        while stack:
+            node, visited, in_model_perspective = stack.pop()
+            if not visited:
+                stack.append((node, True, in_model_perspective))
+                child_in_model_perspective = in_model_perspective or (
+                    node.type in _ModelPerspectiveEventName
+                    and node.type != TracerEventType.ProfileStep
+                )
+                for child in node.children_node:
+                    stack.append((child, False, child_in_model_perspective))
+                continue
+
+            gpu_time = 0
+            for child in node.children_node:
+                gpu_time += gpu_times.pop(id(child))
+            for runtimenode in node.runtime_node:
+                for devicenode in runtimenode.device_node:
+                    if devicenode.type != TracerEventType.Kernel:
+                        continue
+                    kernel_time = devicenode.end_ns - devicenode.start_ns
+                    gpu_time += kernel_time
+                    self._get_item(
+                        self.kernel_items, devicenode.name
+                    ).gpu_time.add(kernel_time)
+            gpu_times[id(node)] = gpu_time
+
+            if node is rootnode:
+                continue
+            if node.type == TracerEventType.Operator:
+                items = self.operator_items
+                name = node.name
+            elif node.type == TracerEventType.PythonUserDefined:
+                items = self.userdefined_items
+                name = node.name
+            elif (
+                node.type in _ModelPerspectiveEventName
+                and not in_model_perspective
+            ):
+                items = self.model_perspective_items
+                name = _ModelPerspectiveEventName[node.type]
+            else:
+                continue
+            item = self._get_item(items, name)
+            item.cpu_time.add(node.end_ns - node.start_ns)
+            item.gpu_time.add(gpu_time)
+
+    def summary(self, sorted_by=SortedKeys.CPUTotal, time_unit='ms'):
+        r"""
+        Print the summary tables of the folded statistics.
+
+        Args:
+            sorted_by( :ref:`SortedKeys <api_paddle_profiler_SortedKeys>` , optional): how to rank the table items, default value is SortedKeys.CPUTotal.
+            time_unit(str, optional): time unit for display, can be chosen form ['s', 'ms', 'us', 'ns'], default value is 'ms'.
+        """
+        print(self._build_table(sorted_by, time_unit))
+
+    def _build_table(self, sorted_by=SortedKeys.CPUTotal, time_unit='ms'):
+        def format_time(time):
+            if time == float('inf'):
+                return '-'
+            result = float(time)
+            if time_unit == 's':
+                result /= 1e9
+            elif time_unit == 'ms':
+                result /= 1e6
+            elif time_unit == 'us':
+                result /= 1e3
+            return '{:.2f}'.format(result)
+
+        def format_sketch(sketch):
+            values = [sketch.total, sketch.avg]
+            values += [sketch.quantile(q) for q in self.quantiles]
+            values += [sketch.max, sketch.min]
+            return ' / '.join(format_time(v) for v in values)
+
+        sort_keys = {
+            SortedKeys.CPUTotal: lambda item: -item.cpu_time.total,
+            SortedKeys.CPUAvg: lambda item: -item.cpu_time.avg,
+            SortedKeys.CPUMax: lambda item: -item.cpu_time.max,
+            SortedKeys.CPUMin: lambda item: item.cpu_time.min,
+            SortedKeys.GPUTotal: lambda item: -item.gpu_time.total,
+            SortedKeys.GPUAvg: lambda item: -item.gpu_time.avg,
+            SortedKeys.GPUMax: lambda item: -item.gpu_time.max,
+            SortedKeys.GPUMin: lambda item: item.gpu_time.min,
+        }
+        quantile_names = ' / '.join(
+            'P{:g}'.format(q * 100) for q in self.quantiles
+        )
+        time_header = 'Total / Avg / {} / Max / Min'.format(quantile_names)
+
+        result = []
+        tables = [
+            ('Model Summary', self.model_perspective_items, True),
+            ('Operator Summary', self.operator_items, True),
+            ('UserDefined Summary', self.userdefined_items, True),
+            ('Kernel Summary', self.kernel_items, False),
+        ]
+        for title, items, with_cpu in tables:
+            if not items:
+                continue
+            sort_key = sort_keys[sorted_by]
+            if not with_cpu:
+                sort_key = sort_keys[
+                    SortedKeys(sorted_by.value % 4 + SortedKeys.GPUTotal.value)
+                ]
+            headers = ['Name', 'Calls']
+            if with_cpu:
+                headers.append('CPU ' + time_header)
+            headers.append('GPU ' + time_header)
+            all_row_values = []
+            for item in sorted(items.values(), key=sort_key):
+                row_values = [item.name, item.call]
+                if with_cpu:
+                    row_values.append(format_sketch(item.cpu_time))
+                row_values.append(format_sketch(item.gpu_time))
+                all_row_values.append(row_values)
+
+            widths = [
+                max(len(str(row[i])) for row in all_row_values + [headers])
+                for i in range(len(headers))
+            ]
+            widths[0] = min(widths[0], 75)
+            row_format = '  '.join('{:<' + str(w) + '}' for w in widths)
+            header_sep = '  '.join('-' * w for w in widths)
+            line_length = len(header_sep)
+            left_length = line_length - len(title)
+            result.append(
+                '-' * (left_length // 2)
+                + title
+                + '-' * (left_length - left_length // 2)
+            )
+            result.append('Time unit: {}'.format(time_unit))
+            result.append(header_sep)
+            result.append(row_format.format(*headers))
+            result.append(header_sep)
+            for row_values in all_row_values:
+                if len(row_values[0]) > widths[0]:
+                    row_values[0] = row_values[0][: widths[0] - 3] + '...'
+                result.append(row_format.format(*row_values))
+            result.append(header_sep)
+            result.append('')
+        return '\n'.join(result)
+
+
 def _build_table(
     statistic_data,
     sorted_by=SortedKeys.CPUTotal,
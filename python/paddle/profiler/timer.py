@@ -12,9 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 import timeit
 from collections import OrderedDict
 
+import numpy as np
+
 
 class Stack(object):
     """
@@ -299,6 +302,260 @@ class TimerHook(Hook):
         )
 
 
+class _PhaseTimer(object):
+    """
+    Context manager accumulating the elapsed time into one phase of the
+    current step of StepTelemetry.
+    """
+
+    def __init__(self, telemetry, index):
+        self._telemetry = telemetry
+        self._index = index
+        self._start = 0
+
+    def __enter__(self):
+        self._start = timeit.default_timer()
+        return self
+
+    def __exit__(self, *args):
+        self._telemetry._current[self._index] += (
+            timeit.default_timer() - self._start
+        )
+
+
+class StepTelemetry(Hook):
+    """
+    Low overhead telemetry of training steps, which can be kept enabled in
+    production. The time of each step is broken down into phases and kept in
+    a ring buffer of the latest `capacity` steps, so rolling percentiles can
+    be queried in-process, and exported as Prometheus text format or JSON
+    lines.
+
+    The time of waiting for the DataLoader is recorded into the `dataloader`
+    phase automatically after `attach` is called, other phases are recorded
+    by `phase` or `record`. A step is finished by `step`, which is also
+    called by `paddle.profiler.Profiler.step` when it is attached.
+
+    Args:
+        capacity(int, optional): The number of latest steps kept. Default: 1024.
+        phases(list[str], optional): The names of phases. Default:
+            ['dataloader', 'h2d', 'forward', 'backward', 'optimizer', 'collective'].
+
+    Examples:
+        .. code-block:: python
+
+            import paddle
+            from paddle.profiler import StepTelemetry
+
+            telemetry = StepTelemetry(capacity=100)
+            telemetry.attach()
+            linear = paddle.nn.Linear(10, 1)
+            opt = paddle.optimizer.SGD(parameters=linear.parameters())
+            for i in range(10):
+                with telemetry.phase('forward'):
+                    loss = linear(paddle.randn([4, 10])).mean()
+                with telemetry.phase('backward'):
+                    loss.backward()
+                with telemetry.phase('optimizer'):
+                    opt.step()
+                    opt.clear_grad()
+                telemetry.step(num_samples=4)
+            print(telemetry.percentiles())
+            print(telemetry.to_prometheus())
+            telemetry.detach()
+    """
+
+    DEFAULT_PHASES = (
+        'dataloader',
+        'h2d',
+        'forward',
+        'backward',
+        'optimizer',
+        'collective',
+    )
+
+    def __init__(self, capacity=1024, phases=None):
+        if capacity <= 0:
+            raise ValueError(
+                "capacity of StepTelemetry should be positive, but got {}".format(
+                    capacity
+                )
+            )
+        self.capacity = capacity
+        self.phases = list(phases or self.DEFAULT_PHASES)
+        self._phase_index = {name: i for i, name in enumerate(self.phases)}
+        self._phase_timers = {
+            name: _PhaseTimer(self, i) for i, name in enumerate(self.phases)
+        }
+        self.reset()
+
+    def reset(self):
+        """
+        Clear all the recorded steps.
+        """
+        # columns: phases..., step time
+        num_columns = len(self.phases) + 1
+        self._times = np.zeros([self.capacity, num_columns], dtype='float64')
+        self._samples = np.zeros([self.capacity], dtype='float64')
+        self._timestamps = np.zeros([self.capacity], dtype='float64')
+        self._totals = [0.0] * num_columns
+        self._total_samples = 0
+        self._current = [0.0] * len(self.phases)
+        self.num_steps = 0
+        self._step_start = timeit.default_timer()
+        self._reader_start = None
+
+    def attach(self):
+        """
+        Register the telemetry to the benchmark hooks called by DataLoader and
+        `paddle.profiler.Profiler.step`.
+        """
+        benchmark().hooks['step_telemetry'] = self
+
+    def detach(self):
+        """
+        Unregister the telemetry from the benchmark hooks.
+        """
+        hooks = benchmark().hooks
+        if hooks.get('step_telemetry') is self:
+            hooks.pop('step_telemetry')
+
+    def phase(self, name):
+        """
+        Return a context manager accumulating the elapsed time into the
+        phase `name` of the current step.
+        """
+        return self._phase_timers[name]
+
+    def record(self, name, seconds):
+        """
+        Accumulate `seconds` into the phase `name` of the current step.
+        """
+        self._current[self._phase_index[name]] += seconds
+
+    def step(self, num_samples=None):
+        """
+        Finish the current step. The step time is the elapsed time since the
+        end of the last step.
+        """
+        now = timeit.default_timer()
+        slot = self.num_steps % self.capacity
+        row = self._times[slot]
+        row[:-1] = self._current
+        row[-1] = now - self._step_start
+        self._samples[slot] = num_samples or 0
+        self._timestamps[slot] = now
+        for i, value in enumerate(row):
+            self._totals[i] += value
+        self._total_samples += num_samples or 0
+        self._current = [0.0] * len(self.phases)
+        self.num_steps += 1
+        self._step_start = now
+
+    # hooks called by Benchmark
+    def before_reader(self, benchmark):
+        self._reader_start = timeit.default_timer()
+
+    def after_reader(self, benchmark):
+        if self._reader_start is not None and 'dataloader' in self._phase_index:
+            self._current[self._phase_index['dataloader']] += (
+                timeit.default_timer() - self._reader_start
+            )
+        self._reader_start = None
+
+    def after_step(self, benchmark):
+        self.step(benchmark.num_samples)
+
+    def _window_rows(self, array):
+        # recorded rows in chronological order
+        if self.num_steps <= self.capacity:
+            return array[: self.num_steps]
+        start = self.num_steps % self.capacity
+        return np.concatenate([array[start:], array[:start]])
+
+    def percentiles(self, q=(50, 90, 99)):
+        """
+        Return the rolling percentiles (in seconds) over the latest steps of
+        every phase and the whole step, as a dict like
+        ``{'step': {'p50': ..., 'p90': ..., 'p99': ...}, 'forward': {...}}``.
+        """
+        times = self._window_rows(self._times)
+        names = self.phases + ['step']
+        result = OrderedDict()
+        if len(times) == 0:
+            return result
+        values = np.percentile(times, q, axis=0)
+        for i, name in enumerate(names):
+            result[name] = OrderedDict(
+                ('p{:g}'.format(p), float(values[j][i]))
+                for j, p in enumerate(q)
+            )
+        return result
+
+    def get_records(self):
+        """
+        Return the latest steps as a list of dict, in chronological order.
+        """
+        times = self._window_rows(self._times)
+        samples = self._window_rows(self._samples)
+        timestamps = self._window_rows(self._timestamps)
+        first_step = max(self.num_steps - self.capacity, 0)
+        records = []
+        for i in range(len(times)):
+            record = OrderedDict(step=first_step + i)
+            record['timestamp'] = float(timestamps[i])
+            record['num_samples'] = float(samples[i])
+            record['step_time'] = float(times[i][-1])
+            for j, name in enumerate(self.phases):
+                record[name] = float(times[i][j])
+            records.append(record)
+        return records
+
+    def to_json_lines(self):
+        """
+        Return the latest steps as JSON lines, one step per line.
+        """
+        return ''.join(
+            json.dumps(record) + '\n' for record in self.get_records()
+        )
+
+    def to_prometheus(self, prefix='paddle_step', q=(50, 90, 99)):
+        """
+        Return the telemetry in Prometheus text exposition format. Quantiles
+        are computed over the latest steps, while sum and count are
+        accumulated over all the steps.
+        """
+        percentiles = self.percentiles(q)
+        names = self.phases + ['step']
+        metric = '{}_phase_seconds'.format(prefix)
+        lines = [
+            '# HELP {} Time of each phase of training steps.'.format(metric),
+            '# TYPE {} summary'.format(metric),
+        ]
+        for i, name in enumerate(names):
+            for p in q:
+                value = (
+                    percentiles[name]['p{:g}'.format(p)] if percentiles else 0
+                )
+                lines.append(
+                    '{}{{phase="{}",quantile="{:g}"}} {!r}'.format(
+                        metric, name, p / 100.0, value
+                    )
+                )
+            lines.append(
+                '{}_sum{{phase="{}"}} {!r}'.format(
+                    metric, name, float(self._totals[i])
+                )
+            )
+            lines.append(
+                '{}_count{{phase="{}"}} {}'.format(metric, name, self.num_steps)
+            )
+        samples = '{}_samples_total'.format(prefix)
+        lines.append('# TYPE {} counter'.format(samples))
+        lines.append('{} {!r}'.format(samples, float(self._total_samples)))
+        return '\n'.join(lines) + '\n'
+
+
 class TimeAverager(object):
     """
     Record the cost of every step and count the average.
@@ -13,9 +13,12 @@
 # limitations under the License.
 
 from threading import Thread
+import threading
 import multiprocessing
+import queue
 import six
 import sys
+import traceback
 import warnings
 import logging
 
@@ -23,9 +26,16 @@ from queue import Queue
 from itertools import zip_longest
 
 import itertools
+import mmap
+import pickle
 import random
+import struct
+import tempfile
+
+import numpy as np
 
 from paddle.fluid.reader import QUEUE_GET_TIMEOUT
+from paddle.fluid.multiprocess_utils import MP_STATUS_CHECK_INTERVAL
 
 __all__ = []
 
@@ -45,7 +55,151 @@ else:
     fork_context = multiprocessing
 
 
-def cache(reader):
+class _SpillFile(object):
+    """
+    An append-only temporary file of serialized samples. A sample is a
+    tuple, a list or a single field, numpy array fields are written as raw
+    bytes and read back as views of the memory-mapped file, other fields
+    are pickled.
+    """
+
+    _ALIGNMENT = 16
+
+    def __init__(self, spill_dir=None):
+        self._file = tempfile.TemporaryFile(dir=spill_dir)
+        self._size = 0
+        self._mmap = None
+
+    @property
+    def size(self):
+        return self._size
+
+    def _write(self, data):
+        self._file.write(data)
+        self._size += len(data)
+
+    def _write_field(self, field):
+        if isinstance(field, np.ndarray) and not field.dtype.hasobject:
+            dtype = field.dtype.str.encode()
+            self._write(b'N' + struct.pack('<B', len(dtype)) + dtype)
+            self._write(struct.pack('<B', field.ndim))
+            self._write(struct.pack('<%dq' % field.ndim, *field.shape))
+            self._write(b'\0' * (-self._size % self._ALIGNMENT))
+            self._write(np.ascontiguousarray(field).reshape(-1).view(np.uint8))
+        else:
+            data = pickle.dumps(field, protocol=pickle.HIGHEST_PROTOCOL)
+            self._write(b'P' + struct.pack('<Q', len(data)))
+            self._write(data)
+
+    def append(self, sample):
+        """
+        Append sample and return the offset of it.
+        """
+        assert self._mmap is None, "cannot append to a mapped _SpillFile"
+        offset = self._size
+        if isinstance(sample, (tuple, list)):
+            kind = b'T' if isinstance(sample, tuple) else b'L'
+            fields = sample
+        else:
+            kind, fields = b'S', [sample]
+        self._write(kind + struct.pack('<I', len(fields)))
+        for field in fields:
+            self._write_field(field)
+        return offset
+
+    def _map(self):
+        if self._mmap is None and self._size > 0:
+            self._file.flush()
+            self._mmap = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        return self._mmap
+
+    def _read_field(self, buf, offset):
+        tag = buf[offset : offset + 1]
+        offset += 1
+        if tag == b'N':
+            (length,) = struct.unpack_from('<B', buf, offset)
+            offset += 1
+            dtype = np.dtype(bytes(buf[offset : offset + length]).decode())
+            offset += length
+            (ndim,) = struct.unpack_from('<B', buf, offset)
+            offset += 1
+            shape = struct.unpack_from('<%dq' % ndim, buf, offset)
+            offset += 8 * ndim
+            offset += -offset % self._ALIGNMENT
+            count = int(np.prod(shape, dtype='int64'))
+            field = np.frombuffer(
+                buf, dtype=dtype, count=count, offset=offset
+            ).reshape(shape)
+            return field, offset + count * dtype.itemsize
+        (length,) = struct.unpack_from('<Q', buf, offset)
+        offset += 8
+        return pickle.loads(buf[offset : offset + length]), offset + length
+
+    def read(self, offset):
+        """
+        Read the sample at offset, return the sample and the offset of
+        the next sample.
+        """
+        buf = self._map()
+        kind = buf[offset : offset + 1]
+        (num,) = struct.unpack_from('<I', buf, offset + 1)
+        offset += 5
+        fields = []
+        for _ in range(num):
+            field, offset = self._read_field(buf, offset)
+            fields.append(field)
+        if kind == b'T':
+            return tuple(fields), offset
+        if kind == b'L':
+            return fields, offset
+        return fields[0], offset
+
+    def iter_from(self, offset=0, end=None):
+        end = self._size if end is None else end
+        while offset < end:
+            sample, offset = self.read(offset)
+            yield sample
+
+
+class _FenwickTree(object):
+    def __init__(self, values):
+        self._size = len(values)
+        self._tree = [0] * (self._size + 1)
+        for i, v in enumerate(values):
+            self.add(i, v)
+
+    def add(self, idx, delta):
+        idx += 1
+        while idx <= self._size:
+            self._tree[idx] += delta
+            idx += idx & -idx
+
+    def find(self, k):
+        """
+        Return the smallest index whose prefix sum is greater than k.
+        """
+        idx = 0
+        step = 1 << self._size.bit_length()
+        while step:
+            nxt = idx + step
+            if nxt <= self._size and self._tree[nxt] <= k:
+                idx = nxt
+                k -= self._tree[nxt]
+            step >>= 1
+        return idx
+
+
+def _sample_nbytes(sample):
+    fields = sample if isinstance(sample, (tuple, list)) else [sample]
+    return sum(
+        f.nbytes if isinstance(f, np.ndarray) else sys.getsizeof(f)
+        for f in fields
+    )
+
+
+def cache(reader, memory_limit=None, spill_dir=None):
     """
     Cache the reader data into memory.
 
@@ -53,9 +207,19 @@ def cache(reader):
     and consume lots of memory. :code:`reader()` would only
     call once.
 
+    If ``memory_limit`` is set, samples are held in memory until their
+    total size exceeds ``memory_limit`` bytes, and the following samples
+    are spilled to a temporary file in ``spill_dir``. Numpy array fields
+    of spilled samples are stored as raw bytes and read back as read-only
+    views of the memory-mapped file.
+
     Args:
         reader (generator): a reader object which yields
             data each time.
+        memory_limit (int, optional): the max size in bytes of samples
+            cached in memory, None for no limit. Default None.
+        spill_dir (str, optional): the directory of the spill file, None
+            for the default temporary directory. Default None.
 
     Returns:
         generator: a decorated reader object which yields data from cached memory.
@@ -76,13 +240,35 @@ def cache(reader):
             for i in cached_reader():
                 print(i)
     """
-    all_data = tuple(reader())
-
-    def __impl__():
+    if memory_limit is None:
+        all_data = tuple(reader())
+
+        def __impl__():
+            for item in all_data:
+                yield item
+
+        return __impl__
+
+    all_data = []
+    spill_file = None
+    nbytes = 0
+    for item in reader():
+        if spill_file is None:
+            nbytes += _sample_nbytes(item)
+            if nbytes <= memory_limit:
+                all_data.append(item)
+                continue
+            spill_file = _SpillFile(spill_dir)
+        spill_file.append(item)
+
+    def __spill_impl__():
         for item in all_data:
             yield item
+        if spill_file is not None:
+            for item in spill_file.iter_from():
+                yield item
 
-    return __impl__
+    return __spill_impl__
 
 
 def map_readers(func, *readers):
@@ -127,7 +313,7 @@ def map_readers(func, *readers):
     return reader
 
 
-def shuffle(reader, buf_size):
+def shuffle(reader, buf_size, two_level=False, spill_dir=None):
     """
     paddle.fluid.io.shuffle ( :ref:`api_fluid_io_shuffle` ) is recommended to use,
     and paddle.reader.shuffle is an alias.
@@ -137,9 +323,20 @@ def shuffle(reader, buf_size):
     The output data from the origin reader will be saved into a buffer,
     and then shuffle the data. The size of buffer is determined by argument buf_size.
 
+    If ``two_level`` is True, each shuffled buffer is written as a chunk
+    into a temporary file in ``spill_dir`` at first, then samples are read
+    from randomly chosen chunks, with the probability proportional to the
+    number of samples left in the chunk. It shuffles across the whole data
+    with memory bounded by ``buf_size``, at the cost of writing the data
+    to disk once every pass.
+
     Args:
         reader(callable): the original reader whose data will be shuffled.
         buf_size(int): the size of shuffled buffer.
+        two_level(bool): whether to shuffle across buffers with on-disk
+            chunks. Default False.
+        spill_dir(str): the directory of the temporary file of chunks, None
+            for the default temporary directory. Default None.
 
     Returns:
         callable: a decorated reader.
@@ -173,7 +370,36 @@ def shuffle(reader, buf_size):
             for b in buf:
                 yield b
 
-    return data_reader
+    def two_level_reader():
+        end = object()
+        spill_file = _SpillFile(spill_dir)
+        offsets = []
+        counts = []
+        buf = []
+        for e in itertools.chain(reader(), [end]):
+            if e is not end:
+                buf.append(e)
+                if len(buf) < buf_size:
+                    continue
+            if not buf:
+                break
+            random.shuffle(buf)
+            offsets.append(spill_file.size)
+            counts.append(len(buf))
+            for b in buf:
+                spill_file.append(b)
+            buf = []
+
+        # pick a chunk with probability proportional to its samples left,
+        # the numbers of samples left are kept in a Fenwick tree
+        tree = _FenwickTree(counts)
+        for remain in range(sum(counts), 0, -1):
+            idx = tree.find(random.randrange(remain))
+            tree.add(idx, -1)
+            b, offsets[idx] = spill_file.read(offsets[idx])
+            yield b
+
+    return two_level_reader if two_level else data_reader
 
 
 def chain(*readers):
@@ -406,98 +632,183 @@ class XmapEndSignal:
     pass
 
 
-def xmap_readers(mapper, reader, process_num, buffer_size, order=False):
+class _XmapWorkerError:
+    def __init__(self, message):
+        self.message = message
+
+
+def xmap_readers(
+    mapper,
+    reader,
+    process_num,
+    buffer_size,
+    order=False,
+    use_process=False,
+    chunk_size=1,
+):
     """
-    Use multi-threads to map samples from reader by a mapper defined by user.
+    Use multi-threads or multi-processes to map samples from reader by a
+    mapper defined by user.
+
+    Samples are sent to workers in chunks of ``chunk_size`` samples. At
+    most ``buffer_size // chunk_size + process_num`` chunks are in flight,
+    that is read from reader but not yielded yet. If ``order`` is True,
+    mapped chunks are held in a reorder buffer keyed by the sequence
+    number until all previous chunks are yielded.
 
     Args:
         mapper (callable): a function to map the data from reader.
         reader (callable): a data reader which yields the data.
-        process_num (int): thread number to handle original sample.
+        process_num (int): thread or process number to handle original sample.
         buffer_size (int): size of the queue to read data in.
         order (bool): whether to keep the data order from original reader.
             Default False.
+        use_process (bool): whether to map samples in subprocesses instead
+            of threads, which avoids the GIL for Python-heavy mappers.
+            Samples and mapped samples are pickled between processes, and
+            it is not supported on Windows. Default False.
+        chunk_size (int): the number of samples sent to a worker at a time,
+            a larger value amortizes the inter-process communication cost.
+            Default 1.
 
     Returns:
         callable: a decorated reader with data mapping.
     """
+    assert process_num > 0, "process_num should be a positive value"
+    assert chunk_size > 0, "chunk_size should be a positive value"
+    if use_process and sys.platform == 'win32':
+        raise NotImplementedError(
+            "xmap_readers with use_process=True is not supported on windows."
+        )
+
     end = XmapEndSignal()
+    window_size = max(buffer_size // chunk_size, 1) + process_num
 
-    # define a worker to read samples from reader to in_queue
-    def read_worker(reader, in_queue):
-        for i in reader():
-            in_queue.put(i)
-        in_queue.put(end)
-
-    # define a worker to read samples from reader to in_queue with order flag
-    def order_read_worker(reader, in_queue):
-        in_order = 0
-        for i in reader():
-            in_queue.put((in_order, i))
-            in_order += 1
-        in_queue.put(end)
-
-    # define a worker to handle samples from in_queue by mapper
-    # and put mapped samples into out_queue
+    # define a worker to read samples from reader into in_queue in chunks,
+    # the number of chunks is put into out_queue at the end
+    def read_worker(reader, in_queue, out_queue, window, stop):
+        chunk_num = 0
+        try:
+            chunk = []
+            for sample in itertools.chain(reader(), [end]):
+                if not isinstance(sample, XmapEndSignal):
+                    chunk.append(sample)
+                    if len(chunk) < chunk_size:
+                        continue
+                elif not chunk:
+                    break
+                # wait until an in-flight chunk is yielded
+                while not window.acquire(timeout=0.1):
+                    if stop.is_set():
+                        return
+                in_queue.put((chunk_num, chunk))
+                chunk_num += 1
+                chunk = []
+        except Exception:
+            out_queue.put((chunk_num, _XmapWorkerError(traceback.format_exc())))
+        finally:
+            for _ in range(process_num):
+                in_queue.put(end)
+        out_queue.put((chunk_num, end))
+
+    # define a worker to handle chunks from in_queue by mapper
+    # and put mapped chunks into out_queue with the sequence number
     def handle_worker(in_queue, out_queue, mapper):
-        sample = in_queue.get()
-        while not isinstance(sample, XmapEndSignal):
-            r = mapper(sample)
-            out_queue.put(r)
-            sample = in_queue.get()
-        in_queue.put(end)
-        out_queue.put(end)
-
-    # define a worker to handle samples from in_queue by mapper
-    # and put mapped samples into out_queue by order
-    def order_handle_worker(in_queue, out_queue, mapper, out_order):
         ins = in_queue.get()
         while not isinstance(ins, XmapEndSignal):
-            order, sample = ins
-            r = mapper(sample)
-            while order != out_order[0]:
-                pass
-            out_queue.put(r)
-            out_order[0] += 1
+            seq, chunk = ins
+            try:
+                out = [mapper(sample) for sample in chunk]
+            except Exception:
+                out = _XmapWorkerError(traceback.format_exc())
+            out_queue.put((seq, out))
             ins = in_queue.get()
-        in_queue.put(end)
-        out_queue.put(end)
+
+    def get_result(out_queue, workers):
+        if not use_process:
+            return out_queue.get()
+        while True:
+            try:
+                return out_queue.get(timeout=MP_STATUS_CHECK_INTERVAL)
+            except queue.Empty:
+                for w in workers:
+                    if w.exitcode is not None and w.exitcode != 0:
+                        raise RuntimeError(
+                            "xmap_readers worker (pid: {}) exited "
+                            "unexpectedly with code {}".format(
+                                w.pid, w.exitcode
+                            )
+                        )
 
     def xreader():
-        in_queue = Queue(buffer_size)
-        out_queue = Queue(buffer_size)
-        out_order = [0]
-        # start a read worker in a thread
-        target = order_read_worker if order else read_worker
-        t = Thread(target=target, args=(reader, in_queue))
-        t.daemon = True
-        t.start()
-        # start several handle_workers
-        target = order_handle_worker if order else handle_worker
-        args = (
-            (in_queue, out_queue, mapper, out_order)
-            if order
-            else (in_queue, out_queue, mapper)
-        )
+        if use_process:
+            in_queue = fork_context.Queue()
+            out_queue = fork_context.Queue()
+            worker_cls = fork_context.Process
+        else:
+            in_queue = Queue()
+            out_queue = Queue()
+            worker_cls = Thread
+        window = threading.Semaphore(window_size)
+        stop = threading.Event()
+
+        # start workers before the read thread, for forking with
+        # running threads is unsafe
         workers = []
         for i in range(process_num):
-            worker = Thread(target=target, args=args)
+            worker = worker_cls(
+                target=handle_worker, args=(in_queue, out_queue, mapper)
+            )
             worker.daemon = True
             workers.append(worker)
         for w in workers:
             w.start()
 
-        sample = out_queue.get()
-        while not isinstance(sample, XmapEndSignal):
-            yield sample
-            sample = out_queue.get()
-        finish = 1
-        while finish < process_num:
-            sample = out_queue.get()
-            if isinstance(sample, XmapEndSignal):
-                finish += 1
+        t = Thread(
+            target=read_worker,
+            args=(reader, in_queue, out_queue, window, stop),
+        )
+        t.daemon = True
+        t.start()
+
+        chunk_num = None
+        received = 0
+        next_seq = 0
+        reorder_buffer = {}
+        try:
+            while chunk_num is None or received < chunk_num:
+                seq, out = get_result(out_queue, workers)
+                if isinstance(out, XmapEndSignal):
+                    chunk_num = seq
+                    continue
+                if isinstance(out, _XmapWorkerError):
+                    raise RuntimeError(
+                        "xmap_readers failed to map samples:\n" + out.message
+                    )
+                received += 1
+                if not order:
+                    window.release()
+                    for sample in out:
+                        yield sample
+                    continue
+                reorder_buffer[seq] = out
+                while next_seq in reorder_buffer:
+                    out = reorder_buffer.pop(next_seq)
+                    next_seq += 1
+                    window.release()
+                    for sample in out:
+                        yield sample
+        finally:
+            stop.set()
+            if use_process:
+                for w in workers:
+                    if w.is_alive():
+                        w.terminate()
+                for w in workers:
+                    w.join()
             else:
-                yield sample
+                for _ in range(process_num):
+                    in_queue.put(end)
 
     return xreader
 
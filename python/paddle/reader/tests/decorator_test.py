@@ -17,6 +17,8 @@ import time
 import unittest
 import functools
 
+import numpy as np
+
 import paddle.reader
 
 __all__ = []
@@ -128,6 +130,40 @@ class TestShuffle(unittest.TestCase):
                 total += 1
             self.assertEqual(total, 10)
 
+    def test_two_level_shuffle(self):
+        def reader():
+            for i in range(100):
+                yield np.array([i, i + 1]).astype('int64'), i
+
+        s = paddle.reader.shuffle(reader, 10, two_level=True)
+        for _ in range(2):
+            result = list(s())
+            self.assertEqual(sorted(e[1] for e in result), list(range(100)))
+            for data, i in result:
+                np.testing.assert_array_equal(data, [i, i + 1])
+            # samples of the first chunk are not yielded together
+            self.assertGreater(len(set(e[1] // 10 for e in result[:10])), 1)
+
+
+class TestCache(unittest.TestCase):
+    def test_cache(self):
+        def reader():
+            for i in range(10):
+                yield np.full([i, 3], i).astype('float32'), i, str(i)
+
+        for memory_limit in (None, 0, 100):
+            cached = paddle.reader.cache(reader, memory_limit=memory_limit)
+            for _ in range(2):
+                result = list(cached())
+                self.assertEqual(len(result), 10)
+                for i, (data, label, name) in enumerate(result):
+                    self.assertEqual(data.dtype, np.float32)
+                    np.testing.assert_array_equal(
+                        data, np.full([i, 3], i).astype('float32')
+                    )
+                    self.assertEqual(label, i)
+                    self.assertEqual(name, str(i))
+
 
 class TestXmap(unittest.TestCase):
     def test_xmap(self):
@@ -152,6 +188,43 @@ class TestXmap(unittest.TestCase):
                         for idx, e in enumerate(result):
                             self.assertEqual(e, mapper(idx))
 
+    def test_xmap_process(self):
+        def mapper(x):
+            # the slow sample is mapped after the following ones
+            if x == 2:
+                time.sleep(0.2)
+            return x + 1
+
+        for order in (True, False):
+            for process_num in (1, 4):
+                for chunk_size in (1, 3, 16):
+                    reader = paddle.reader.xmap_readers(
+                        mapper,
+                        reader_creator_10(0),
+                        process_num,
+                        4,
+                        order,
+                        use_process=True,
+                        chunk_size=chunk_size,
+                    )
+                    result = list(reader())
+                    if not order:
+                        result.sort()
+                    self.assertEqual(result, list(range(1, 11)))
+
+    def test_xmap_error(self):
+        def mapper(x):
+            if x == 5:
+                raise ValueError("mapper error")
+            return x
+
+        for use_process in (False, True):
+            reader = paddle.reader.xmap_readers(
+                mapper, reader_creator_10(0), 2, 4, True, use_process
+            )
+            with self.assertRaises(RuntimeError):
+                list(reader())
+
 
 class TestMultiProcessReader(unittest.TestCase):
     def setup(self):
@@ -17,8 +17,10 @@ import time
 import random
 import tempfile
 import shutil
+import os
 import numpy as np
 
+import paddle
 from paddle import Model
 from paddle.static import InputSpec
 from paddle.vision.models import LeNet
@@ -129,5 +131,49 @@ class TestCallbacks(unittest.TestCase):
         self.run_callback()
 
 
+class RandomDataset(paddle.io.Dataset):
+    def __getitem__(self, idx):
+        image = np.random.random([1, 28, 28]).astype('float32')
+        label = np.random.randint(0, 10, [1]).astype('int64')
+        return image, label
+
+    def __len__(self):
+        return 8
+
+
+class TestModelCheckpointAsyncSave(unittest.TestCase):
+    def setUp(self):
+        self.save_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.save_dir)
+
+    def test_async_save(self):
+        paddle.disable_static()
+        inputs = [InputSpec([None, 1, 28, 28], 'float32', 'image')]
+        labels = [InputSpec([None, 1], 'int64', 'label')]
+        net = LeNet()
+        model = Model(net, inputs, labels)
+        optim = paddle.optimizer.Adam(0.001, parameters=net.parameters())
+        model.prepare(optim, paddle.nn.CrossEntropyLoss())
+
+        callback = paddle.callbacks.ModelCheckpoint(
+            save_dir=self.save_dir, async_save=True
+        )
+        model.fit(RandomDataset(), batch_size=4, epochs=2, callbacks=callback)
+
+        for prefix in ['0', '1', 'final']:
+            for suffix in ['.pdparams', '.pdopt']:
+                path = os.path.join(self.save_dir, prefix + suffix)
+                self.assertTrue(os.path.exists(path))
+
+        new_model = Model(LeNet(), inputs, labels)
+        new_model.load(os.path.join(self.save_dir, 'final'))
+        for key, value in net.state_dict().items():
+            np.testing.assert_array_equal(
+                new_model.network.state_dict()[key].numpy(), value.numpy()
+            )
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -69,6 +69,55 @@ class TestCifar10Test(unittest.TestCase):
             cifar = Cifar10(mode='test', backend=1)
 
 
+class TestCifar10DecodedCache(unittest.TestCase):
+    def test_main(self):
+        cifar = Cifar10(mode='test', backend='cv2')
+        for _ in range(2):
+            cached = Cifar10(mode='test', backend='cv2', cache_decoded=True)
+            self.assertEqual(len(cached), len(cifar))
+            np.testing.assert_array_equal(cached.images, cifar.images)
+            np.testing.assert_array_equal(cached.labels, cifar.labels)
+
+        indices = [3, 100, 7]
+        samples = cached.__getitems__(indices)
+        for (image, label), idx in zip(samples, indices):
+            expected_image, expected_label = cifar[idx]
+            np.testing.assert_array_equal(image, expected_image)
+            self.assertEqual(int(label), int(expected_label))
+
+    def test_subclass(self):
+        class CifarDataset(Cifar10):
+            def __getitem__(self, idx):
+                image, label = super(CifarDataset, self).__getitem__(idx)
+                return image.transpose([2, 0, 1]), label
+
+        # batches are got by the overridden __getitem__ of subclass
+        cifar = CifarDataset(mode='test', backend='cv2')
+        indices = [3, 100, 7]
+        samples = cifar.__getitems__(indices)
+        for (image, label), idx in zip(samples, indices):
+            expected_image, expected_label = cifar[idx]
+            self.assertEqual(image.shape, (3, 32, 32))
+            np.testing.assert_array_equal(image, expected_image)
+            self.assertEqual(int(label), int(expected_label))
+
+    def test_data(self):
+        # the list of (flattened CHW image, label) is kept for compatibility
+        cifar = Cifar10(mode='test', backend='cv2')
+        self.assertEqual(len(cifar.data), len(cifar))
+        sample, label = cifar.data[5]
+        self.assertEqual(sample.shape, (3072,))
+        self.assertEqual(sample.dtype, np.uint8)
+        image, expected_label = cifar[5]
+        np.testing.assert_array_equal(
+            sample.reshape([3, 32, 32]).transpose([1, 2, 0]),
+            image.astype('uint8'),
+        )
+        self.assertEqual(label, int(expected_label))
+        self.assertEqual(len(cifar.data[:3]), 3)
+        self.assertEqual(cifar.data[-1][1], int(cifar.labels[-1]))
+
+
 class TestCifar100Train(unittest.TestCase):
     def test_main(self):
         cifar = Cifar100(mode='train')
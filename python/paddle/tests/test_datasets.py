@@ -13,7 +13,11 @@
 # limitations under the License.
 
 import unittest
+from unittest import mock
+import errno
 import os
+import time
+import warnings
 import numpy as np
 import tempfile
 import shutil
@@ -26,6 +30,7 @@ from paddle.vision.datasets import (
     MNIST,
     FashionMNIST,
     Flowers,
+    DecodedCache,
 )
 from paddle.dataset.common import _check_exists_and_download
 from paddle.fluid.framework import _test_eager_guard
@@ -100,6 +105,104 @@ class TestFolderDatasets(unittest.TestCase):
             self.func_test_transform()
         self.func_test_transform()
 
+    def test_index(self):
+        index_dir = tempfile.mkdtemp()
+        index_path = os.path.join(index_dir, 'index')
+        for _ in range(2):
+            expected = DatasetFolder(self.data_dir)
+            dataset_folder = DatasetFolder(self.data_dir, index_path=index_path)
+            self.assertEqual(len(dataset_folder), len(expected))
+            self.assertEqual(list(dataset_folder.samples), expected.samples)
+            self.assertEqual(list(dataset_folder.targets), expected.targets)
+            for (img, label), (e_img, e_label) in zip(dataset_folder, expected):
+                np.testing.assert_array_equal(np.array(img), np.array(e_img))
+                self.assertEqual(label, e_label)
+
+            # new file is found by the mtime of its directory
+            fake_img = (np.random.random((32, 32, 3)) * 255).astype('uint8')
+            cv2.imwrite(
+                os.path.join(self.data_dir, 'class_1', 'new.jpg'), fake_img
+            )
+
+        expected = ImageFolder(self.data_dir)
+        loader = ImageFolder(
+            self.data_dir, index_path=index_path + '_image_folder'
+        )
+        self.assertEqual(list(loader.samples), expected.samples)
+        shutil.rmtree(index_dir)
+
+    def test_decoded_cache(self):
+        cache_dir = tempfile.mkdtemp()
+        decoded = []
+
+        def loader(path):
+            decoded.append(path)
+            return cv2.imread(path)
+
+        cache = DecodedCache(
+            cache_dir, pre_transform=T.Resize(16), loader=loader
+        )
+        dataset_folder = DatasetFolder(self.data_dir, loader=cache)
+        expected = [
+            T.Resize(16)(cv2.imread(p)) for p, _ in dataset_folder.samples
+        ]
+        for _ in range(2):
+            for (img, _), e_img in zip(dataset_folder, expected):
+                np.testing.assert_array_equal(img, e_img)
+        # images are only decoded in the first epoch
+        self.assertEqual(len(decoded), 4)
+
+        # modified file and changed pre-transform are not hit
+        path = dataset_folder.samples[0][0]
+        os.utime(path, ns=(0, 0))
+        cache(path)
+        self.assertEqual(len(decoded), 5)
+        DecodedCache(cache_dir, pre_transform=T.Resize(8), loader=loader)(path)
+        self.assertEqual(len(decoded), 6)
+
+        # the least recently used entries are evicted beyond the budget
+        shutil.rmtree(cache_dir)
+        nbytes = 16 * 16 * 3 + 128
+        cache = DecodedCache(
+            cache_dir,
+            max_bytes=nbytes * 3,
+            pre_transform=T.Resize(16),
+            loader=loader,
+        )
+        paths = [p for p, _ in dataset_folder.samples]
+        del decoded[:]
+        for p in paths[:3] + paths[:1] + paths[3:] + paths[:2]:
+            cache(p)
+            # make sure the modification time of entries increases
+            time.sleep(0.05)
+        self.assertEqual(decoded, paths + paths[1:2])
+        shutil.rmtree(cache_dir)
+
+    def test_decoded_cache_write_failure(self):
+        cache_dir = tempfile.mkdtemp()
+        cache = DecodedCache(
+            cache_dir, pre_transform=T.Resize(16), loader=cv2.imread
+        )
+        dataset_folder = DatasetFolder(self.data_dir, loader=cache)
+        expected = [
+            T.Resize(16)(cv2.imread(p)) for p, _ in dataset_folder.samples
+        ]
+        # the images are returned uncached when the cache directory is full,
+        # and the failure is only warned once
+        no_space = OSError(errno.ENOSPC, 'No space left on device')
+        with mock.patch('numpy.save', side_effect=no_space):
+            with warnings.catch_warnings(record=True) as w:
+                warnings.simplefilter('always')
+                for (img, _), e_img in zip(dataset_folder, expected):
+                    np.testing.assert_array_equal(img, e_img)
+            messages = [str(x.message) for x in w]
+            self.assertEqual(
+                len([m for m in messages if 'DecodedCache' in m]), 1
+            )
+        for root, _, files in os.walk(cache_dir):
+            self.assertFalse(any(f.endswith('.tmp') for f in files))
+        shutil.rmtree(cache_dir)
+
     def func_test_errors(self):
         with self.assertRaises(RuntimeError):
             ImageFolder(self.empty_dir)
@@ -135,6 +238,39 @@ class TestMNISTTest(unittest.TestCase):
         self.func_test_main()
 
 
+class TestMNISTDecodedCache(unittest.TestCase):
+    def test_main(self):
+        mnist = MNIST(mode='test', backend='cv2')
+        for _ in range(2):
+            cached = MNIST(mode='test', backend='cv2', cache_decoded=True)
+            self.assertEqual(len(cached), len(mnist))
+            np.testing.assert_array_equal(cached.images[5], mnist.images[5])
+            np.testing.assert_array_equal(cached.labels, mnist.labels)
+
+        indices = [3, 100, 7]
+        samples = cached.__getitems__(indices)
+        for (image, label), idx in zip(samples, indices):
+            expected_image, expected_label = mnist[idx]
+            np.testing.assert_array_equal(image, expected_image)
+            np.testing.assert_array_equal(label, expected_label)
+
+    def test_subclass(self):
+        class MnistDataset(MNIST):
+            def __getitem__(self, idx):
+                img = np.reshape(self.images[idx], [1, 28, 28])
+                return img, np.array(self.labels[idx]).astype('int64') + 1
+
+        # batches are got by the overridden __getitem__ of subclass
+        mnist = MnistDataset(mode='test', backend='cv2')
+        indices = [3, 100, 7]
+        samples = mnist.__getitems__(indices)
+        for (image, label), idx in zip(samples, indices):
+            expected_image, expected_label = mnist[idx]
+            self.assertEqual(image.shape, (1, 28, 28))
+            np.testing.assert_array_equal(image, expected_image)
+            np.testing.assert_array_equal(label, expected_label)
+
+
 class TestMNISTTrain(unittest.TestCase):
     def func_test_main(self):
         transform = T.Transpose()
@@ -307,6 +307,59 @@ class TestRecall(unittest.TestCase):
         self.assertEqual(m.accumulate(), 0.0)
 
 
+class TestMultiClassPrecisionRecall(unittest.TestCase):
+    def setUp(self):
+        self.num_classes = 4
+        self.scores = np.random.rand(32, self.num_classes).astype('float32')
+        self.preds = self.scores.argmax(axis=-1)
+        self.labels = np.random.randint(self.num_classes, size=(32, 1))
+
+    def reference(self, by_pred, average):
+        labels = self.labels.reshape(-1)
+        tps, totals = [], []
+        for c in range(self.num_classes):
+            tps.append(np.sum((self.preds == c) & (labels == c)))
+            totals.append(np.sum((self.preds if by_pred else labels) == c))
+        if average == 'micro':
+            return float(sum(tps)) / sum(totals)
+        return np.mean([t / n if n else 0.0 for t, n in zip(tps, totals)])
+
+    def test_main(self):
+        for cls, by_pred in [
+            (paddle.metric.Precision, True),
+            (paddle.metric.Recall, False),
+        ]:
+            for average in ['macro', 'micro']:
+                # scores and class ids give the same results
+                for preds in [self.scores, self.preds.reshape(-1, 1)]:
+                    m = cls(num_classes=self.num_classes, average=average)
+                    m.update(preds[:10], self.labels[:10])
+                    m.update(
+                        paddle.to_tensor(preds[10:]),
+                        paddle.to_tensor(self.labels[10:]),
+                    )
+                    self.assertAlmostEqual(
+                        m.accumulate(), self.reference(by_pred, average)
+                    )
+
+                    m.reset()
+                    self.assertEqual(m.confusion.sum(), 0)
+                    self.assertEqual(m.accumulate(), 0.0)
+
+    def test_exception(self):
+        for cls in [paddle.metric.Precision, paddle.metric.Recall]:
+            with self.assertRaises(ValueError):
+                cls(average='weighted')
+            with self.assertRaises(ValueError):
+                cls(average='macro')
+
+            m = cls(num_classes=3, average='micro')
+            with self.assertRaises(ValueError):
+                m.update(np.array([0, 3]), np.array([0, 1]))
+            with self.assertRaises(ValueError):
+                m.update(np.array([0, 1]), np.array([-1, 1]))
+
+
 class TestAuc(unittest.TestCase):
     def test_auc_numpy(self):
         x = np.array(
@@ -354,6 +407,77 @@ class TestAuc(unittest.TestCase):
         m.reset()
         self.assertEqual(m.accumulate(), 0.0)
 
+    def test_auc_merge(self):
+        x = np.random.random(size=(64, 1))
+        x = np.concatenate((1 - x, x), axis=1)
+        y = np.random.randint(2, size=(64, 1))
+
+        m = paddle.metric.Auc()
+        m.update(x, y)
+
+        m0 = paddle.metric.Auc()
+        m0.update(x[:20], y[:20])
+        m1 = paddle.metric.Auc()
+        m1.update(x[20:], y[20:])
+        m0.merge(m1)
+        self.assertAlmostEqual(m0.accumulate(), m.accumulate())
+
+        with self.assertRaises(ValueError):
+            m0.merge(paddle.metric.Auc(num_thresholds=255))
+
+    def test_auc_pr(self):
+        x = np.array([[0.9, 0.1], [0.6, 0.4], [0.35, 0.65], [0.2, 0.8]])
+        y = np.array([[0], [0], [1], [1]])
+        m = paddle.metric.Auc(curve='PR')
+        m.update(x, y)
+        self.assertAlmostEqual(m.accumulate(), 1.0)
+
+        m.reset()
+        self.assertEqual(m.accumulate(), 0.0)
+
+
+class TestMetricMerge(unittest.TestCase):
+    def test_precision_recall_merge(self):
+        x = np.array([0.1, 0.5, 0.6, 0.7, 0.2, 0.8])
+        y = np.array([1, 0, 1, 1, 1, 0])
+        for cls in [paddle.metric.Precision, paddle.metric.Recall]:
+            m = cls()
+            m.update(x, y)
+            m0, m1 = cls(), cls()
+            m0.update(x[:3], y[:3])
+            m1.update(x[3:], y[3:])
+            m0.merge(m1)
+            self.assertAlmostEqual(m0.accumulate(), m.accumulate())
+
+    def test_multi_class_merge(self):
+        x = np.random.randint(4, size=(20, 1))
+        y = np.random.randint(4, size=(20, 1))
+        for cls in [paddle.metric.Precision, paddle.metric.Recall]:
+            m = cls(num_classes=4, average='macro')
+            m.update(x, y)
+            m0 = cls(num_classes=4, average='macro')
+            m1 = cls(num_classes=4, average='macro')
+            m0.update(x[:7], y[:7])
+            m1.update(x[7:], y[7:])
+            m0.merge(m1)
+            self.assertAlmostEqual(m0.accumulate(), m.accumulate())
+
+            with self.assertRaises(ValueError):
+                m0.merge(cls(num_classes=4, average='micro'))
+            with self.assertRaises(ValueError):
+                m0.merge(cls())
+
+    def test_accuracy_merge(self):
+        correct = np.random.randint(2, size=(16, 2)).astype('float32')
+        m = paddle.metric.Accuracy(topk=(1, 2))
+        m.update(correct)
+        m0 = paddle.metric.Accuracy(topk=(1, 2))
+        m0.update(correct[:5])
+        m1 = paddle.metric.Accuracy(topk=(1, 2))
+        m1.update(correct[5:])
+        m0.merge(m1)
+        np.testing.assert_allclose(m0.accumulate(), m.accumulate())
+
 
 if __name__ == '__main__':
     unittest.main()
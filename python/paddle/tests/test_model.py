@@ -18,6 +18,7 @@ import os
 import numpy as np
 import shutil
 import tempfile
+import warnings
 
 import paddle
 from paddle import fluid
@@ -277,6 +278,12 @@ class TestModel(unittest.TestCase):
     def test_predict_static(self):
         self.predict(False)
 
+    def test_predict_stream_dygraph(self):
+        self.predict_stream(True)
+
+    def test_predict_stream_static(self):
+        self.predict_stream(False)
+
     def test_prepare_context(self):
         prepare_distributed_context()
 
@@ -448,6 +455,79 @@ class TestModel(unittest.TestCase):
 
         fluid.disable_dygraph() if dynamic else None
 
+    def predict_stream(self, dynamic):
+        fluid.enable_dygraph(self.device) if dynamic else None
+        model = Model(LeNet(), self.inputs)
+        model.prepare()
+        model.load(self.weight_path)
+        expected = model.predict(
+            self.test_dataset, batch_size=64, stack_outputs=True
+        )[0]
+
+        outputs = []
+        for outs in model.predict_iter(self.test_dataset, batch_size=64):
+            # grad is not disabled while the caller runs between batches
+            if dynamic:
+                self.assertTrue(paddle.is_grad_enabled())
+            outputs.append(outs[0])
+        np.testing.assert_allclose(np.vstack(outputs), expected, rtol=1e-6)
+
+        batches = []
+        model.predict(
+            self.test_dataset,
+            batch_size=64,
+            sink=lambda outs: batches.append(outs[0].shape[0]),
+        )
+        self.assertEqual(sum(batches), len(self.test_dataset))
+
+        save_dir = os.path.join(self.save_dir, 'predict_stream')
+        files = model.predict(
+            self.test_dataset,
+            batch_size=64,
+            sink=paddle.hapi.predict_sink.NpyShardSink(
+                save_dir, shard_size=300
+            ),
+        )
+        self.assertEqual(len(files), 1)
+        shards = [np.load(f) for f in files[0]]
+        self.assertEqual([len(s) for s in shards], [300, 300, 300, 300, 80])
+        np.testing.assert_allclose(np.vstack(shards), expected, rtol=1e-6)
+
+        outputs = model.predict(
+            self.test_dataset,
+            batch_size=64,
+            sink=paddle.hapi.predict_sink.MemmapSink(save_dir),
+        )
+        np.testing.assert_allclose(outputs[0], expected, rtol=1e-6)
+
+        # ranks predict interleaved batches with padded duplicate samples,
+        # which are merged into the order of dataset by the written indices
+        outputs, indices = [], []
+        for rank in range(3):
+            sampler = DistributedBatchSampler(
+                self.test_dataset,
+                batch_size=64,
+                num_replicas=3,
+                rank=rank,
+                shuffle=True,
+            )
+            test_loader = fluid.io.DataLoader(
+                self.test_dataset,
+                batch_sampler=sampler,
+                places=self.device,
+                return_list=True,
+            )
+            sink = paddle.hapi.predict_sink.NpyShardSink(
+                os.path.join(save_dir, 'rank{}'.format(rank)), shard_size=100
+            )
+            files = model.predict(test_loader, sink=sink)
+            outputs.extend(np.load(f) for f in files[0])
+            indices.extend(np.load(f) for f in sink.index_files)
+        merged = paddle.hapi.predict_sink.merge_outputs(outputs, indices)
+        np.testing.assert_allclose(merged, expected, rtol=1e-6)
+
+        fluid.disable_dygraph() if dynamic else None
+
     def test_predict_without_inputs(self):
         fluid.enable_dygraph(self.device)
         model = Model(LeNet())
@@ -924,6 +1004,47 @@ class TestModelFunction(unittest.TestCase):
         model.save(save_dir, training=False)
         shutil.rmtree(save_dir)
 
+    def test_prepare_compile(self):
+        class NumpyModel(MyModel):
+            def forward(self, x):
+                # numpy() is not supported in static graph
+                return self._fc(x) * float(x.numpy().mean() > -1)
+
+        paddle.disable_static()
+        data = np.random.random(size=(4, 20)).astype(np.float32)
+        label = np.random.randint(0, 10, size=(4, 1)).astype(np.int64)
+        inputs = [InputSpec([None, 20], 'float32', 'x')]
+        labels = [InputSpec([None, 1], 'int64', 'label')]
+        results = []
+        for network, compile in [
+            (MyModel, False),
+            (MyModel, True),
+            (NumpyModel, True),
+        ]:
+            self.set_seed()
+            net = network()
+            model = Model(net, inputs, labels)
+            optim = paddle.optimizer.SGD(
+                learning_rate=0.001, parameters=net.parameters()
+            )
+            model.prepare(
+                optim, CrossEntropyLoss(reduction='sum'), compile=compile
+            )
+            with warnings.catch_warnings(record=True) as w:
+                warnings.simplefilter("always")
+                losses = [
+                    model.train_batch([data], [label])[0] for _ in range(3)
+                ]
+            fallback = any('fall back' in str(x.message) for x in w)
+            self.assertEqual(fallback, network is NumpyModel)
+            self.assertEqual(
+                model._adapter._train_step is not None,
+                compile and network is MyModel,
+            )
+            results.append(losses)
+        for losses in results[1:]:
+            np.testing.assert_allclose(losses, results[0], rtol=1e-5)
+
     def test_accumulate(
         self,
     ):
@@ -959,6 +1080,57 @@ class TestModelFunction(unittest.TestCase):
             np.testing.assert_almost_equal(losses[0], losses[1], decimal=4)
             np.testing.assert_almost_equal(losses[0], losses[2], decimal=4)
 
+    def test_fit_sync_freq(self):
+        class LogRecorder(paddle.callbacks.Callback):
+            def __init__(self, record_freq):
+                self.record_freq = record_freq
+                self.records = {}
+
+            def on_train_batch_end(self, step, logs=None):
+                if (step + 1) % self.record_freq == 0:
+                    self.records[step] = (logs['loss'], logs['acc'])
+
+            def on_epoch_end(self, epoch, logs=None):
+                self.records['epoch_end'] = (logs['loss'], logs['acc'])
+
+        np.random.seed(2022)
+        data = np.random.random(size=(40, 20)).astype(np.float32)
+        label = np.random.randint(0, 10, size=(40, 1)).astype(np.int64)
+        dataset = paddle.io.TensorDataset([data, label])
+
+        paddle.disable_static()
+        results = []
+        for sync_freq, record_freq in [(None, 2), (3, 2), (4, 4)]:
+            self.set_seed()
+            net = MyModel()
+            optim = paddle.optimizer.SGD(
+                learning_rate=0.01, parameters=net.parameters()
+            )
+            model = Model(
+                net,
+                [InputSpec([None, 20], 'float32', 'x')],
+                [InputSpec([None, 1], 'int64', 'label')],
+            )
+            model.prepare(optim, loss=CrossEntropyLoss(), metrics=Accuracy())
+            recorder = LogRecorder(record_freq)
+            model.fit(
+                dataset,
+                batch_size=4,
+                epochs=1,
+                shuffle=False,
+                verbose=0,
+                callbacks=[recorder],
+                sync_freq=sync_freq,
+            )
+            self.assertEqual(model._pending_metric_outs, [])
+            results.append(recorder.records)
+
+        expected = results[0]
+        for records in results[1:]:
+            for key, (loss, acc) in records.items():
+                np.testing.assert_allclose(loss, expected[key][0], rtol=1e-6)
+                np.testing.assert_allclose(acc, expected[key][1], rtol=1e-6)
+
 
 class TestModelWithLRScheduler(unittest.TestCase):
     def test_fit_by_step(self):
@@ -848,6 +848,57 @@ class TestFunctional(unittest.TestCase):
             test_adjust_saturation(np_img, tensor_img)
             test_adjust_hue(np_img, tensor_img)
 
+    def test_adjust_color(self):
+        np.random.seed(555)
+        np_img = (np.random.rand(28, 28, 3) * 128 + 64).astype('uint8')
+        tensor_img = F.to_tensor(np_img)
+        order = ['saturation', 'brightness', 'hue', 'contrast']
+        factors = [1.2, 0.8, 1.1, 0.2]
+
+        # fused adjustments are the same as the sequential ones if the
+        # intermediate values are in range
+        result = F.adjust_color(tensor_img, *factors, order=order)
+        target = tensor_img
+        for name in order:
+            factor = factors[F._COLOR_ADJUSTMENTS.index(name)]
+            target = getattr(F, 'adjust_' + name)(target, factor)
+        np.testing.assert_allclose(
+            result.numpy(), target.numpy(), rtol=1e-5, atol=1e-5
+        )
+
+        batch_img = paddle.stack([tensor_img, tensor_img])
+        result = F.adjust_color(batch_img, *factors, order=order)
+        np.testing.assert_allclose(
+            result[1].numpy(), target.numpy(), rtol=1e-5, atol=1e-5
+        )
+
+        # lookup table of uint8 images gives the same result
+        result = F.adjust_color(
+            np_img, 1.3, 0.6, order=['contrast', 'brightness']
+        )
+        target = F.adjust_brightness(F.adjust_contrast(np_img, 0.6), 1.3)
+        np.testing.assert_equal(result, target)
+
+        result = F.adjust_color(np_img, 0.9, 1.1, 1.2, 0.1)
+        self.assertEqual(result.shape, np_img.shape)
+        self.assertEqual(result.dtype, np_img.dtype)
+
+        pil_img = Image.fromarray(np_img)
+        result = F.adjust_color(pil_img, 0.9, 1.1, 1.2, 0.1)
+        target = F.adjust_hue(
+            F.adjust_saturation(
+                F.adjust_contrast(F.adjust_brightness(pil_img, 0.9), 1.1), 1.2
+            ),
+            0.1,
+        )
+        np.testing.assert_equal(np.array(result), np.array(target))
+
+        with self.assertRaises(ValueError):
+            F.adjust_color(np_img, hue_factor=0.6)
+
+        with self.assertRaises(ValueError):
+            F.adjust_color(np_img, order=['brightness', 'gamma'])
+
     def test_pad(self):
         np_img = (np.random.rand(28, 24, 3) * 255).astype('uint8')
         pil_img = Image.fromarray(np_img)
@@ -1224,5 +1275,123 @@ class TestFunctional(unittest.TestCase):
         self.assertTrue(test_adjust_hue(batch_tensor))
 
 
+class TestBatchTransforms(unittest.TestCase):
+    def setUp(self):
+        paddle.seed(777)
+        np.random.seed(777)
+        self.imgs = paddle.rand((4, 3, 16, 20), dtype=paddle.float32)
+
+    def test_flip(self):
+        for trans, axis in [
+            (transforms.BatchRandomHorizontalFlip(0.5), -1),
+            (transforms.BatchRandomVerticalFlip(0.5), -2),
+        ]:
+            results = trans(self.imgs)
+            for img, result, flip in zip(self.imgs, results, trans.params):
+                target = img.flip([axis]) if flip else img
+                np.testing.assert_allclose(result.numpy(), target.numpy())
+
+    def test_color_jitter(self):
+        trans = transforms.BatchColorJitter(brightness=0.5)
+        results = trans(self.imgs)
+        ((name, factors),) = trans.params
+        self.assertEqual(name, 'brightness')
+        for img, result, factor in zip(self.imgs, results, factors):
+            target = F.adjust_brightness(img, factor)
+            np.testing.assert_allclose(
+                result.numpy(), target.numpy(), rtol=1e-5, atol=1e-6
+            )
+
+        trans = transforms.BatchColorJitter(0.4, 0.4, 0.4, 0.2)
+        uint8_imgs = (self.imgs * 255).astype('uint8')
+        results = trans(uint8_imgs)
+        self.assertEqual(results.dtype, paddle.uint8)
+        self.assertEqual(results.shape, uint8_imgs.shape)
+
+    def test_affine(self):
+        trans = transforms.BatchRandomAffine(
+            [30, 30], scale=[0.5, 0.5], shear=[10, 10], interpolation='bilinear'
+        )
+        results = trans(self.imgs)
+        for img, result in zip(self.imgs, results):
+            target = F.affine(
+                img, 30, [0, 0], 0.5, [10, 0], interpolation='bilinear', fill=0
+            )
+            np.testing.assert_allclose(
+                result.numpy(), target.numpy(), rtol=1e-5, atol=1e-5
+            )
+
+    def test_rotate(self):
+        trans = transforms.BatchRandomRotation(
+            [45, 45], interpolation='bilinear'
+        )
+        results = trans(self.imgs)
+        for img, result in zip(self.imgs, results):
+            target = F.rotate(img, 45, interpolation='bilinear', fill=0)
+            np.testing.assert_allclose(
+                result.numpy(), target.numpy(), rtol=1e-5, atol=1e-5
+            )
+
+    def test_random_resized_crop(self):
+        trans = transforms.BatchRandomResizedCrop((8, 10))
+        results = trans(self.imgs)
+        self.assertEqual(results.shape, [4, 3, 8, 10])
+
+        # the whole image is resized if the crop covers it
+        trans = transforms.BatchRandomResizedCrop(
+            (8, 10), scale=(1.0, 1.0), ratio=(1.25, 1.25)
+        )
+        results = trans(self.imgs)
+        target = F.resize(self.imgs[0], (8, 10))
+        np.testing.assert_allclose(
+            results[0].numpy(), target.numpy(), rtol=1e-5, atol=1e-5
+        )
+
+    def test_keys(self):
+        masks = (paddle.rand((4, 1, 16, 20)) > 0.5).astype('uint8')
+        trans = transforms.BatchRandomAffine(
+            30, translate=[0.1, 0.1], keys=('image', 'mask')
+        )
+        imgs, masks = trans((self.imgs, masks))
+        self.assertEqual(imgs.shape, [4, 3, 16, 20])
+        self.assertEqual(masks.dtype, paddle.uint8)
+        self.assertTrue(set(np.unique(masks.numpy())) <= {0, 1})
+
+        # class ids above 255 and the -1 ignore label survive the sampling,
+        # 0 comes from the padded border
+        labels = np.random.choice([-1, 3, 300, 1000], size=(4, 1, 16, 20))
+        labels = paddle.to_tensor(labels.astype('int64'))
+        for trans in [
+            transforms.BatchRandomAffine(30, keys=('image', 'mask')),
+            transforms.BatchRandomRotation(30, keys=('image', 'mask')),
+            transforms.BatchRandomResizedCrop(12, keys=('image', 'mask')),
+        ]:
+            imgs, masks = trans((self.imgs, labels))
+            self.assertEqual(masks.dtype, paddle.int64)
+            values = set(np.unique(masks.numpy()).tolist())
+            self.assertTrue(values <= {-1, 0, 3, 300, 1000})
+            self.assertTrue(values & {-1, 300, 1000})
+
+    def test_compose(self):
+        trans = transforms.Compose(
+            [
+                transforms.BatchRandomResizedCrop(12),
+                transforms.BatchRandomHorizontalFlip(),
+                transforms.BatchColorJitter(0.4, 0.4, 0.4, 0.1),
+                transforms.Normalize(mean=[0.5] * 3, std=[0.5] * 3),
+            ]
+        )
+        results = trans(self.imgs)
+        self.assertEqual(results.shape, [4, 3, 12, 12])
+
+    def test_exception(self):
+        trans = transforms.BatchRandomHorizontalFlip()
+        with self.assertRaises(TypeError):
+            trans(self.imgs[0])
+
+        with self.assertRaises(AssertionError):
+            transforms.BatchRandomRotation(30, interpolation='bicubic')
+
+
 if __name__ == '__main__':
     unittest.main()
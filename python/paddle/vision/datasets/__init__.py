@@ -20,6 +20,7 @@ from .flowers import Flowers  # noqa: F401
 from .cifar import Cifar10  # noqa: F401
 from .cifar import Cifar100  # noqa: F401
 from .voc2012 import VOC2012  # noqa: F401
+from .decoded_cache import DecodedCache  # noqa: F401
 
 __all__ = [  # noqa
     'DatasetFolder',
@@ -30,4 +31,5 @@ __all__ = [  # noqa
     'Cifar10',
     'Cifar100',
     'VOC2012',
+    'DecodedCache',
 ]
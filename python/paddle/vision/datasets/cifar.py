@@ -21,6 +21,8 @@ import paddle
 from paddle.io import Dataset
 from paddle.dataset.common import _check_exists_and_download
 
+from .utils import _load_decoded_arrays
+
 __all__ = []
 
 URL_PREFIX = 'https://dataset.bj.bcebos.com/cifar/'
@@ -37,6 +39,38 @@ MODE_FLAG_MAP = {
 }
 
 
+class _CifarData(object):
+    """
+    Read-only view of the images and labels of Cifar as the list of
+    (flattened CHW uint8 image, label) tuples before they are held in
+    contiguous arrays, which keeps the interface of `Cifar10.data`.
+    """
+
+    def __init__(self, images, labels):
+        self.images = images
+        self.labels = labels
+
+    def __len__(self):
+        return len(self.labels)
+
+    def _sample(self, idx):
+        image = self.images[idx].transpose([2, 0, 1]).reshape([-1])
+        return image, int(self.labels[idx])
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self._sample(i) for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("index {} out of range".format(idx))
+        return self._sample(idx)
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self._sample(idx)
+
+
 class Cifar10(Dataset):
     """
     Implementation of `Cifar-10 <https://www.cs.toronto.edu/~kriz/cifar.html>`_
@@ -52,6 +86,10 @@ class Cifar10(Dataset):
             PIL.Image or numpy.ndarray. Should be one of {'pil', 'cv2'}.
             If this option is not set, will get backend from :ref:`paddle.vision.get_image_backend <api_vision_image_get_image_backend>`,
             default backend is 'pil'. Default: None.
+        cache_decoded (bool, optional): Whether to save the decoded images and
+            labels as `.npy` files next to :attr:`data_file`, and load them
+            in memory-mapped mode later, which skips unpickling and is shared
+            by processes. Default: False.
 
     Returns:
         :ref:`api_paddle_io_Dataset`. An instance of Cifar10 dataset.
@@ -109,6 +147,7 @@ class Cifar10(Dataset):
         transform=None,
         download=True,
         backend=None,
+        cache_decoded=False,
     ):
         assert mode.lower() in [
             'train',
@@ -138,6 +177,7 @@ class Cifar10(Dataset):
             )
 
         self.transform = transform
+        self.cache_decoded = cache_decoded
 
         # read dataset into memory
         self._load_data()
@@ -150,7 +190,30 @@ class Cifar10(Dataset):
         self.flag = MODE_FLAG_MAP[self.mode + '10']
 
     def _load_data(self):
-        self.data = []
+        if self.cache_decoded:
+            arrays = _load_decoded_arrays(
+                self.data_file,
+                '{}.{}'.format(self.data_file, self.flag),
+                ['images', 'labels'],
+                self._decode_data,
+            )
+        else:
+            arrays = self._decode_data()
+        # images in shape [N, 32, 32, 3]
+        self.images = arrays['images']
+        self.labels = arrays['labels']
+
+    @property
+    def data(self):
+        """
+        Read-only list-like view of (flattened CHW image, label) tuples,
+        kept for compatibility, use `images` and `labels` instead.
+        """
+        return _CifarData(self.images, self.labels)
+
+    def _decode_data(self):
+        images = []
+        labels = []
         with tarfile.open(self.data_file, mode='r') as f:
             names = (
                 each_item.name for each_item in f if self.flag in each_item.name
@@ -162,18 +225,24 @@ class Cifar10(Dataset):
                 batch = pickle.load(f.extractfile(name), encoding='bytes')
 
                 data = batch[b'data']
-                labels = batch.get(b'labels', batch.get(b'fine_labels', None))
-                assert labels is not None
-                for sample, label in zip(data, labels):
-                    self.data.append((sample, label))
+                batch_labels = batch.get(
+                    b'labels', batch.get(b'fine_labels', None)
+                )
+                assert batch_labels is not None
+                images.append(np.asarray(data, dtype='uint8'))
+                labels.append(np.asarray(batch_labels, dtype='int64'))
+
+        images = np.concatenate(images).reshape([-1, 3, 32, 32])
+        return {
+            'images': np.ascontiguousarray(images.transpose([0, 2, 3, 1])),
+            'labels': np.concatenate(labels),
+        }
 
     def __getitem__(self, idx):
-        image, label = self.data[idx]
-        image = np.reshape(image, [3, 32, 32])
-        image = image.transpose([1, 2, 0])
+        image, label = self.images[idx], self.labels[idx]
 
         if self.backend == 'pil':
-            image = Image.fromarray(image.astype('uint8'))
+            image = Image.fromarray(image)
         if self.transform is not None:
             image = self.transform(image)
 
@@ -182,8 +251,25 @@ class Cifar10(Dataset):
 
         return image.astype(self.dtype), np.array(label).astype('int64')
 
+    def __getitems__(self, indices):
+        """
+        Get samples of indices in a batch. Images and labels are indexed
+        from the arrays at once if no transform is set and backend is cv2.
+        """
+        # NOTE: subclasses overriding __getitem__ should get samples in
+        # their own way
+        if (
+            self.backend == 'pil'
+            or self.transform is not None
+            or type(self).__getitem__ is not Cifar10.__getitem__
+        ):
+            return [self[idx] for idx in indices]
+        images = self.images[indices].astype(self.dtype)
+        labels = self.labels[indices]
+        return list(zip(images, labels))
+
     def __len__(self):
-        return len(self.data)
+        return len(self.labels)
 
 
 class Cifar100(Cifar10):
@@ -201,6 +287,10 @@ class Cifar100(Cifar10):
             PIL.Image or numpy.ndarray. Should be one of {'pil', 'cv2'}.
             If this option is not set, will get backend from :ref:`paddle.vision.get_image_backend <api_vision_image_get_image_backend>`,
             default backend is 'pil'. Default: None.
+        cache_decoded (bool, optional): Whether to save the decoded images and
+            labels as `.npy` files next to :attr:`data_file`, and load them
+            in memory-mapped mode later, which skips unpickling and is shared
+            by processes. Default: False.
 
     Returns:
         :ref:`api_paddle_io_Dataset`. An instance of Cifar100 dataset.
@@ -258,9 +348,10 @@ class Cifar100(Cifar10):
         transform=None,
         download=True,
         backend=None,
+        cache_decoded=False,
     ):
         super(Cifar100, self).__init__(
-            data_file, mode, transform, download, backend
+            data_file, mode, transform, download, backend, cache_decoded
         )
 
     def _init_url_md5_flag(self):
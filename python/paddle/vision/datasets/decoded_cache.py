@@ -0,0 +1,321 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import inspect
+import numbers
+import os
+import struct
+import tempfile
+import warnings
+
+import numpy as np
+from PIL import Image
+
+import paddle
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+__all__ = []
+
+_USAGE_FORMAT = '<q'
+
+
+def _transform_config(transform):
+    """Describe a transform by its class and plain attributes, so that the
+    same pre-transform gives the same cache key in every process."""
+    if transform is None:
+        return ''
+    if isinstance(transform, (list, tuple)):
+        return '[{}]'.format(','.join(_transform_config(t) for t in transform))
+    if inspect.ismethod(transform):
+        return '{}.{}'.format(
+            _transform_config(transform.__self__), transform.__name__
+        )
+    if inspect.isroutine(transform) or isinstance(transform, type):
+        cls = transform
+    else:
+        cls = type(transform)
+    items = []
+    for name, value in sorted(getattr(transform, '__dict__', {}).items()):
+        if name.startswith('_') or name == 'params':
+            continue
+        if isinstance(value, (numbers.Number, str, type(None))):
+            items.append('{}={!r}'.format(name, value))
+        elif isinstance(value, (list, tuple)) and all(
+            isinstance(v, (numbers.Number, str, type(None))) for v in value
+        ):
+            items.append('{}={!r}'.format(name, tuple(value)))
+        elif isinstance(value, (list, tuple)) or callable(value):
+            items.append('{}={}'.format(name, _transform_config(value)))
+    return '{}.{}({})'.format(cls.__module__, cls.__qualname__, ','.join(items))
+
+
+class DecodedCache(object):
+    """
+    A cache of decoded images shared by all processes on a node, which can
+    be used as the ``loader`` of :ref:`api_paddle_vision_datasets_DatasetFolder`
+    and :ref:`api_paddle_vision_datasets_ImageFolder`, or the
+    ``decoded_cache`` of :ref:`api_paddle_vision_datasets_Flowers`, so that
+    images are only decoded in the first epoch.
+
+    Each image is decoded by ``loader``, transformed by ``pre_transform``
+    and saved as a ``.npy`` file in ``cache_dir``, which is in shared
+    memory by default. Cached images are loaded by memory mapping, so all
+    DataLoader workers read the same pages without decoding or copying.
+
+    Cache entries are keyed by the path, modification time and size of the
+    image file together with the configuration of ``loader`` and
+    ``pre_transform``, so a modified file or a changed pre-transform never
+    hits a stale entry. When the total size of entries exceeds
+    ``max_bytes``, the least recently used entries are evicted.
+
+    Args:
+        cache_dir (str, optional): The directory of cache entries, which can
+            be shared by several datasets. Default: None, a directory under
+            ``/dev/shm`` if it exists, otherwise under the temporary
+            directory.
+        max_bytes (int, optional): The size budget of cache entries in bytes.
+            Default: 4GB.
+        pre_transform (callable, optional): A deterministic transform applied
+            before caching, such as ``Resize``, so that the smaller resized
+            images are cached. Random transforms should be left in the
+            ``transform`` of dataset. Default: None.
+        loader (callable, optional): A function to load an image given its
+            path. Default: None, ``default_loader`` of ``DatasetFolder``.
+        config (str, optional): The configuration of ``loader`` and
+            ``pre_transform`` used in cache keys. If None, it is derived from
+            the classes and plain attributes of them. It should be set if
+            they carry other state that affects the output. Default: None.
+
+    Returns:
+        A callable object which returns the cached image of a path, in the
+        same type as the output of ``pre_transform`` (or ``loader``). Cached
+        numpy.ndarray images are read-only.
+
+    Examples:
+
+        .. code-block:: python
+
+            import paddle.vision.transforms as T
+            from paddle.vision.datasets import DatasetFolder, DecodedCache
+
+            cache = DecodedCache(max_bytes=2 << 30, pre_transform=T.Resize(256))
+            # dataset = DatasetFolder(
+            #     'path/to/images',
+            #     loader=cache,
+            #     transform=T.Compose([T.RandomCrop(224), T.ToTensor()]))
+    """
+
+    def __init__(
+        self,
+        cache_dir=None,
+        max_bytes=4 << 30,
+        pre_transform=None,
+        loader=None,
+        config=None,
+    ):
+        assert max_bytes > 0, "max_bytes should be a positive value"
+        if cache_dir is None:
+            base = (
+                '/dev/shm'
+                if os.path.isdir('/dev/shm')
+                else tempfile.gettempdir()
+            )
+            cache_dir = os.path.join(base, 'paddle_decoded_cache')
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir, exist_ok=True)
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.pre_transform = pre_transform
+        self.loader = loader
+        self.config = config
+        self._configs = {}
+        self._pid = None
+        self._save_failed = False
+
+    def _get_config(self, loader):
+        if self.config is not None:
+            return self.config
+        if loader not in self._configs:
+            self._configs[loader] = '{}|{}'.format(
+                _transform_config(loader), _transform_config(self.pre_transform)
+            )
+        return self._configs[loader]
+
+    def _entry_path(self, path, loader):
+        stat = os.stat(path)
+        key = '{}\0{}\0{}\0{}\0{}'.format(
+            os.path.abspath(path),
+            stat.st_mtime_ns,
+            stat.st_size,
+            paddle.vision.get_image_backend(),
+            self._get_config(loader),
+        )
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], digest)
+
+    def _usage_file(self):
+        # NOTE: flock is held by an open file description, which is shared
+        # by forked processes, so each process opens its own one.
+        if self._pid != os.getpid():
+            path = os.path.join(self.cache_dir, '.usage')
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            self._usage = os.fdopen(fd, 'r+b', buffering=0)
+            self._pid = os.getpid()
+        return self._usage
+
+    def _locked(self, fn):
+        f = self._usage_file()
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            return fn(f)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _read_usage(f):
+        f.seek(0)
+        data = f.read(struct.calcsize(_USAGE_FORMAT))
+        if len(data) < struct.calcsize(_USAGE_FORMAT):
+            return 0
+        return struct.unpack(_USAGE_FORMAT, data)[0]
+
+    @staticmethod
+    def _write_usage(f, usage):
+        f.seek(0)
+        f.write(struct.pack(_USAGE_FORMAT, usage))
+
+    def _add_usage(self, nbytes):
+        def add(f):
+            usage = self._read_usage(f) + nbytes
+            self._write_usage(f, usage)
+            return usage
+
+        return self._locked(add)
+
+    def _evict(self, f):
+        entries = []
+        for sub in os.scandir(self.cache_dir):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                if not entry.name.endswith('.npy'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        usage = sum(e[1] for e in entries)
+        if usage > self.max_bytes:
+            # evict to 90% of the budget, so that eviction is not triggered
+            # by each following insertion
+            low_water = self.max_bytes * 0.9
+            for _, size, path in sorted(entries):
+                if usage <= low_water:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                usage -= size
+        self._write_usage(f, usage)
+
+    def _load(self, entry):
+        for suffix, is_pil in [('.npy', False), ('.pil.npy', True)]:
+            try:
+                array = np.load(entry + suffix, mmap_mode='r')
+            except FileNotFoundError:
+                continue
+            try:
+                # refresh the modification time for LRU eviction
+                os.utime(entry + suffix)
+            except FileNotFoundError:
+                pass
+            return Image.fromarray(array) if is_pil else array
+        return None
+
+    def _save(self, entry, img):
+        is_pil = isinstance(img, Image.Image)
+        array = np.asarray(img)
+        path = entry + ('.pil.npy' if is_pil else '.npy')
+        tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+        try:
+            if not os.path.exists(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                np.save(f, array)
+            nbytes = os.path.getsize(tmp_path)
+            if nbytes > self.max_bytes:
+                os.remove(tmp_path)
+                return
+            os.replace(tmp_path, path)
+            if self._add_usage(nbytes) > self.max_bytes:
+                self._locked(self._evict)
+        except OSError as e:
+            # NOTE: caching is only an optimization, the image is returned
+            # uncached if the cache directory is full (e.g. the default
+            # /dev/shm of docker is 64MB) or not writable
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            if not self._save_failed:
+                self._save_failed = True
+                warnings.warn(
+                    "Failed to write decoded image into {}, images are "
+                    "returned without caching: {}. Please set a smaller "
+                    "max_bytes or another cache_dir of DecodedCache.".format(
+                        self.cache_dir, e
+                    )
+                )
+
+    def __call__(self, path, loader=None):
+        """
+        Args:
+            path (str): The path of image file.
+            loader (callable, optional): The function to load the image,
+                which overrides the ``loader`` of cache. Default: None.
+
+        Returns:
+            PIL.Image|numpy.ndarray: The decoded and pre-transformed image.
+        """
+        if loader is None:
+            loader = self.loader
+        if loader is None:
+            from .folder import default_loader
+
+            loader = default_loader
+        entry = self._entry_path(path, loader)
+        img = self._load(entry)
+        if img is not None:
+            return img
+
+        img = loader(path)
+        if self.pre_transform is not None:
+            img = self.pre_transform(img)
+        self._save(entry, img)
+        return img
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_usage', None)
+        state['_pid'] = None
+        return state
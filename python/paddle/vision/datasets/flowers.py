@@ -56,6 +56,10 @@ class Flowers(Dataset):
             PIL.Image or numpy.ndarray. Should be one of {'pil', 'cv2'}.
             If this option is not set, will get backend from :ref:`paddle.vision.get_image_backend <api_vision_image_get_image_backend>`,
             default backend is 'pil'. Default: None.
+        decoded_cache (DecodedCache, optional): The cache of decoded images,
+            with which images are decoded and pre-transformed only once and
+            shared by all DataLoader workers. Default: None, decode images
+            every time.
 
     Returns:
         :ref:`api_paddle_io_Dataset`. An instance of Flowers dataset.
@@ -115,6 +119,7 @@ class Flowers(Dataset):
         transform=None,
         download=True,
         backend=None,
+        decoded_cache=None,
     ):
         assert mode.lower() in [
             'train',
@@ -159,6 +164,7 @@ class Flowers(Dataset):
             )
 
         self.transform = transform
+        self.decoded_cache = decoded_cache
 
         data_tar = tarfile.open(data_file)
         self.data_path = data_file.replace(".tgz", "/")
@@ -175,10 +181,10 @@ class Flowers(Dataset):
         label = np.array([self.labels[index - 1]])
         img_name = "jpg/image_%05d.jpg" % index
         image = os.path.join(self.data_path, img_name)
-        if self.backend == 'pil':
-            image = Image.open(image)
-        elif self.backend == 'cv2':
-            image = np.array(Image.open(image))
+        if self.decoded_cache is not None:
+            image = self.decoded_cache(image, loader=self._load_image)
+        else:
+            image = self._load_image(image)
 
         if self.transform is not None:
             image = self.transform(image)
@@ -188,5 +194,10 @@ class Flowers(Dataset):
 
         return image.astype(paddle.get_default_dtype()), label.astype('int64')
 
+    def _load_image(self, path):
+        if self.backend == 'pil':
+            return Image.open(path)
+        return np.array(Image.open(path))
+
     def __len__(self):
         return len(self.indexes)
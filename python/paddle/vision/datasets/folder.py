@@ -20,6 +20,8 @@ import paddle
 from paddle.io import Dataset
 from paddle.utils import try_import
 
+from .utils import _FileIndex, _IndexedSamples
+
 __all__ = []
 
 
@@ -88,6 +90,14 @@ class DatasetFolder(Dataset):
         is_valid_file (Callable, optional): A function that takes path of a file
             and check if the file is a valid file. Both :attr:`extensions` and
             :attr:`is_valid_file` should not be passed. Default: None.
+        index_path (str, optional): The path of a file index. If set, the
+            files are listed from the index instead of walking the whole
+            directory tree. The index is built at the first time, and a
+            directory is scanned again only if its mtime changed later. The
+            index is loaded in memory-mapped mode and shared by processes.
+            The index does not track changes of :attr:`is_valid_file`. Default: None.
+        index_workers (int, optional): The number of threads to scan the
+            directories when building or validating the index. Default: 8.
 
     Returns:
         :ref:`api_paddle_io_Dataset`. An instance of DatasetFolder.
@@ -207,15 +217,33 @@ class DatasetFolder(Dataset):
         extensions=None,
         transform=None,
         is_valid_file=None,
+        index_path=None,
+        index_workers=8,
     ):
         self.root = root
         self.transform = transform
         if extensions is None:
             extensions = IMG_EXTENSIONS
         classes, class_to_idx = self._find_classes(self.root)
-        samples = make_dataset(
-            self.root, class_to_idx, extensions, is_valid_file
-        )
+        if index_path is not None:
+            if extensions is not None:
+
+                def is_valid_file(x):
+                    return has_valid_extension(x, extensions)
+
+            index = _FileIndex(
+                os.path.expanduser(self.root),
+                classes,
+                is_valid_file,
+                index_path,
+                extensions,
+                index_workers,
+            )
+            samples = _IndexedSamples(index)
+        else:
+            samples = make_dataset(
+                self.root, class_to_idx, extensions, is_valid_file
+            )
         if len(samples) == 0:
             raise (
                 RuntimeError(
@@ -230,7 +258,10 @@ class DatasetFolder(Dataset):
         self.classes = classes
         self.class_to_idx = class_to_idx
         self.samples = samples
-        self.targets = [s[1] for s in samples]
+        if index_path is not None:
+            self.targets = samples.index.targets
+        else:
+            self.targets = [s[1] for s in samples]
 
         self.dtype = paddle.get_default_dtype()
 
@@ -332,6 +363,14 @@ class ImageFolder(Dataset):
         is_valid_file (Callable, optional): A function that takes path of a file
             and check if the file is a valid file. Both :attr:`extensions` and
             :attr:`is_valid_file` should not be passed. Default: None.
+        index_path (str, optional): The path of a file index. If set, the
+            files are listed from the index instead of walking the whole
+            directory tree. The index is built at the first time, and a
+            directory is scanned again only if its mtime changed later. The
+            index is loaded in memory-mapped mode and shared by processes.
+            The index does not track changes of :attr:`is_valid_file`. Default: None.
+        index_workers (int, optional): The number of threads to scan the
+            directories when building or validating the index. Default: 8.
 
     Returns:
         :ref:`api_paddle_io_Dataset`. An instance of ImageFolder.
@@ -438,6 +477,8 @@ class ImageFolder(Dataset):
         extensions=None,
         transform=None,
         is_valid_file=None,
+        index_path=None,
+        index_workers=8,
     ):
         self.root = root
         if extensions is None:
@@ -451,11 +492,17 @@ class ImageFolder(Dataset):
             def is_valid_file(x):
                 return has_valid_extension(x, extensions)
 
-        for root, _, fnames in sorted(os.walk(path, followlinks=True)):
-            for fname in sorted(fnames):
-                f = os.path.join(root, fname)
-                if is_valid_file(f):
-                    samples.append(f)
+        if index_path is not None:
+            index = _FileIndex(
+                path, [''], is_valid_file, index_path, extensions, index_workers
+            )
+            samples = _IndexedSamples(index, with_target=False)
+        else:
+            for root, _, fnames in sorted(os.walk(path, followlinks=True)):
+                for fname in sorted(fnames):
+                    f = os.path.join(root, fname)
+                    if is_valid_file(f):
+                        samples.append(f)
 
         if len(samples) == 0:
             raise (
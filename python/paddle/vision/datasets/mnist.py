@@ -21,9 +21,35 @@ import paddle
 from paddle.io import Dataset
 from paddle.dataset.common import _check_exists_and_download
 
+from .utils import _load_decoded_arrays
+
 __all__ = []
 
 
+class _MNISTImages(object):
+    """
+    Images of MNIST held in one contiguous uint8 array of shape
+    [N, rows, cols]. Indexing with an integer returns a flattened float32
+    image, which keeps the interface of the list of images before.
+    """
+
+    def __init__(self, data):
+        self.data = data
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, (int, np.integer)):
+            return self.data[idx].reshape([-1]).astype('float32')
+        return _MNISTImages(self.data[idx])
+
+    def __array__(self, dtype=None, copy=None):
+        return self.data.reshape([len(self.data), -1]).astype(
+            dtype or 'float32'
+        )
+
+
 class MNIST(Dataset):
     """
     Implementation of `MNIST <http://yann.lecun.com/exdb/mnist/>`_ dataset.
@@ -41,6 +67,10 @@ class MNIST(Dataset):
             PIL.Image or numpy.ndarray. Should be one of {'pil', 'cv2'}.
             If this option is not set, will get backend from :ref:`paddle.vision.get_image_backend <api_vision_image_get_image_backend>`,
             default backend is 'pil'. Default: None.
+        cache_decoded (bool, optional): Whether to save the decoded images and
+            labels as `.npy` files next to :attr:`image_path` and
+            :attr:`label_path`, and load them in memory-mapped mode later,
+            which skips decompressing and is shared by processes. Default: False.
 
     Returns:
         :ref:`api_paddle_io_Dataset`. An instance of MNIST dataset.
@@ -108,6 +138,7 @@ class MNIST(Dataset):
         transform=None,
         download=True,
         backend=None,
+        cache_decoded=False,
     ):
         assert mode.lower() in [
             'train',
@@ -160,68 +191,71 @@ class MNIST(Dataset):
             )
 
         self.transform = transform
+        self.cache_decoded = cache_decoded
 
         # read dataset into memory
         self._parse_dataset()
 
         self.dtype = paddle.get_default_dtype()
 
-    def _parse_dataset(self, buffer_size=100):
-        self.images = []
-        self.labels = []
+    def _parse_dataset(self):
+        if self.cache_decoded:
+            images = _load_decoded_arrays(
+                self.image_path, self.image_path, ['images'], self._parse_images
+            )['images']
+            labels = _load_decoded_arrays(
+                self.label_path, self.label_path, ['labels'], self._parse_labels
+            )['labels']
+        else:
+            images = self._parse_images()['images']
+            labels = self._parse_labels()['labels']
+        assert len(images) == len(
+            labels
+        ), "image number {} does not match label number {}".format(
+            len(images), len(labels)
+        )
+        self.images = _MNISTImages(images)
+        self.labels = labels
+
+    def _parse_images(self):
         with gzip.GzipFile(self.image_path, 'rb') as image_file:
             img_buf = image_file.read()
-            with gzip.GzipFile(self.label_path, 'rb') as label_file:
-                lab_buf = label_file.read()
-
-                step_label = 0
-                offset_img = 0
-                # read from Big-endian
-                # get file info from magic byte
-                # image file : 16B
-                magic_byte_img = '>IIII'
-                magic_img, image_num, rows, cols = struct.unpack_from(
-                    magic_byte_img, img_buf, offset_img
-                )
-                offset_img += struct.calcsize(magic_byte_img)
-
-                offset_lab = 0
-                # label file : 8B
-                magic_byte_lab = '>II'
-                magic_lab, label_num = struct.unpack_from(
-                    magic_byte_lab, lab_buf, offset_lab
-                )
-                offset_lab += struct.calcsize(magic_byte_lab)
-
-                while True:
-                    if step_label >= label_num:
-                        break
-                    fmt_label = '>' + str(buffer_size) + 'B'
-                    labels = struct.unpack_from(fmt_label, lab_buf, offset_lab)
-                    offset_lab += struct.calcsize(fmt_label)
-                    step_label += buffer_size
-
-                    fmt_images = '>' + str(buffer_size * rows * cols) + 'B'
-                    images_temp = struct.unpack_from(
-                        fmt_images, img_buf, offset_img
-                    )
-                    images = np.reshape(
-                        images_temp, (buffer_size, rows * cols)
-                    ).astype('float32')
-                    offset_img += struct.calcsize(fmt_images)
-
-                    for i in range(buffer_size):
-                        self.images.append(images[i, :])
-                        self.labels.append(
-                            np.array([labels[i]]).astype('int64')
-                        )
+        # read from Big-endian
+        # get file info from magic byte
+        # image file : 16B
+        magic_byte_img = '>IIII'
+        magic_img, image_num, rows, cols = struct.unpack_from(
+            magic_byte_img, img_buf, 0
+        )
+        images = np.frombuffer(
+            img_buf,
+            dtype=np.uint8,
+            count=image_num * rows * cols,
+            offset=struct.calcsize(magic_byte_img),
+        )
+        return {'images': images.reshape([image_num, rows, cols])}
+
+    def _parse_labels(self):
+        with gzip.GzipFile(self.label_path, 'rb') as label_file:
+            lab_buf = label_file.read()
+        # label file : 8B
+        magic_byte_lab = '>II'
+        magic_lab, label_num = struct.unpack_from(magic_byte_lab, lab_buf, 0)
+        labels = np.frombuffer(
+            lab_buf,
+            dtype=np.uint8,
+            count=label_num,
+            offset=struct.calcsize(magic_byte_lab),
+        )
+        return {'labels': labels.astype('int64').reshape([label_num, 1])}
 
     def __getitem__(self, idx):
-        image, label = self.images[idx], self.labels[idx]
-        image = np.reshape(image, [28, 28])
+        image, label = self.images.data[idx], self.labels[idx]
 
         if self.backend == 'pil':
-            image = Image.fromarray(image.astype('uint8'), mode='L')
+            image = Image.fromarray(image, mode='L')
+        else:
+            image = image.astype('float32')
 
         if self.transform is not None:
             image = self.transform(image)
@@ -231,6 +265,23 @@ class MNIST(Dataset):
 
         return image.astype(self.dtype), label.astype('int64')
 
+    def __getitems__(self, indices):
+        """
+        Get samples of indices in a batch. Images and labels are indexed
+        from the arrays at once if no transform is set and backend is cv2.
+        """
+        # NOTE: subclasses overriding __getitem__ should get samples in
+        # their own way
+        if (
+            self.backend == 'pil'
+            or self.transform is not None
+            or type(self).__getitem__ is not MNIST.__getitem__
+        ):
+            return [self[idx] for idx in indices]
+        images = self.images.data[indices].astype(self.dtype)
+        labels = self.labels[indices]
+        return list(zip(images, labels))
+
     def __len__(self):
         return len(self.labels)
 
@@ -0,0 +1,387 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import struct
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+__all__ = []
+
+
+def _decoded_cache_path(cache_prefix, name):
+    return '{}.{}.npy'.format(cache_prefix, name)
+
+
+def _load_decoded_arrays(source_path, cache_prefix, names, decode):
+    """
+    Load decoded arrays of a dataset file from the cache files
+    `{cache_prefix}.{name}.npy` in memory-mapped mode. If any cache file
+    is missing or older than `source_path`, arrays are decoded by calling
+    `decode()` and saved to the cache files.
+
+    Args:
+        source_path (str): the path of the dataset file.
+        cache_prefix (str): the path prefix of the cache files.
+        names (list[str]): the names of decoded arrays.
+        decode (callable): a function returns a dict from names to
+            decoded numpy arrays.
+
+    Returns:
+        dict: a dict from names to decoded arrays.
+    """
+    paths = [_decoded_cache_path(cache_prefix, name) for name in names]
+    source_mtime = os.path.getmtime(source_path)
+    if all(
+        os.path.exists(p) and os.path.getmtime(p) >= source_mtime for p in paths
+    ):
+        try:
+            return {
+                name: np.load(p, mmap_mode='r') for name, p in zip(names, paths)
+            }
+        except (OSError, ValueError):
+            # broken cache file, decode again
+            pass
+
+    arrays = decode()
+    try:
+        for name, path in zip(names, paths):
+            # write to a temporary file and rename, for other processes
+            # may be loading the same cache
+            tmp_path = '{}.{}.tmp.npy'.format(path[: -len('.npy')], os.getpid())
+            np.save(tmp_path, arrays[name])
+            os.replace(tmp_path, path)
+    except OSError as e:
+        warnings.warn(
+            "Failed to save decoded dataset cache {}: {}".format(
+                cache_prefix, e
+            )
+        )
+    return arrays
+
+
+_INDEX_MAGIC = b'PDFIDX01'
+_INDEX_VERSION = 1
+_INDEX_ALIGNMENT = 64
+
+
+def _aligned(nbytes):
+    return (
+        (nbytes + _INDEX_ALIGNMENT - 1) // _INDEX_ALIGNMENT * _INDEX_ALIGNMENT
+    )
+
+
+def _save_index_arrays(path, meta, arrays):
+    """
+    Save arrays into one file, which is a magic, the length of a json
+    header, the json header, and the arrays aligned to _INDEX_ALIGNMENT.
+    """
+    header = {'meta': meta, 'arrays': {}}
+    offset = 0
+    for name, array in arrays.items():
+        header['arrays'][name] = [array.dtype.str, array.shape, offset]
+        offset += _aligned(array.nbytes)
+    header = json.dumps(header).encode()
+    data_start = _aligned(len(_INDEX_MAGIC) + 8 + len(header))
+
+    tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+    with open(tmp_path, 'wb') as f:
+        f.write(_INDEX_MAGIC + struct.pack('<Q', len(header)) + header)
+        f.write(b'\0' * (data_start - f.tell()))
+        for array in arrays.values():
+            f.write(np.ascontiguousarray(array).tobytes())
+            f.write(b'\0' * (_aligned(array.nbytes) - array.nbytes))
+    # rename for other processes may be loading the same index
+    os.replace(tmp_path, path)
+
+
+def _load_index_arrays(path):
+    with open(path, 'rb') as f:
+        if f.read(len(_INDEX_MAGIC)) != _INDEX_MAGIC:
+            raise ValueError("{} is not a file index".format(path))
+        (header_len,) = struct.unpack('<Q', f.read(8))
+        header = json.loads(f.read(header_len).decode())
+    data_start = _aligned(len(_INDEX_MAGIC) + 8 + header_len)
+    arrays = {}
+    for name, (dtype, shape, offset) in header['arrays'].items():
+        if int(np.prod(shape)) == 0:
+            arrays[name] = np.zeros(shape, dtype=dtype)
+        else:
+            arrays[name] = np.memmap(
+                path,
+                dtype=dtype,
+                mode='r',
+                offset=data_start + offset,
+                shape=tuple(shape),
+            )
+    return header['meta'], arrays
+
+
+def _pack_strings(strings):
+    data = [s.encode('utf-8', 'surrogateescape') for s in strings]
+    offsets = np.zeros([len(data) + 1], dtype='int64')
+    np.cumsum([len(d) for d in data], out=offsets[1:])
+    return np.frombuffer(b''.join(data), dtype='uint8'), offsets
+
+
+def _unpack_string(blob, offsets, idx):
+    return (
+        blob[offsets[idx] : offsets[idx + 1]]
+        .tobytes()
+        .decode('utf-8', 'surrogateescape')
+    )
+
+
+def _scan_dir(path, is_valid_file):
+    # stat the directory before scanning, so changes during scanning are
+    # detected by the next validation
+    mtime = os.stat(path).st_mtime_ns
+    subdirs = []
+    files = []
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=True):
+                subdirs.append(entry.name)
+            elif is_valid_file(entry.path):
+                try:
+                    st = entry.stat()
+                    files.append((entry.name, st.st_size, st.st_mtime_ns))
+                except OSError:
+                    # broken symbolic link
+                    files.append((entry.name, -1, -1))
+    files.sort()
+    return mtime, subdirs, files
+
+
+class _FileIndex(object):
+    """
+    A persisted index of the files under some top directories of root,
+    which lists the files in the same order as `os.walk` with sorted
+    directories and file names.
+
+    The index records the mtime of every directory, the files of it and
+    the size and mtime of every file. When loading, a directory is scanned
+    again only if its mtime changed, and directories are scanned by a pool
+    of threads. The index is saved in one file and loaded in memory-mapped
+    mode, so that it is shared by the processes on a node.
+
+    Args:
+        root (str): the root directory.
+        top_dirs (list[str]): the top directories relative to root, files
+            under `top_dirs[i]` have target `i`.
+        is_valid_file (callable): a function checks whether a file path
+            should be indexed.
+        index_path (str): the path of the index file.
+        extensions (tuple|None): the extensions checked by is_valid_file,
+            the index is rebuilt if it was built with other extensions.
+        num_workers (int): the number of threads to scan directories.
+    """
+
+    def __init__(
+        self,
+        root,
+        top_dirs,
+        is_valid_file,
+        index_path,
+        extensions=None,
+        num_workers=8,
+    ):
+        assert num_workers > 0, "num_workers should be a positive value"
+        self.root = root
+        self.index_path = index_path
+        self._is_valid_file = is_valid_file
+        self._meta = {
+            'version': _INDEX_VERSION,
+            'root': os.path.abspath(root),
+            'extensions': list(extensions) if extensions else None,
+        }
+        old = self._load_old()
+        dirs, changed = self._walk(top_dirs, old, num_workers)
+        if changed or old is None:
+            arrays = self._build_arrays(dirs, old)
+            _save_index_arrays(index_path, self._meta, arrays)
+        self._meta, self._arrays = _load_index_arrays(index_path)
+        self.targets = self._arrays['file_targets']
+
+    def _load_old(self):
+        if not os.path.exists(self.index_path):
+            return None
+        try:
+            meta, arrays = _load_index_arrays(self.index_path)
+        except (OSError, ValueError):
+            return None
+        if meta != self._meta:
+            return None
+        dir_idx = {}
+        children = {}
+        num_dirs = len(arrays['dir_mtimes'])
+        for i in range(num_dirs):
+            rel = _unpack_string(
+                arrays['dir_paths'], arrays['dir_path_offsets'], i
+            )
+            dir_idx[rel] = i
+            parent = int(arrays['dir_parents'][i])
+            children.setdefault(parent, []).append(rel)
+        return dir_idx, children, arrays
+
+    def _walk(self, top_dirs, old, num_workers):
+        old_idx, old_children, old_arrays = old or ({}, {}, None)
+
+        def visit(rel):
+            path = os.path.join(self.root, rel)
+            i = old_idx.get(rel)
+            if i is not None:
+                mtime = os.stat(path).st_mtime_ns
+                if mtime == old_arrays['dir_mtimes'][i]:
+                    subdirs = [
+                        os.path.basename(c) for c in old_children.get(i, [])
+                    ]
+                    return mtime, subdirs, i
+            return _scan_dir(path, self._is_valid_file)
+
+        # rel path -> (top index, parent rel path, mtime, files or old index)
+        dirs = {}
+        changed = False
+        frontier = [
+            (rel, target, None)
+            for target, rel in enumerate(top_dirs)
+            if os.path.isdir(os.path.join(self.root, rel))
+        ]
+        with ThreadPoolExecutor(num_workers) as pool:
+            while frontier:
+                results = pool.map(lambda x: visit(x[0]), frontier)
+                next_frontier = []
+                for (rel, target, parent), (mtime, subdirs, files) in zip(
+                    frontier, results
+                ):
+                    changed = changed or not isinstance(files, int)
+                    dirs[rel] = (target, parent, mtime, files)
+                    next_frontier.extend(
+                        (os.path.join(rel, s), target, rel) for s in subdirs
+                    )
+                frontier = next_frontier
+        changed = changed or len(dirs) != len(old_idx)
+        return dirs, changed
+
+    def _build_arrays(self, dirs, old):
+        old_arrays = old[2] if old is not None else None
+        # same order as sorted os.walk in each top directory
+        rels = sorted(dirs, key=lambda rel: (dirs[rel][0], rel))
+        rel_idx = {rel: i for i, rel in enumerate(rels)}
+
+        names, sizes, mtimes, targets = [], [], [], []
+        file_offsets = [0]
+        for rel in rels:
+            target, _, _, files = dirs[rel]
+            if isinstance(files, int):
+                start = old_arrays['dir_file_offsets'][files]
+                end = old_arrays['dir_file_offsets'][files + 1]
+                names.extend(
+                    _unpack_string(
+                        old_arrays['file_names'],
+                        old_arrays['file_name_offsets'],
+                        j,
+                    )
+                    for j in range(start, end)
+                )
+                sizes.append(old_arrays['file_sizes'][start:end])
+                mtimes.append(old_arrays['file_mtimes'][start:end])
+                num = end - start
+            else:
+                names.extend(f[0] for f in files)
+                sizes.append(np.array([f[1] for f in files], dtype='int64'))
+                mtimes.append(np.array([f[2] for f in files], dtype='int64'))
+                num = len(files)
+            targets.append(np.full([num], target, dtype='int64'))
+            file_offsets.append(file_offsets[-1] + num)
+
+        dir_paths, dir_path_offsets = _pack_strings(rels)
+        file_names, file_name_offsets = _pack_strings(names)
+
+        def concat(arrays):
+            return (
+                np.concatenate(arrays).astype('int64')
+                if arrays
+                else np.zeros([0], dtype='int64')
+            )
+
+        return {
+            'dir_paths': dir_paths,
+            'dir_path_offsets': dir_path_offsets,
+            'dir_mtimes': np.array(
+                [dirs[rel][2] for rel in rels], dtype='int64'
+            ),
+            'dir_parents': np.array(
+                [
+                    -1 if dirs[rel][1] is None else rel_idx[dirs[rel][1]]
+                    for rel in rels
+                ],
+                dtype='int64',
+            ),
+            'dir_file_offsets': np.array(file_offsets, dtype='int64'),
+            'file_names': file_names,
+            'file_name_offsets': file_name_offsets,
+            'file_sizes': concat(sizes),
+            'file_mtimes': concat(mtimes),
+            'file_targets': concat(targets),
+        }
+
+    def __len__(self):
+        return len(self.targets)
+
+    def path(self, idx):
+        arrays = self._arrays
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("file index {} out of range".format(idx))
+        d = int(np.searchsorted(arrays['dir_file_offsets'], idx, 'right')) - 1
+        return os.path.join(
+            self.root,
+            _unpack_string(arrays['dir_paths'], arrays['dir_path_offsets'], d),
+            _unpack_string(
+                arrays['file_names'], arrays['file_name_offsets'], idx
+            ),
+        )
+
+    def size(self, idx):
+        return int(self._arrays['file_sizes'][idx])
+
+    def mtime(self, idx):
+        return int(self._arrays['file_mtimes'][idx])
+
+
+class _IndexedSamples(object):
+    """
+    The samples of DatasetFolder or ImageFolder read from _FileIndex,
+    which is a sequence of (path, target) or of path.
+    """
+
+    def __init__(self, index, with_target=True):
+        self.index = index
+        self.with_target = with_target
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        path = self.index.path(idx)
+        if self.with_target:
+            return path, int(self.index.targets[idx])
+        return path
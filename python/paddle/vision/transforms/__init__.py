@@ -34,6 +34,13 @@ from .transforms import RandomPerspective  # noqa: F401
 from .transforms import Grayscale  # noqa: F401
 from .transforms import ToTensor  # noqa: F401
 from .transforms import RandomErasing  # noqa: F401
+from .batch_transforms import BaseBatchTransform  # noqa: F401
+from .batch_transforms import BatchRandomHorizontalFlip  # noqa: F401
+from .batch_transforms import BatchRandomVerticalFlip  # noqa: F401
+from .batch_transforms import BatchColorJitter  # noqa: F401
+from .batch_transforms import BatchRandomAffine  # noqa: F401
+from .batch_transforms import BatchRandomRotation  # noqa: F401
+from .batch_transforms import BatchRandomResizedCrop  # noqa: F401
 from .functional import to_tensor  # noqa: F401
 from .functional import hflip  # noqa: F401
 from .functional import vflip  # noqa: F401
@@ -48,6 +55,7 @@ from .functional import center_crop  # noqa: F401
 from .functional import adjust_brightness  # noqa: F401
 from .functional import adjust_contrast  # noqa: F401
 from .functional import adjust_hue  # noqa: F401
+from .functional import adjust_color  # noqa: F401
 from .functional import normalize  # noqa: F401
 from .functional import erase  # noqa: F401
 
@@ -74,6 +82,13 @@ __all__ = [  # noqa
     'Grayscale',
     'ToTensor',
     'RandomErasing',
+    'BaseBatchTransform',
+    'BatchRandomHorizontalFlip',
+    'BatchRandomVerticalFlip',
+    'BatchColorJitter',
+    'BatchRandomAffine',
+    'BatchRandomRotation',
+    'BatchRandomResizedCrop',
     'to_tensor',
     'hflip',
     'vflip',
@@ -88,6 +103,7 @@ __all__ = [  # noqa
     'adjust_brightness',
     'adjust_contrast',
     'adjust_hue',
+    'adjust_color',
     'normalize',
     'erase',
 ]
@@ -0,0 +1,645 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+import numbers
+import random
+from collections.abc import Sequence
+
+import numpy as np
+
+import paddle
+
+from . import functional_tensor as F_t
+from .transforms import (
+    BaseTransform,
+    _check_input,
+    _check_sequence_input,
+    _setup_angle,
+)
+
+__all__ = []
+
+
+def _assert_batch_tensor(img):
+    if not isinstance(img, paddle.Tensor) or img.ndim != 4:
+        raise TypeError(
+            "batch transforms only support paddle.Tensor with shape "
+            "(N, C, H, W), but got {}".format(
+                img.shape if isinstance(img, paddle.Tensor) else type(img)
+            )
+        )
+
+
+def _to_float(img):
+    # NOTE: uint8 images are scaled to [0, 1] so that color operations
+    # and grid sampling work on the same value range as float images.
+    if paddle.is_floating_point(img):
+        return img
+    return img.astype(paddle.float32) / 255.0
+
+
+def _restore_dtype(img, dtype):
+    if img.dtype == dtype:
+        return img
+    return (img * 255.0).round().clip(0, 255).astype(dtype)
+
+
+def _to_param(value, img, shape=(-1, 1, 1, 1)):
+    dtype = img.dtype if paddle.is_floating_point(img) else paddle.float32
+    return paddle.to_tensor(value, place=img.place).astype(dtype).reshape(shape)
+
+
+def _fill_value(fill, channels):
+    if isinstance(fill, numbers.Number):
+        return tuple([float(fill)] * channels)
+    assert len(fill) == channels, (
+        "fill should be a number or a sequence with the same length as the "
+        "channels of image, but got {}".format(fill)
+    )
+    return tuple(float(f) for f in fill)
+
+
+def _get_inverse_affine_matrices(angle, translate, scale, shear):
+    # Vectorized version of functional._get_affine_matrix with the center
+    # of images as origin, which is the coordinate used by F_t.affine.
+    rot = np.radians(angle)
+    sx = np.radians(shear[:, 0])
+    sy = np.radians(shear[:, 1])
+
+    a = np.cos(rot - sy) / np.cos(sy)
+    b = -np.cos(rot - sy) * np.tan(sx) / np.cos(sy) - np.sin(rot)
+    c = np.sin(rot - sy) / np.cos(sy)
+    d = -np.sin(rot - sy) * np.tan(sx) / np.cos(sy) + np.cos(rot)
+
+    matrix = np.stack(
+        [d, -b, np.zeros_like(a), -c, a, np.zeros_like(a)], axis=-1
+    ) / scale.reshape((-1, 1))
+    tx, ty = translate[:, 0], translate[:, 1]
+    matrix[:, 2] = matrix[:, 0] * -tx + matrix[:, 1] * -ty
+    matrix[:, 5] = matrix[:, 3] * -tx + matrix[:, 4] * -ty
+    return matrix.reshape((-1, 2, 3))
+
+
+class BaseBatchTransform(BaseTransform):
+    """
+    Base class of the transforms applied on a batch of images, which sample
+    the random parameters for each image and transform the whole batch in
+    one vectorized call.
+
+    Batch transforms work on ``paddle.Tensor`` with shape (N, C, H, W),
+    which is usually the output of ``paddle.io.DataLoader`` after collating,
+    so the augmentation could run on the training device instead of the
+    CPUs of data loader workers. Images of dtype uint8 with values in
+    [0, 255] and float images with values in [0, 1] are supported.
+
+    Subclasses should sample parameters of the batch in ``_get_batch_params``
+    and implement ``_apply_image`` and optionally ``_apply_mask``, in which the
+    sampled parameters can be accessed by ``self.params``.
+
+    Args:
+        keys (list[str]|tuple[str], optional): Same as ``BaseTransform``,
+            the "image" and "mask" inputs should be batches with shape
+            (N, C, H, W). Default: None.
+    """
+
+    def _get_params(self, inputs):
+        image = inputs[self.keys.index('image')]
+        _assert_batch_tensor(image)
+        return self._get_batch_params(image)
+
+    def _get_batch_params(self, images):
+        pass
+
+
+class BatchRandomHorizontalFlip(BaseBatchTransform):
+    """Horizontally flip each image in a batch randomly with a given probability.
+
+    Args:
+        prob (float, optional): Probability of each image being flipped.
+            Default: 0.5
+        keys (list[str]|tuple[str], optional): Same as ``BaseBatchTransform``. Default: None.
+
+    Shape:
+        - img(paddle.Tensor): The input images with shape (N x C x H x W).
+        - output(paddle.Tensor): The randomly flipped images.
+
+    Returns:
+        A callable object of BatchRandomHorizontalFlip.
+
+    Examples:
+
+        .. code-block:: python
+
+            import paddle
+            from paddle.vision.transforms import BatchRandomHorizontalFlip
+
+            transform = BatchRandomHorizontalFlip(0.5)
+
+            fake_imgs = paddle.rand((8, 3, 224, 224))
+
+            fake_imgs = transform(fake_imgs)
+            print(fake_imgs.shape)
+    """
+
+    def __init__(self, prob=0.5, keys=None):
+        super(BatchRandomHorizontalFlip, self).__init__(keys)
+        assert 0 <= prob <= 1, "probability must be between 0 and 1"
+        self.prob = prob
+        self._axis = -1
+
+    def _get_batch_params(self, images):
+        return np.random.random(images.shape[0]) < self.prob
+
+    def _apply_image(self, img):
+        flip = self.params
+        if not flip.any():
+            return img
+        if flip.all():
+            return img.flip([self._axis])
+        mask = paddle.to_tensor(flip, place=img.place).reshape((-1, 1, 1, 1))
+        return paddle.where(mask.expand(img.shape), img.flip([self._axis]), img)
+
+    def _apply_mask(self, mask):
+        return self._apply_image(mask)
+
+
+class BatchRandomVerticalFlip(BatchRandomHorizontalFlip):
+    """Vertically flip each image in a batch randomly with a given probability.
+
+    Args:
+        prob (float, optional): Probability of each image being flipped.
+            Default: 0.5
+        keys (list[str]|tuple[str], optional): Same as ``BaseBatchTransform``. Default: None.
+
+    Shape:
+        - img(paddle.Tensor): The input images with shape (N x C x H x W).
+        - output(paddle.Tensor): The randomly flipped images.
+
+    Returns:
+        A callable object of BatchRandomVerticalFlip.
+
+    Examples:
+
+        .. code-block:: python
+
+            import paddle
+            from paddle.vision.transforms import BatchRandomVerticalFlip
+
+            transform = BatchRandomVerticalFlip(0.5)
+
+            fake_imgs = paddle.rand((8, 3, 224, 224))
+
+            fake_imgs = transform(fake_imgs)
+            print(fake_imgs.shape)
+    """
+
+    def __init__(self, prob=0.5, keys=None):
+        super(BatchRandomVerticalFlip, self).__init__(prob, keys)
+        self._axis = -2
+
+
+class BatchColorJitter(BaseBatchTransform):
+    """Randomly change the brightness, contrast, saturation and hue of each
+    image in a batch.
+
+    Factors are sampled for each image independently, while the order of
+    the adjustments is shuffled once per batch.
+
+    Args:
+        brightness (float|list|tuple, optional): How much to jitter brightness.
+            Chosen uniformly from [max(0, 1 - brightness), 1 + brightness]. Should be non negative numbers.
+        contrast (float|list|tuple, optional): How much to jitter contrast.
+            Chosen uniformly from [max(0, 1 - contrast), 1 + contrast]. Should be non negative numbers.
+        saturation (float|list|tuple, optional): How much to jitter saturation.
+            Chosen uniformly from [max(0, 1 - saturation), 1 + saturation]. Should be non negative numbers.
+        hue (float|list|tuple, optional): How much to jitter hue.
+            Chosen uniformly from [-hue, hue]. Should have 0<= hue <= 0.5.
+        keys (list[str]|tuple[str], optional): Same as ``BaseBatchTransform``. Default: None.
+
+    Shape:
+        - img(paddle.Tensor): The input images with shape (N x 3 x H x W).
+        - output(paddle.Tensor): The color jittered images.
+
+    Returns:
+        A callable object of BatchColorJitter.
+
+    Examples:
+
+        .. code-block:: python
+
+            import paddle
+            from paddle.vision.transforms import BatchColorJitter
+
+            transform = BatchColorJitter(0.4, 0.4, 0.4, 0.1)
+
+            fake_imgs = paddle.rand((8, 3, 224, 224))
+
+            fake_imgs = transform(fake_imgs)
+            print(fake_imgs.shape)
+    """
+
+    def __init__(
+        self, brightness=0, contrast=0, saturation=0, hue=0, keys=None
+    ):
+        super(BatchColorJitter, self).__init__(keys)
+        self.brightness = _check_input(brightness, 'brightness')
+        self.contrast = _check_input(contrast, 'contrast')
+        self.saturation = _check_input(saturation, 'saturation')
+        self.hue = _check_input(
+            hue, 'hue', center=0, bound=(-0.5, 0.5), clip_first_on_zero=False
+        )
+
+    def _get_batch_params(self, images):
+        n = images.shape[0]
+        params = []
+        for name in ['brightness', 'contrast', 'saturation', 'hue']:
+            value = getattr(self, name)
+            if value is not None:
+                params.append((name, np.random.uniform(*value, size=n)))
+        random.shuffle(params)
+        return params
+
+    def _apply_image(self, img):
+        if not self.params:
+            return img
+        dtype = img.dtype
+        img = _to_float(img)
+        for name, factor in self.params:
+            img = getattr(self, '_adjust_' + name)(img, factor)
+        return _restore_dtype(img, dtype)
+
+    def _blend(self, img1, img2, factor):
+        ratio = _to_param(factor, img1)
+        return (img2 + ratio * (img1 - img2)).clip(0, 1.0)
+
+    def _adjust_brightness(self, img, factor):
+        return (img * _to_param(factor, img)).clip(0, 1.0)
+
+    def _adjust_contrast(self, img, factor):
+        gray = img if img.shape[1] == 1 else F_t.to_grayscale(img)
+        mean = paddle.mean(gray, axis=(-3, -2, -1), keepdim=True)
+        return self._blend(img, mean, factor)
+
+    def _adjust_saturation(self, img, factor):
+        if img.shape[1] == 1:
+            return img
+        return self._blend(img, F_t.to_grayscale(img), factor)
+
+    def _adjust_hue(self, img, factor):
+        if img.shape[1] == 1:
+            return img
+        h, s, v = F_t._rgb_to_hsv(img).unbind(axis=-3)
+        h = h + _to_param(factor, img, shape=(-1, 1, 1))
+        h = h - h.floor()
+        return F_t._hsv_to_rgb(paddle.stack([h, s, v], axis=-3))
+
+
+class _BatchGridTransform(BaseBatchTransform):
+    """
+    Base class of the batch transforms implemented by sampling images with
+    a per-image affine matrix, subclasses should return the inverse affine
+    matrices with shape (N, 2, 3) which map the output coordinates to the
+    input coordinates in ``_get_batch_params``.
+    """
+
+    def __init__(self, interpolation, fill, keys):
+        super(_BatchGridTransform, self).__init__(keys)
+        assert interpolation in [
+            'nearest',
+            'bilinear',
+        ], "interpolation should be 'nearest' or 'bilinear'"
+        self.interpolation = interpolation
+        if fill is not None and not isinstance(
+            fill, (Sequence, numbers.Number)
+        ):
+            raise TypeError("Fill should be either a sequence or a number.")
+        self.fill = fill
+
+    def _output_size(self, img):
+        return img.shape[-1], img.shape[-2]
+
+    def _transform(self, img, interpolation, fill):
+        # NOTE: img should be a floating point tensor, the dtype conversion
+        # is left to the callers since images and masks differ in it.
+        w, h = img.shape[-1], img.shape[-2]
+        ow, oh = self._output_size(img)
+        theta = paddle.to_tensor(self.params, place=img.place).astype(img.dtype)
+        grid = F_t._affine_grid(theta, w, h, ow, oh)
+        if fill is not None:
+            fill = _fill_value(fill, img.shape[1])
+        return F_t._grid_transform(img, grid, mode=interpolation, fill=fill)
+
+    def _apply_image(self, img):
+        fill = self.fill
+        if fill is not None and not paddle.is_floating_point(img):
+            # fill is given in the value range of the input image
+            fill = (
+                fill / 255.0
+                if isinstance(fill, numbers.Number)
+                else [f / 255.0 for f in fill]
+            )
+        dtype = img.dtype
+        out = self._transform(_to_float(img), self.interpolation, fill)
+        return _restore_dtype(out, dtype)
+
+    def _apply_mask(self, mask):
+        # NOTE: masks hold class ids rather than intensities, so they are
+        # sampled with nearest and cast without scaling or clipping, which
+        # keeps ids above 255 and negative ignore labels such as -1 intact.
+        # float64 is used for the wide integer types to represent them
+        # exactly.
+        dtype = mask.dtype
+        if paddle.is_floating_point(mask):
+            return self._transform(mask, 'nearest', None)
+        if dtype in (paddle.int32, paddle.int64):
+            mask = mask.astype(paddle.float64)
+        else:
+            mask = mask.astype(paddle.float32)
+        out = self._transform(mask, 'nearest', None)
+        return out.round().astype(dtype)
+
+
+class BatchRandomAffine(_BatchGridTransform):
+    """Random affine transformation of each image in a batch.
+
+    Args:
+        degrees (int|float|tuple): The angle interval of the random rotation.
+            If set as a number instead of sequence like (min, max), the range of degrees
+            will be (-degrees, +degrees) in clockwise order. If set 0, will not rotate.
+        translate (tuple, optional): Maximum absolute fraction for horizontal and vertical translations.
+            For example translate=(a, b), then horizontal shift is randomly sampled in the range -img_width * a < dx < img_width * a
+            and vertical shift is randomly sampled in the range -img_height * b < dy < img_height * b.
+            Default is None, will not translate.
+        scale (tuple, optional): Scaling factor interval, e.g (a, b), then scale is randomly sampled from the range a <= scale <= b.
+            Default is None, will keep original scale and not scale.
+        shear (sequence or number, optional): Range of degrees to shear, ranges from -180 to 180 in clockwise order.
+            If set as a number, a shear parallel to the x axis in the range (-shear, +shear) will be applied.
+            Else if set as a sequence of 2 values a shear parallel to the x axis in the range (shear[0], shear[1]) will be applied.
+            Else if set as a sequence of 4 values, a x-axis shear in (shear[0], shear[1]) and y-axis shear in (shear[2], shear[3]) will be applied.
+            Default is None, will not apply shear.
+        interpolation (str, optional): Interpolation method, "nearest" or "bilinear". Default: "nearest".
+        fill (int|list|tuple, optional): Pixel fill value for the area outside the transformed
+            image. If given a number, the value is used for all bands respectively. Default: 0.
+        keys (list[str]|tuple[str], optional): Same as ``BaseBatchTransform``. Default: None.
+
+    Shape:
+        - img(paddle.Tensor): The input images with shape (N x C x H x W).
+        - output(paddle.Tensor): The affined images.
+
+    Returns:
+        A callable object of BatchRandomAffine.
+
+    Examples:
+
+        .. code-block:: python
+
+            import paddle
+            from paddle.vision.transforms import BatchRandomAffine
+
+            transform = BatchRandomAffine([-90, 90], translate=[0.2, 0.2], scale=[0.5, 0.5], shear=[-10, 10])
+
+            fake_imgs = paddle.rand((8, 3, 256, 300))
+
+            fake_imgs = transform(fake_imgs)
+            print(fake_imgs.shape)
+    """
+
+    def __init__(
+        self,
+        degrees,
+        translate=None,
+        scale=None,
+        shear=None,
+        interpolation='nearest',
+        fill=0,
+        keys=None,
+    ):
+        super(BatchRandomAffine, self).__init__(interpolation, fill, keys)
+        self.degrees = _setup_angle(degrees, name="degrees", req_sizes=(2,))
+
+        if translate is not None:
+            _check_sequence_input(translate, "translate", req_sizes=(2,))
+            for t in translate:
+                if not (0.0 <= t <= 1.0):
+                    raise ValueError(
+                        "translation values should be between 0 and 1"
+                    )
+        self.translate = translate
+
+        if scale is not None:
+            _check_sequence_input(scale, "scale", req_sizes=(2,))
+            for s in scale:
+                if s <= 0:
+                    raise ValueError("scale values should be positive")
+        self.scale = scale
+
+        if shear is not None:
+            self.shear = _setup_angle(shear, name="shear", req_sizes=(2, 4))
+        else:
+            self.shear = shear
+
+    def _get_batch_params(self, images):
+        n = images.shape[0]
+        h, w = images.shape[-2], images.shape[-1]
+        angle = np.random.uniform(self.degrees[0], self.degrees[1], size=n)
+
+        translate = np.zeros((n, 2))
+        if self.translate is not None:
+            max_d = np.array([self.translate[0] * w, self.translate[1] * h])
+            translate = np.trunc(np.random.uniform(-max_d, max_d, (n, 2)))
+
+        scale = np.ones(n)
+        if self.scale is not None:
+            scale = np.random.uniform(self.scale[0], self.scale[1], size=n)
+
+        shear = np.zeros((n, 2))
+        if self.shear is not None:
+            shear[:, 0] = np.random.uniform(self.shear[0], self.shear[1], n)
+            if len(self.shear) == 4:
+                shear[:, 1] = np.random.uniform(self.shear[2], self.shear[3], n)
+
+        return _get_inverse_affine_matrices(angle, translate, scale, shear)
+
+
+class BatchRandomRotation(_BatchGridTransform):
+    """Rotates each image in a batch by a random angle.
+
+    Args:
+        degrees (sequence|float|int): Range of degrees to select from.
+            If degrees is a number instead of sequence like (min, max), the range of degrees
+            will be (-degrees, +degrees) clockwise order.
+        interpolation (str, optional): Interpolation method, "nearest" or "bilinear". Default: "nearest".
+        fill (int|list|tuple, optional): Pixel fill value for the area outside the rotated
+            image. If given a number, the value is used for all bands respectively. Default: 0.
+        keys (list[str]|tuple[str], optional): Same as ``BaseBatchTransform``. Default: None.
+
+    Shape:
+        - img(paddle.Tensor): The input images with shape (N x C x H x W).
+        - output(paddle.Tensor): The rotated images.
+
+    Returns:
+        A callable object of BatchRandomRotation.
+
+    Examples:
+
+        .. code-block:: python
+
+            import paddle
+            from paddle.vision.transforms import BatchRandomRotation
+
+            transform = BatchRandomRotation(90)
+
+            fake_imgs = paddle.rand((8, 3, 224, 224))
+
+            fake_imgs = transform(fake_imgs)
+            print(fake_imgs.shape)
+    """
+
+    def __init__(self, degrees, interpolation='nearest', fill=0, keys=None):
+        super(BatchRandomRotation, self).__init__(interpolation, fill, keys)
+        self.degrees = _setup_angle(degrees, name="degrees", req_sizes=(2,))
+
+    def _get_batch_params(self, images):
+        n = images.shape[0]
+        angle = np.random.uniform(self.degrees[0], self.degrees[1], size=n)
+        # NOTE: F_t.rotate rotates counter clockwise, which is the affine
+        # transformation with the negative angle.
+        return _get_inverse_affine_matrices(
+            -angle, np.zeros((n, 2)), np.ones(n), np.zeros((n, 2))
+        )
+
+
+class BatchRandomResizedCrop(_BatchGridTransform):
+    """Crop each image in a batch to random size and aspect ratio, and
+    resize the crops to the given size.
+
+    A crop of random size (default: of 0.08 to 1.0) of the original size and a random
+    aspect ratio (default: of 3/4 to 1.33) of the original aspect ratio is made for
+    each image, the crops are resized by sampling in one call, so the output of all
+    images are of the same size.
+
+    Args:
+        size (int|list|tuple): Target size of output image, with (height, width) shape.
+        scale (list|tuple): Scale range of the cropped image before resizing, relatively to the origin
+            image. Default: (0.08, 1.0)
+        ratio (list|tuple): Range of aspect ratio of the origin aspect ratio cropped. Default: (0.75, 1.33)
+        interpolation (str, optional): Interpolation method, "nearest" or "bilinear". Default: "bilinear".
+        attempts (int, optional): The max number of sampling attempts of a valid crop for each image,
+            the central crop is used if all attempts fail. Default: 10.
+        keys (list[str]|tuple[str], optional): Same as ``BaseBatchTransform``. Default: None.
+
+    Shape:
+        - img(paddle.Tensor): The input images with shape (N x C x H x W).
+        - output(paddle.Tensor): The cropped images with shape (N x C x size[0] x size[1]).
+
+    Returns:
+        A callable object of BatchRandomResizedCrop.
+
+    Examples:
+
+        .. code-block:: python
+
+            import paddle
+            from paddle.vision.transforms import BatchRandomResizedCrop
+
+            transform = BatchRandomResizedCrop(224)
+
+            fake_imgs = paddle.rand((8, 3, 300, 320))
+
+            fake_imgs = transform(fake_imgs)
+            print(fake_imgs.shape)
+    """
+
+    def __init__(
+        self,
+        size,
+        scale=(0.08, 1.0),
+        ratio=(3.0 / 4, 4.0 / 3),
+        interpolation='bilinear',
+        attempts=10,
+        keys=None,
+    ):
+        super(BatchRandomResizedCrop, self).__init__(interpolation, None, keys)
+        if isinstance(size, int):
+            self.size = (size, size)
+        else:
+            self.size = tuple(size)
+        assert scale[0] <= scale[1], "scale should be of kind (min, max)"
+        assert ratio[0] <= ratio[1], "ratio should be of kind (min, max)"
+        self.scale = scale
+        self.ratio = ratio
+        self.attempts = attempts
+
+    def _output_size(self, img):
+        return self.size[1], self.size[0]
+
+    def _get_crops(self, n, height, width):
+        area = height * width
+        shape = (n, self.attempts)
+        target_area = np.random.uniform(*self.scale, size=shape) * area
+        log_ratio = tuple(math.log(x) for x in self.ratio)
+        aspect_ratio = np.exp(np.random.uniform(*log_ratio, size=shape))
+
+        w = np.round(np.sqrt(target_area * aspect_ratio)).astype('int64')
+        h = np.round(np.sqrt(target_area / aspect_ratio)).astype('int64')
+        valid = (w > 0) & (w <= width) & (h > 0) & (h <= height)
+
+        # Fallback to central crop
+        in_ratio = float(width) / float(height)
+        if in_ratio < min(self.ratio):
+            fw, fh = width, int(round(width / min(self.ratio)))
+        elif in_ratio > max(self.ratio):
+            fw, fh = int(round(height * max(self.ratio))), height
+        else:
+            fw, fh = width, height
+
+        # take the first valid attempt of each image
+        first = valid.argmax(axis=1)
+        found = valid[np.arange(n), first]
+        w = np.where(found, w[np.arange(n), first], fw)
+        h = np.where(found, h[np.arange(n), first], fh)
+        i = np.where(
+            found,
+            np.floor(np.random.random(n) * (height - h + 1)),
+            (height - h) // 2,
+        )
+        j = np.where(
+            found,
+            np.floor(np.random.random(n) * (width - w + 1)),
+            (width - w) // 2,
+        )
+        return i, j, h, w
+
+    def _get_batch_params(self, images):
+        n = images.shape[0]
+        height, width = images.shape[-2], images.shape[-1]
+        i, j, h, w = self._get_crops(n, height, width)
+
+        oh, ow = self.size
+        # map the output pixels to the crop boxes, with the center of
+        # images as origin
+        zeros = np.zeros(n)
+        matrix = np.stack(
+            [
+                w / ow,
+                zeros,
+                j + w * 0.5 - width * 0.5,
+                zeros,
+                h / oh,
+                i + h * 0.5 - height * 0.5,
+            ],
+            axis=-1,
+        )
+        return matrix.reshape((-1, 2, 3))
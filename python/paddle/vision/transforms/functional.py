@@ -26,6 +26,9 @@ from . import functional_tensor as F_t
 __all__ = []
 
 
+_COLOR_ADJUSTMENTS = ('brightness', 'contrast', 'saturation', 'hue')
+
+
 def _is_pil_image(img):
     return isinstance(img, Image.Image)
 
@@ -569,6 +572,107 @@ def adjust_hue(img, hue_factor):
         return F_t.adjust_hue(img, hue_factor)
 
 
+def adjust_color(
+    img,
+    brightness_factor=1.0,
+    contrast_factor=1.0,
+    saturation_factor=1.0,
+    hue_factor=0.0,
+    order=None,
+):
+    """Adjusts brightness, contrast, saturation and hue of an image in one call.
+
+    The adjustments are applied in the given order with the same meaning as
+    ``adjust_brightness``, ``adjust_contrast``, ``adjust_saturation`` and
+    ``adjust_hue``. For np.array and paddle.Tensor images, consecutive
+    brightness, contrast and saturation adjustments are fused into one
+    per-pixel color transformation (a lookup table for uint8 images without
+    saturation adjustment), so no intermediate image is created for each of
+    them. Since intermediate values are not clipped inside a fused
+    transformation, the result may differ slightly from calling the single
+    adjustments one by one when an intermediate value is out of range.
+
+    Args:
+        img (PIL.Image|np.array|paddle.Tensor): Image to be adjusted.
+        brightness_factor (float, optional): How much to adjust the brightness.
+            Should be non-negative. Default: 1.0.
+        contrast_factor (float, optional): How much to adjust the contrast.
+            Should be non-negative. Default: 1.0.
+        saturation_factor (float, optional): How much to adjust the saturation.
+            Should be non-negative. Default: 1.0.
+        hue_factor (float, optional): How much to shift the hue channel. Should
+            be in [-0.5, 0.5]. Default: 0.0.
+        order (list|tuple, optional): The order of the adjustments, a
+            permutation of a subset of "brightness", "contrast", "saturation"
+            and "hue". Adjustments not in order are not applied. Default: None,
+            which means ("brightness", "contrast", "saturation", "hue").
+
+    Returns:
+        PIL.Image|np.array|paddle.Tensor: Color adjusted image.
+
+    Examples:
+        .. code-block:: python
+
+            import numpy as np
+            from paddle.vision.transforms import functional as F
+
+            fake_img = (np.random.rand(256, 300, 3) * 255.).astype('uint8')
+
+            converted_img = F.adjust_color(
+                fake_img, 1.2, 0.8, 1.5, 0.1, order=['hue', 'brightness', 'saturation', 'contrast'])
+            print(converted_img.shape)
+
+    """
+    if not (
+        _is_pil_image(img) or _is_numpy_image(img) or _is_tensor_image(img)
+    ):
+        raise TypeError(
+            'img should be PIL Image or Tensor Image or ndarray with dim=[2 or 3]. Got {}'.format(
+                type(img)
+            )
+        )
+
+    if order is None:
+        order = _COLOR_ADJUSTMENTS
+    if not set(order) <= set(_COLOR_ADJUSTMENTS) or len(set(order)) != len(
+        order
+    ):
+        raise ValueError(
+            "order should be a permutation of a subset of {}, but got {}".format(
+                _COLOR_ADJUSTMENTS, order
+            )
+        )
+    if min(brightness_factor, contrast_factor, saturation_factor) < 0:
+        raise ValueError(
+            "brightness_factor, contrast_factor and saturation_factor should be non-negative."
+        )
+    if not (-0.5 <= hue_factor <= 0.5):
+        raise ValueError(
+            'hue_factor:{} is not in [-0.5, 0.5].'.format(hue_factor)
+        )
+
+    factors = {
+        'brightness': brightness_factor,
+        'contrast': contrast_factor,
+        'saturation': saturation_factor,
+        'hue': hue_factor,
+    }
+    ops = [
+        (name, factors[name])
+        for name in order
+        if factors[name] != (0.0 if name == 'hue' else 1.0)
+    ]
+
+    if _is_pil_image(img):
+        for name, factor in ops:
+            img = getattr(F_pil, 'adjust_' + name)(img, factor)
+        return img
+    elif _is_numpy_image(img):
+        return F_cv2.adjust_color(img, ops)
+    else:
+        return F_t.adjust_color(img, ops)
+
+
 def _get_affine_matrix(center, angle, translate, scale, shear):
     # Affine matrix is : M = T * C * RotateScaleShear * C^-1
     # Ihe inverse one is : M^-1 = C * RotateScaleShear^-1 * C^-1 * T^-1
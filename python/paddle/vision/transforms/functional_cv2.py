@@ -427,6 +427,103 @@ def adjust_hue(img, hue_factor):
     return cv2.cvtColor(hsv_img, cv2.COLOR_HSV2BGR_FULL).astype(dtype)
 
 
+def _point_transform(img, ops):
+    cv2 = try_import('cv2')
+
+    if img.dtype == np.uint8:
+        # chain the adjustments on the lookup table, which gives the same
+        # result as applying them one by one
+        table = np.arange(256, dtype=np.float64)
+        for name, factor in ops:
+            if name == 'brightness':
+                table = table * factor
+            else:
+                table = (table - 74) * factor + 74
+            table = table.clip(0, 255).astype('uint8').astype(np.float64)
+        table = table.astype('uint8')
+        if len(img.shape) == 3 and img.shape[2] == 1:
+            return cv2.LUT(img, table)[:, :, np.newaxis]
+        return cv2.LUT(img, table)
+
+    scale, offset = 1.0, 0.0
+    for name, factor in ops:
+        scale *= factor
+        offset *= factor
+        if name == 'contrast':
+            offset += (1 - factor) * 74
+    return (img * scale + offset).clip(0, 255).astype(img.dtype)
+
+
+def _color_transform(img, ops):
+    cv2 = try_import('cv2')
+
+    if len(img.shape) == 2 or img.shape[2] == 1:
+        ops = [(name, factor) for name, factor in ops if name != 'saturation']
+    if not ops:
+        return img
+    if all(name != 'saturation' for name, _ in ops):
+        return _point_transform(img, ops)
+
+    # compose the adjustments into one affine transformation of BGR pixels
+    gray = np.array([0.114, 0.587, 0.299])
+    matrix = np.eye(3)
+    offset = np.zeros(3)
+    for name, factor in ops:
+        if name == 'saturation':
+            blend = factor * np.eye(3) + (1 - factor) * np.outer(
+                np.ones(3), gray
+            )
+            matrix = blend @ matrix
+            offset = blend @ offset
+        else:
+            matrix = factor * matrix
+            offset = factor * offset
+            if name == 'contrast':
+                offset += (1 - factor) * 74
+
+    dtype = img.dtype
+    if dtype not in (np.uint8, np.float32, np.float64):
+        img = img.astype(np.float32)
+    out = cv2.transform(img, np.hstack([matrix, offset[:, np.newaxis]]))
+    if dtype != np.uint8:
+        out = out.clip(0, 255)
+    return out.astype(dtype)
+
+
+def adjust_color(img, ops):
+    """Adjusts brightness, contrast, saturation and hue of an image.
+
+    Consecutive brightness, contrast and saturation adjustments are fused
+    into one lookup table or one affine color transformation.
+
+    Args:
+        img (np.array): Image to be adjusted.
+        ops (list[tuple]): The (name, factor) of the adjustments in order,
+            name should be one of "brightness", "contrast", "saturation" and
+            "hue".
+
+    Returns:
+        np.array: Color adjusted image.
+
+    """
+    cv2 = try_import('cv2')
+
+    fused = []
+    for name, factor in ops:
+        if name != 'hue':
+            fused.append((name, factor))
+            continue
+        img = _color_transform(img, fused)
+        fused = []
+        if len(img.shape) == 3 and img.shape[2] == 3:
+            dtype = img.dtype
+            hsv_img = cv2.cvtColor(img.astype(np.uint8), cv2.COLOR_BGR2HSV_FULL)
+            # uint8 addition take cares of rotation across boundaries
+            hsv_img[..., 0] += np.uint8(int(factor * 255) % 256)
+            img = cv2.cvtColor(hsv_img, cv2.COLOR_HSV2BGR_FULL).astype(dtype)
+    return _color_transform(img, fused)
+
+
 def affine(
     img,
     angle,
@@ -15,6 +15,8 @@
 import math
 import numbers
 
+import numpy as np
+
 import paddle
 import paddle.nn.functional as F
 
@@ -225,9 +227,13 @@ def _affine_grid(theta, w, h, ow, oh):
     scaled_theta = theta.transpose((0, 2, 1)) / paddle.to_tensor(
         [0.5 * w, 0.5 * h]
     )
-    output_grid = base_grid.reshape((1, oh * ow, 3)).bmm(scaled_theta)
+    # NOTE: theta may hold a matrix per sample with shape (N, 2, 3), the
+    # base grid is broadcast to all of them.
+    output_grid = paddle.matmul(
+        base_grid.reshape((1, oh * ow, 3)), scaled_theta
+    )
 
-    return output_grid.reshape((1, oh, ow, 2))
+    return output_grid.reshape((theta.shape[0], oh, ow, 2))
 
 
 def _grid_transform(img, grid, mode, fill):
@@ -875,3 +881,98 @@ def adjust_hue(img, hue_factor):
         raise ValueError("channels of input should be either 1 or 3.")
 
     return img_adjusted
+
+
+def _color_transform(img, ops):
+    channels = _get_image_num_channels(img, 'CHW')
+    if channels == 1:
+        ops = [(name, factor) for name, factor in ops if name != 'saturation']
+    if not ops:
+        return img
+
+    # compose the adjustments into one affine transformation of pixels,
+    # the mean used by contrast adjustment is derived from the mean of
+    # input image since the transformation is affine
+    gray = np.array([0.2989, 0.5870, 0.1140]) if channels == 3 else np.ones(1)
+    matrix = np.eye(channels)
+    offset = paddle.zeros(img.shape[:-2], dtype=img.dtype)
+    mean = None
+    for name, factor in ops:
+        if name == 'saturation':
+            blend = factor * np.eye(channels) + (1 - factor) * np.outer(
+                np.ones(channels), gray
+            )
+            matrix = blend @ matrix
+            offset = paddle.matmul(
+                offset, paddle.to_tensor(blend.T, dtype=img.dtype)
+            )
+            continue
+        if name == 'contrast':
+            if mean is None:
+                mean = paddle.mean(img, axis=(-2, -1))
+            cur_mean = paddle.matmul(
+                mean, paddle.to_tensor(matrix.T, dtype=img.dtype)
+            )
+            target = paddle.matmul(
+                cur_mean + offset,
+                paddle.to_tensor(gray[:, np.newaxis], dtype=img.dtype),
+            )
+        matrix = factor * matrix
+        offset = factor * offset
+        if name == 'contrast':
+            offset = offset + (1 - factor) * target
+
+    shape = img.shape
+    out = paddle.matmul(
+        paddle.to_tensor(matrix, dtype=img.dtype),
+        img.reshape(shape[:-2] + [shape[-2] * shape[-1]]),
+    ) + offset.unsqueeze(-1)
+    return out.reshape(shape).clip(0, 1.0)
+
+
+def adjust_color(img, ops):
+    """Adjusts brightness, contrast, saturation and hue of an image.
+
+    Consecutive brightness, contrast and saturation adjustments are fused
+    into one affine color transformation.
+
+    Args:
+        img (paddle.Tensor): Image to be adjusted.
+        ops (list[tuple]): The (name, factor) of the adjustments in order,
+            name should be one of "brightness", "contrast", "saturation" and
+            "hue".
+
+    Returns:
+        paddle.Tensor: Color adjusted image.
+
+    """
+    _assert_image_tensor(img, 'CHW')
+    assert _get_image_num_channels(img, 'CHW') in [
+        1,
+        3,
+    ], "channels of input should be either 1 or 3."
+
+    if not ops:
+        return img
+
+    dtype = img.dtype
+    if not paddle.is_floating_point(img):
+        img = img.astype(paddle.float32) / 255.0
+
+    fused = []
+    for name, factor in ops:
+        if name != 'hue':
+            fused.append((name, factor))
+            continue
+        img = _color_transform(img, fused)
+        fused = []
+        if _get_image_num_channels(img, 'CHW') == 3:
+            h, s, v = _rgb_to_hsv(img).unbind(axis=-3)
+            h = h + factor
+            h = h - h.floor()
+            img = _hsv_to_rgb(paddle.stack([h, s, v], axis=-3))
+    img = _color_transform(img, fused)
+
+    if img.dtype != dtype:
+        img = (img * 255.0).round().astype(dtype)
+    return img
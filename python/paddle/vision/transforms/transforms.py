@@ -1003,45 +1003,73 @@ class ColorJitter(BaseTransform):
         self.hue = hue
 
     def _get_param(self, brightness, contrast, saturation, hue):
-        """Get a randomized transform to be applied on image.
+        """Get randomized factors of the adjustments to be applied on image.
 
         Arguments are same as that of __init__.
 
         Returns:
-            Transform which randomly adjusts brightness, contrast and
-            saturation in a random order.
+            list[tuple]: The (name, factor) of brightness, contrast, saturation
+            and hue adjustments in a random order.
         """
-        transforms = []
+        ranges = []
 
         if brightness is not None:
-            transforms.append(BrightnessTransform(brightness, self.keys))
+            ranges.append(
+                ('brightness', _check_input(brightness, 'brightness'))
+            )
 
         if contrast is not None:
-            transforms.append(ContrastTransform(contrast, self.keys))
+            ranges.append(('contrast', _check_input(contrast, 'contrast')))
 
         if saturation is not None:
-            transforms.append(SaturationTransform(saturation, self.keys))
+            ranges.append(
+                ('saturation', _check_input(saturation, 'saturation'))
+            )
 
         if hue is not None:
-            transforms.append(HueTransform(hue, self.keys))
+            ranges.append(
+                (
+                    'hue',
+                    _check_input(
+                        hue,
+                        'hue',
+                        center=0,
+                        bound=(-0.5, 0.5),
+                        clip_first_on_zero=False,
+                    ),
+                )
+            )
 
-        random.shuffle(transforms)
-        transform = Compose(transforms)
+        params = [
+            (name, random.uniform(value[0], value[1]))
+            for name, value in ranges
+            if value is not None
+        ]
+        random.shuffle(params)
 
-        return transform
+        return params
 
     def _apply_image(self, img):
         """
         Args:
-            img (PIL Image): Input image.
+            img (PIL.Image|np.ndarray|paddle.Tensor): Input image.
 
         Returns:
-            PIL Image: Color jittered image.
+            PIL.Image|np.ndarray|paddle.Tensor: Color jittered image.
         """
-        transform = self._get_param(
+        params = self._get_param(
             self.brightness, self.contrast, self.saturation, self.hue
         )
-        return transform(img)
+        if not params:
+            return img
+
+        # NOTE: all adjustments are applied by one call, so np.ndarray and
+        # paddle.Tensor images are transformed without an intermediate
+        # image for each adjustment.
+        factors = {name + '_factor': factor for name, factor in params}
+        return F.adjust_color(
+            img, order=[name for name, _ in params], **factors
+        )
 
 
 class RandomCrop(BaseTransform):